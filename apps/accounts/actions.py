@@ -1,27 +1,21 @@
 from django.contrib import admin, messages
 from django.db import transaction
-from django.utils import timezone
 from django.contrib.auth import get_user_model
 
+from apps.accounts.authentication import invalidate_user
+
 CustomUser = get_user_model()
 
 
 @admin.action(description="Delete (soft) selected users")
 def deactivate_users(modeladmin, request, queryset):
     """Custom admin action to soft delete users"""
-    deactivated_count = 0
-
     with transaction.atomic():
-        for user in queryset:
-            if not user.is_deleted:  # Only deactivate active users
-                timestamp = int(timezone.now().timestamp())
+        user_ids = list(queryset.values_list("pk", flat=True))
+        # bitta UPDATE bilan barcha tanlangan foydalanuvchilar o'chiriladi
+        deactivated_count = CustomUser.all_objects.filter(pk__in=user_ids).soft_delete()
 
-                # Update using queryset to bypass validation
-                CustomUser.objects.filter(pk=user.pk).update(
-                    phone_number=f"{user.phone_number}_deleted_{timestamp}",
-                    is_deleted=True,
-                    is_active=False,  # Also deactivate
-                )
-                deactivated_count += 1
+        # update() signal yubormaydi, keshdagi foydalanuvchilar shu yerda o'chiriladi
+        invalidate_user(*user_ids)
 
     messages.success(request, f"Successfully deactivated {deactivated_count} user(s).")
\ No newline at end of file
@@ -89,7 +89,15 @@ class UserAdmin(BaseUserAdmin):
 
     actions = [deactivate_users, ]
 
-    
+    def get_queryset(self, request):
+        # admin o'chirilgan foydalanuvchilarni ham ko'rsatadi
+        qs = User.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            qs = qs.order_by(*ordering)
+        return qs
+
+
 # admin.py
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
@@ -180,13 +188,17 @@ class EmployeePaymentAdmin(admin.ModelAdmin):
         'id',
         'employee',
         'amount',
+        'status',
         'created_at',
         'get_total_salary',
     )
     
     list_display_links = ('employee', 'amount')
+
+    list_select_related = ('employee',)
     
     list_filter = (
+        'status',
         'employee',
         'created_at',
         'amount',
@@ -205,7 +217,7 @@ class EmployeePaymentAdmin(admin.ModelAdmin):
     
     fieldsets = (
         (_('Payment Information'), {
-            'fields': ('employee', 'amount')
+            'fields': ('employee', 'amount', 'status', 'period_start', 'period_end')
         }),
         (_('Total Share'), {
             'fields': ('get_total_salary',),
@@ -220,7 +232,14 @@ class EmployeePaymentAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
     
     list_per_page = 25
+
+    actions = ['approve_payments']
     
+    def approve_payments(self, request, queryset):
+        approved = queryset.approve()
+        self.message_user(request, f'{approved} draft payments approved.')
+    approve_payments.short_description = _("Approve selected draft payments")
+
     def get_total_salary(self, obj):
         return obj.employee.total_salary
     get_total_salary.short_description = _("Employee Total Salary")
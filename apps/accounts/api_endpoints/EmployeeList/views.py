@@ -11,7 +11,10 @@ class EmployeesListAPIView(ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Employee.objects.filter(employer=self.request.user).order_by("-created_at")
+        # total_salary saqlangan maydon, har bir qator uchun aggregate so'rov yuborilmaydi
+        return (Employee.objects.filter(employer=self.request.user)
+                .only("id", "full_name", "created_at", "total_salary")
+                .order_by("-created_at"))
     
 
 
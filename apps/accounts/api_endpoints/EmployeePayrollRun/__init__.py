@@ -0,0 +1 @@
+from .views import EmployeePayrollRunAPIView
\ No newline at end of file
@@ -0,0 +1,39 @@
+from decimal import Decimal
+
+from rest_framework import serializers
+from rest_framework.exceptions import PermissionDenied
+
+from apps.accounts.models import Employee, EmployeePayment
+
+
+class PayrollPaymentSerializer(serializers.Serializer):
+    employee = serializers.IntegerField(min_value=1)
+    amount = serializers.DecimalField(max_digits=11, decimal_places=2, min_value=Decimal("0.01"))
+
+
+class EmployeePayrollRunSerializer(serializers.Serializer):
+    payments = PayrollPaymentSerializer(many=True, allow_empty=False, max_length=1000)
+
+    def validate_payments(self, payments):
+        # barcha xodimlar egasi bitta so'rov bilan tekshiriladi
+        employee_ids = {payment["employee"] for payment in payments}
+        owned = set(Employee.objects.filter(id__in=employee_ids, employer=self.context["request"].user)
+                    .values_list("id", flat=True))
+        if owned != employee_ids:
+            raise PermissionDenied("You can add salary only to your employees.")
+        return payments
+
+    def create(self, validated_data):
+        return EmployeePayment.objects.bulk_pay([
+            EmployeePayment(employee_id=payment["employee"], amount=payment["amount"])
+            for payment in validated_data["payments"]
+        ])
+
+    def to_representation(self, payments):
+        return {
+            "payments_count": len(payments),
+            "employees_count": len({payment.employee_id for payment in payments}),
+            "total_amount": str(sum((payment.amount for payment in payments), Decimal("0.00"))),
+            "payments": [{"id": payment.id, "employee": payment.employee_id, "amount": str(payment.amount)}
+                         for payment in payments],
+        }
@@ -0,0 +1,24 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+
+from .serializers import EmployeePayrollRunSerializer
+
+
+class EmployeePayrollRunAPIView(GenericAPIView):
+    """Pay many employees in one request: one ownership query, one INSERT, one balance UPDATE."""
+    serializer_class = EmployeePayrollRunSerializer
+    permission_classes = [IsAuthenticated, ]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+
+__all__ = [
+    "EmployeePayrollRunAPIView"
+]
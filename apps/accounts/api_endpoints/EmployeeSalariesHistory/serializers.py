@@ -13,6 +13,7 @@ class EmployeeSalariesListSerializer(serializers.ModelSerializer):
              "id",
              "employee",
              "amount",
+             "status",
              "date",
              )
         read_only_fields = ("id", "date",)
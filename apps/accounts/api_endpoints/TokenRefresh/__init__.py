@@ -0,0 +1 @@
+from .views import TokenRefreshAPIView
\ No newline at end of file
@@ -0,0 +1,17 @@
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+
+from apps.accounts.tokens import FilteredRefreshToken
+
+
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    # qora ro'yxat so'rovi faqat Bloom filtr mos kelganda yuboriladi
+    token_class = FilteredRefreshToken
+
+    def validate(self, attrs):
+        try:
+            return super().validate(attrs)
+        except get_user_model().DoesNotExist:
+            # o'chirilgan foydalanuvchilar standart managerda ko'rinmaydi
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
@@ -0,0 +1,13 @@
+from rest_framework_simplejwt.views import TokenRefreshView
+
+from .serializers import FilteredTokenRefreshSerializer
+
+
+class TokenRefreshAPIView(TokenRefreshView):
+    serializer_class = FilteredTokenRefreshSerializer
+
+
+
+__all__ = [
+    "TokenRefreshAPIView"
+]
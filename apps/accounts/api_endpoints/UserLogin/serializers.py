@@ -1,10 +1,10 @@
-from django.core.cache import cache
 from django.contrib.auth import get_user_model
 
 from rest_framework import serializers
+from rest_framework.exceptions import Throttled
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
-from apps.accounts.utils import generate_activation_code
+from apps.accounts.otp import OTPCooldown, issue_code
 
 User = get_user_model()
 
@@ -24,14 +24,13 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
         phone_number = attrs.get("phone_number")
 
-        try:
-            user = User.objects.get(phone_number=phone_number)
-        except User.DoesNotExist:
+        if not User.objects.filter(phone_number=phone_number).exists():
             raise serializers.ValidationError("User with this phone number does not exist")
         
-        code = generate_activation_code()
-        cache_key = f"verification_code_{phone_number}"
-        cache.set(cache_key, code, timeout=600)
+        try:
+            code = issue_code(phone_number)
+        except OTPCooldown as exc:
+            raise Throttled(wait=exc.retry_after, detail="Verification code was sent recently.")
 
         print(f"\n VERIFICATION CODE for {phone_number}: {code}")
         print(f"Expires in 10 minutes\n")
@@ -0,0 +1,7 @@
+from rest_framework_simplejwt.serializers import TokenBlacklistSerializer
+
+from apps.accounts.tokens import FilteredRefreshToken
+
+
+class UserLogoutSerializer(TokenBlacklistSerializer):
+    token_class = FilteredRefreshToken
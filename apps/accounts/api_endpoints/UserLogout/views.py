@@ -1,9 +1,11 @@
 from rest_framework_simplejwt.views import TokenBlacklistView
 from rest_framework.permissions import IsAuthenticated
 
+from .serializers import UserLogoutSerializer
+
 
 class UserLogoutView(TokenBlacklistView):    
-    pass
+    serializer_class = UserLogoutSerializer
 
 
 __all__ = [
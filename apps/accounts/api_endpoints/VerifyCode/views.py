@@ -1,4 +1,3 @@
-from django.core.cache import cache
 from django.contrib.auth import get_user_model
 
 from rest_framework import status
@@ -6,6 +5,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 
+from apps.accounts.otp import VerifyResult, verify_code
 from .serializers import VerifyCodeSerializer
 
 User = get_user_model()
@@ -20,15 +20,19 @@ class VerifyCodeAPIView(APIView):
             phone_number = serializer.data["phone_number"]
             code = serializer.data["code"]
 
-            cache_key = f"verification_code_{phone_number}"
-            stored_code = cache.get(cache_key)
-            if stored_code is None:
+            # kod foydalanuvchi so'rovidan oldin tekshiriladi va bir martada ishlatiladi
+            result = verify_code(phone_number, code)
+            if result == VerifyResult.EXPIRED:
                 return Response(
                     {"error": "Verification code not found or expired"},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
-            if code != stored_code:
+            if result == VerifyResult.LOCKED:
+                return Response(
+                    {"error": "Too many attempts, request a new verification code"},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS
+                )
+            if result == VerifyResult.INVALID:
                 return Response(
                     {"error": "Invalid verification code"},
                     status=status.HTTP_400_BAD_REQUEST
@@ -36,10 +40,9 @@ class VerifyCodeAPIView(APIView):
             
             try:
                 user = User.objects.get(phone_number=phone_number)
-                user.is_active = True
-                user.save()
-
-                cache.delete(cache_key)
+                if not user.is_active:
+                    user.is_active = True
+                    user.save(update_fields=["is_active", "updated_at"])
 
                 from rest_framework_simplejwt.tokens import RefreshToken
                 refresh_token = RefreshToken.for_user(user)
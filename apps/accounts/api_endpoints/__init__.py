@@ -4,10 +4,12 @@ from .UserLogin import * # noqa
 from .VerifyCode import * # noqa
 from .UserGetProfile import * # noqa
 from .UserLogout import * # noqa
+from .TokenRefresh import * # noqa
 # Employee
 from .EmployeeAdd import * # noqa
 from .EmployeeList import * # noqa
 from .EmployeeUpdate import * # noqa
 from .EmployeeSalaryAdd import * # noqa
+from .EmployeePayrollRun import * # noqa
 from .EmployeeSalariesHistory import * # noqa
 from .EmployeeDelete import * # noqa
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+JWT authentication without a users table query per request.
+
+``CachedJWTAuthentication`` takes the user id from the signed token claims
+and rebuilds the user from a cached snapshot: the user's own columns
+(without the password hash), the user's country and companies. The snapshot
+lives in the default cache for ``settings.AUTH_USER_CACHE_TTL`` seconds.
+A warm request runs no query at all for ``request.user``,
+``request.user.company.first()`` or ``request.user.country.name``. A cold
+request runs two queries.
+
+The user is an ``AuthenticatedUser``, a proxy of ``User``, so it can be
+assigned to foreign keys and compared like the real row. Its ``password``
+field is deferred, so ``save()`` writes only the loaded columns and never
+touches the password.
+
+``invalidate_user`` drops the snapshot after the transaction commits. The signals in
+``apps.accounts.signals`` call it when a user or company is saved or deleted,
+which covers profile updates. ``delete_account`` and the
+``deactivate_users`` admin action soft delete with ``update()`` and call it
+directly. With a per-process
+cache, other workers still see the old snapshot until the TTL runs out.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.accounts.models import AuthenticatedUser
+from apps.common.models import Country
+from apps.company.models import Company
+
+USER_FIELDS = tuple(field.attname for field in AuthenticatedUser._meta.concrete_fields if field.name != "password")
+COUNTRY_FIELDS = tuple(field.attname for field in Country._meta.concrete_fields)
+COMPANY_FIELDS = tuple(field.attname for field in Company._meta.concrete_fields)
+
+
+def _cache_key(user_id):
+    return f"auth_user_{user_id}"
+
+
+def invalidate_user(*user_ids):
+    """Drop the snapshots once the transaction commits, so a concurrent request cannot cache the old row again"""
+    keys = [_cache_key(user_id) for user_id in user_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def load_snapshot(user_id):
+    """Cached column values of a user, the user's country and companies, or None"""
+    key = _cache_key(user_id)
+    snapshot = cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    country_fields = tuple(f"country__{field}" for field in COUNTRY_FIELDS)
+    row = AuthenticatedUser.objects.filter(pk=user_id).values_list(*USER_FIELDS, *country_fields).first()
+    if row is None:
+        return None
+    user_values, country_values = row[:len(USER_FIELDS)], row[len(USER_FIELDS):]
+    snapshot = {
+        "user": user_values,
+        "country": country_values if country_values[0] is not None else None,
+        "companies": list(Company.objects.filter(master_id=user_id).order_by("pk").values_list(*COMPANY_FIELDS)),
+    }
+    cache.set(key, snapshot, timeout=settings.AUTH_USER_CACHE_TTL)
+    return snapshot
+
+
+def build_user(snapshot):
+    user = AuthenticatedUser.from_db("default", USER_FIELDS, snapshot["user"])
+    if snapshot["country"] is not None:
+        user._state.fields_cache["country"] = Country.from_db("default", COUNTRY_FIELDS, snapshot["country"])
+    user._cached_companies = [Company.from_db("default", COMPANY_FIELDS, values)
+                              for values in snapshot["companies"]]
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        snapshot = load_snapshot(user_id)
+        if snapshot is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        user = build_user(snapshot)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
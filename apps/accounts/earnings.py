@@ -0,0 +1,89 @@
+"""
+Share-based employee earnings.
+
+An employee assigned to an order (``Order.employees``) earns ``share`` percent
+of the order's ``NewOrder.total_price`` when the order is CLOSED. Earnings are
+counted in the period that contains ``Order.closed_at``.
+
+``compute_earnings`` runs one grouped query over the order-employee link
+table, joined to the closed orders of the period, and returns the base sum and
+order count of every employee. Only the per-employee rows reach Python, where
+the share is applied with Decimal rounding. The ``(status, closed_at)`` index
+on ``Order`` limits the join to the period's closed orders.
+
+``create_draft_payments`` stores the result as DRAFT ``EmployeePayment`` rows
+for the period. Earlier drafts of the same employees and period are replaced,
+so a period can be recomputed; employees whose payment for the period is
+already approved are skipped. Drafts do not touch ``Employee.total_salary``
+until they are approved (``EmployeePayment.objects.approve()``).
+"""
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import NamedTuple
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from apps.accounts.models import EmployeePayment
+from apps.orders.models import Order
+from apps.orders.rollups import day_start
+
+CENT = Decimal("0.01")
+
+
+class Earning(NamedTuple):
+    employee_id: int
+    orders_count: int
+    base_amount: Decimal
+    share: float
+    amount: Decimal
+
+
+def compute_earnings(period_start, period_end, employer_id=None):
+    """[Earning, ...] for the orders closed on ``period_start`` .. ``period_end`` (inclusive)"""
+    assignments = Order.employees.through.objects.filter(
+        order__status=Order.OrderStatusChoices.CLOSED,
+        order__closed_at__gte=day_start(period_start),
+        order__closed_at__lt=day_start(period_end + timedelta(days=1)),
+    )
+    if employer_id is not None:
+        assignments = assignments.filter(employee__employer_id=employer_id)
+
+    rows = (assignments.order_by()
+            .values("employee_id", "employee__share")
+            .annotate(orders_count=Count("order_id"),
+                      base_amount=Sum("order__order__order__total_price")))
+
+    earnings = []
+    for row in rows:
+        base_amount = row["base_amount"] or Decimal("0")
+        amount = (base_amount * Decimal(str(row["employee__share"])) / 100).quantize(CENT, ROUND_HALF_UP)
+        earnings.append(Earning(row["employee_id"], row["orders_count"], base_amount,
+                                row["employee__share"], amount))
+    return earnings
+
+
+@transaction.atomic
+def create_draft_payments(period_start, period_end, employer_id=None):
+    """Replace the DRAFT payments of the period with freshly computed earnings, returns the earnings"""
+    period_payments = EmployeePayment.objects.filter(period_start=period_start, period_end=period_end)
+    if employer_id is not None:
+        period_payments = period_payments.filter(employee__employer_id=employer_id)
+    # tasdiqlangan (PAID) davr to'lovi bo'lgan xodimga qayta hisoblanmaydi
+    paid = set(period_payments.filter(status=EmployeePayment.PaymentStatus.PAID)
+               .values_list("employee_id", flat=True))
+    earnings = [earning for earning in compute_earnings(period_start, period_end, employer_id)
+                if earning.amount > 0 and earning.employee_id not in paid]
+
+    period_payments.filter(status=EmployeePayment.PaymentStatus.DRAFT).delete()
+
+    EmployeePayment.objects.bulk_pay([
+        EmployeePayment(employee_id=earning.employee_id,
+                        amount=earning.amount,
+                        status=EmployeePayment.PaymentStatus.DRAFT,
+                        period_start=period_start,
+                        period_end=period_end)
+        for earning in earnings
+    ])
+    return earnings
+
@@ -0,0 +1,108 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.earnings import compute_earnings, create_draft_payments
+from apps.accounts.models import Employee, User
+from apps.common.models import Country, Currency, District, Region
+from apps.company.models import Company, Dealer, Provider
+from apps.materials.models import (DesignOption, DesignVariant, FrameProfilType, GlassLayer, GlassType,
+                                   MaterialType, ProfilType, SashProfilType)
+from apps.orders.models import NewOrder, Order, OrderDetail
+
+
+class Command(BaseCommand):
+    help = ("Measure the earnings engine on a synthetic month of closed orders. "
+            "The data is created in a transaction that is rolled back.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=20000)
+        parser.add_argument("--employees", type=int, default=200)
+        parser.add_argument("--per-order", type=int, default=3, help="Employees assigned to each order.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def _company(self):
+        country = Country.objects.create(name="Bench", code="BN")
+        region = Region.objects.create(country=country, name="Bench")
+        master = User.objects.create(full_name="Bench", phone_number="+998000000000", country=country)
+        company = Company.objects.create(region=region,
+                                         district=District.objects.create(region=region, name="Bench"),
+                                         dealer=Dealer.objects.create(name="Bench"),
+                                         master=master)
+        material = MaterialType.objects.create(name="Bench")
+        glass_layer = GlassLayer.objects.create(layer="Bench")
+        option = DesignOption.objects.create(name="Bench")
+        detail_fields = {
+            "material_type": OrderDetail.MaterialTypeChoices.PLAST,
+            "material": material,
+            "glass_layer": glass_layer,
+            "glass_type": GlassType.objects.create(layer=glass_layer, name="Bench", price=1,
+                                                   currency=Currency.objects.create(code="BNC", name="Bench",
+                                                                                    symbol="B")),
+            "provider": Provider.objects.create(name="Bench"),
+            "profil_type": ProfilType.objects.create(material=material, name="Bench"),
+            "sash_profil_type": SashProfilType.objects.create(image="bench.png"),
+            "frame_profile_type": FrameProfilType.objects.create(name="Bench"),
+            "design_option": option,
+            "design_variant": DesignVariant.objects.create(option=option, name="Bench"),
+            "shelf_width": 0,
+        }
+        return company, detail_fields
+
+    def _populate(self, rng, options):
+        company, detail_fields = self._company()
+        employees = Employee.objects.bulk_create(
+            Employee(full_name=f"Bench {i}", phone_number="+998000000000", profession="INSTALLER",
+                     share=rng.choice([2.5, 5, 7.5, 10]), employer=company.master)
+            for i in range(options["employees"])
+        )
+
+        count = options["orders"]
+        new_orders = NewOrder.objects.bulk_create(
+            NewOrder(company=company, order_type=NewOrder.OrderTypeChoices.WINDOW, order_number=f"bench-{i}",
+                     quantity=1, total_price=Decimal(rng.randint(500_000, 20_000_000)) / 100,
+                     advance_payment=0, order_owner="Bench", phone_number="+998000000000",
+                     location="Bench", additional_info="")
+            for i in range(count)
+        )
+        details = OrderDetail.objects.bulk_create(OrderDetail(order=new_order, **detail_fields)
+                                                  for new_order in new_orders)
+        month_start = timezone.now() - timedelta(days=30)
+        orders = Order.objects.bulk_create(
+            Order(order=detail, total_orders_number=i, total_price=detail.order.total_price,
+                  status=Order.OrderStatusChoices.CLOSED,
+                  closed_at=month_start + timedelta(seconds=rng.randint(0, 29 * 86400)))
+            for i, detail in enumerate(details)
+        )
+        Order.employees.through.objects.bulk_create(
+            Order.employees.through(order_id=order.id, employee_id=employee.id)
+            for order in orders
+            for employee in rng.sample(employees, min(options["per_order"], len(employees)))
+        )
+        return company, timezone.localdate(month_start), timezone.localdate()
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        with transaction.atomic():
+            start = time.perf_counter()
+            company, period_start, period_end = self._populate(rng, options)
+            self.stdout.write(f"Synthetic data: {options['orders']} closed orders, {options['employees']} employees, "
+                              f"{time.perf_counter() - start:.1f} s")
+
+            start = time.perf_counter()
+            earnings = compute_earnings(period_start, period_end, company.master_id)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"compute_earnings: {len(earnings)} employees, "
+                              f"total {sum(earning.amount for earning in earnings)}, {elapsed * 1000:.0f} ms")
+
+            start = time.perf_counter()
+            create_draft_payments(period_start, period_end, company.master_id)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"create_draft_payments: {elapsed * 1000:.0f} ms")
+
+            transaction.set_rollback(True)
@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.accounts.earnings import create_draft_payments
+
+
+class Command(BaseCommand):
+    help = "Compute employee earnings from closed orders and store them as draft payments."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--month", type=str, default=None,
+                            help="Period as YYYY-MM, default: the previous month.")
+        parser.add_argument("--from", dest="day_from", type=str, default=None, help="First day (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="day_to", type=str, default=None, help="Last day (YYYY-MM-DD).")
+        parser.add_argument("--employer", type=int, default=None,
+                            help="Only the employees of this user, default: all employers.")
+
+    def _period(self, options):
+        try:
+            if options["day_from"] or options["day_to"]:
+                if not (options["day_from"] and options["day_to"]):
+                    raise CommandError("--from and --to must be given together.")
+                return date.fromisoformat(options["day_from"]), date.fromisoformat(options["day_to"])
+            if options["month"]:
+                first = date.fromisoformat(f"{options['month']}-01")
+            else:
+                first = (timezone.localdate().replace(day=1) - timedelta(days=1)).replace(day=1)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        return first, last
+
+    def handle(self, *args, **options):
+        period_start, period_end = self._period(options)
+        if period_start > period_end:
+            raise CommandError("--from must not be after --to.")
+
+        earnings = create_draft_payments(period_start, period_end, options["employer"])
+        total = sum(earning.amount for earning in earnings)
+        self.stdout.write(f"{period_start} .. {period_end}: {len(earnings)} draft payments, total {total}")
@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.accounts.tokens import prune_tokens
+from apps.tasks.queue import enqueue
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding and blacklisted JWT refresh tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Rows deleted per transaction.")
+        parser.add_argument("--schedule", action="store_true",
+                            help="Queue the periodic prune task for the task workers instead of pruning now.")
+
+    def handle(self, *args, **options):
+        if options["schedule"]:
+            enqueue("accounts.prune_tokens", {"reschedule": True})
+            self.stdout.write(f"Queued token pruning every {settings.TOKEN_PRUNE_INTERVAL} seconds.")
+            return
+
+        started = time.perf_counter()
+        blacklisted, outstanding = prune_tokens(options["batch_size"] or settings.TOKEN_PRUNE_BATCH_SIZE)
+        self.stdout.write(f"Deleted {blacklisted} blacklisted and {outstanding} outstanding expired tokens "
+                          f"in {time.perf_counter() - started:.2f} s")
@@ -1,7 +1,29 @@
+from django.db import models
+from django.db.models.functions import Cast, Concat
 from django.contrib.auth.base_user import BaseUserManager
+from django.utils import timezone
 
 
-class CustomUserManager(BaseUserManager):
+class UserQuerySet(models.QuerySet):
+    def soft_delete(self):
+        """
+        Soft delete every user of the queryset with a single UPDATE.
+
+        The phone number gets a ``_deleted_<timestamp>`` suffix so it can be
+        registered again; returns the number of users deleted.
+        """
+        now = timezone.now()
+        suffix = f"_deleted_{int(now.timestamp())}"
+        return self.filter(is_deleted=False).update(
+            phone_number=Cast(Concat("phone_number", models.Value(suffix)), models.CharField()),
+            is_deleted=True,
+            is_active=False,
+            deleted_at=now,
+            updated_at=now,
+        )
+
+
+class CustomUserManager(BaseUserManager.from_queryset(UserQuerySet)):
     use_in_migrations = True
 
     def _create_user(self, full_name, phone_number, password =None, **extra_fields):
@@ -47,4 +69,12 @@ class CustomUserManager(BaseUserManager):
         if not password:
             raise ValueError("Superuser must have a password.")
 
-        return self._create_user(full_name, phone_number, password, **extra_fields)
\ No newline at end of file
+        return self._create_user(full_name, phone_number, password, **extra_fields)
+
+
+class ActiveUserManager(CustomUserManager):
+    """Default manager: soft deleted users are left out (``unique_active_phone_number`` covers the lookups)"""
+    use_in_migrations = False
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:46
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_total_salary(apps, schema_editor):
+    Employee = apps.get_model("accounts", "Employee")
+    EmployeePayment = apps.get_model("accounts", "EmployeePayment")
+    # bitta UPDATE bilan har bir xodimning to'lovlari yig'indisi yoziladi
+    totals = (EmployeePayment.objects.filter(employee=OuterRef("pk"))
+              .order_by()
+              .values("employee")
+              .annotate(total=Sum("amount"))
+              .values("total"))
+    Employee.objects.update(total_salary=Coalesce(Subquery(totals), Decimal("0"),
+                                                  output_field=models.DecimalField(max_digits=13, decimal_places=2)))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employee",
+            name="total_salary",
+            field=models.DecimalField(
+                decimal_places=2,
+                default=0,
+                editable=False,
+                max_digits=13,
+                verbose_name="Total salary",
+            ),
+        ),
+        migrations.RunPython(backfill_total_salary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_employee_total_salary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employeepayment",
+            name="period_end",
+            field=models.DateField(blank=True, null=True, verbose_name="Period end"),
+        ),
+        migrations.AddField(
+            model_name="employeepayment",
+            name="period_start",
+            field=models.DateField(blank=True, null=True, verbose_name="Period start"),
+        ),
+        migrations.AddField(
+            model_name="employeepayment",
+            name="status",
+            field=models.CharField(
+                choices=[("DRAFT", "Draft"), ("PAID", "Paid")],
+                default="PAID",
+                max_length=16,
+                verbose_name="Payment status",
+            ),
+        ),
+    ]
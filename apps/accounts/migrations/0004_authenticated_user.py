@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:52
+
+import apps.accounts.managers
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0003_employee_payment_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuthenticatedUser",
+            fields=[],
+            options={
+                "proxy": True,
+                "indexes": [],
+                "constraints": [],
+            },
+            bases=("accounts.user",),
+            managers=[
+                ("objects", apps.accounts.managers.CustomUserManager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:55
+
+import apps.accounts.managers
+import django.core.validators
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0004_authenticated_user"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("objects", django.db.models.manager.Manager()),
+                ("all_objects", apps.accounts.managers.CustomUserManager()),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="phone_number",
+            field=models.CharField(
+                db_index=True,
+                max_length=64,
+                unique=True,
+                validators=[
+                    django.core.validators.RegexValidator(regex="^\\+998\\d{9}$")
+                ],
+                verbose_name="Phone number",
+            ),
+        ),
+    ]
@@ -1,4 +1,7 @@
-from django.db import models
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import models, transaction
 from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
@@ -6,15 +9,16 @@ from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.utils import timezone
 
 from apps.common.models import BaseModel
-from apps.accounts.managers import CustomUserManager
+from apps.accounts.managers import ActiveUserManager, CustomUserManager
 
 
 class User(AbstractBaseUser, PermissionsMixin, BaseModel):
     full_name = models.CharField(max_length=256,
                                  verbose_name=_("Full name"),
                                  help_text=_("User's full name"))
+    # o'chirilgan akkauntlarda raqamga "_deleted_<timestamp>" qo'shiladi, shuning uchun uzunroq
     phone_number = models.CharField(
-        max_length=14,  
+        max_length=64,  
         validators=[
             RegexValidator(
                 regex=r"^\+998\d{9}$",
@@ -44,7 +48,8 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
         help_text=_("Timestamp when user was deleted")
     )
     
-    objects = CustomUserManager()
+    objects = ActiveUserManager()
+    all_objects = CustomUserManager()
     
     USERNAME_FIELD = "phone_number"
     REQUIRED_FIELDS = [
@@ -69,14 +74,44 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
 
     def delete_account(self):
         """Soft delete user account"""
-        timestamp = int(timezone.now().timestamp())
-        
-        self.phone_number = f"{self.phone_number}_deleted_{timestamp}"
-        self.is_deleted = True
-        self.is_active = False
-        self.deleted_at = timezone.now()
-        
-        self.save(update_fields=["phone_number", "is_deleted", "is_active", "deleted_at"])
+        from apps.accounts.authentication import invalidate_user
+
+        User.all_objects.filter(pk=self.pk).soft_delete()
+        self.refresh_from_db(from_queryset=User.all_objects.all(),
+                             fields=["phone_number", "is_deleted", "is_active", "deleted_at", "updated_at"])
+        invalidate_user(self.pk)
+
+
+
+class CachedCompanies:
+    """Read-only stand-in for ``user.company`` backed by the authentication cache"""
+
+    def __init__(self, user, companies):
+        self._user = user
+        self._companies = companies
+
+    def first(self):
+        return self._companies[0] if self._companies else None
+
+    def exists(self):
+        return bool(self._companies)
+
+    def __iter__(self):
+        return iter(self._companies)
+
+    def __getattr__(self, name):
+        # boshqa so'rovlar (filter, all, create ...) odatiy related manager orqali bajariladi
+        return getattr(User.company.__get__(self._user), name)
+
+
+# API so'rovlarida keshdan tiklangan foydalanuvchi (apps.accounts.authentication)
+class AuthenticatedUser(User):
+    class Meta:
+        proxy = True
+
+    @property
+    def company(self):
+        return CachedCompanies(self, self._cached_companies)
 
 
 class Employee(BaseModel):
@@ -108,21 +143,75 @@ class Employee(BaseModel):
                                  on_delete=models.CASCADE,
                                  verbose_name=_("Employer"))
     
-    @property
-    def total_salary(self):
-        return self.payments.aggregate(
-            total=models.Sum("amount")
-        )["total"] or 0
+    # to'langan maoshlar yig'indisi, har bir EmployeePayment bilan bir tranzaksiyada yangilanadi
+    total_salary = models.DecimalField(max_digits=13,
+                                       decimal_places=2,
+                                       default=0,
+                                       editable=False,
+                                       verbose_name=_("Total salary"))
     
     def __str__(self):
         return self.full_name
-    
+
+    def save(self, *args, **kwargs):
+        # total_salary faqat add_to_salaries orqali o'zgaradi, eskirgan nusxa balansni qayta yozmasligi kerak
+        if not self._state.adding and kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+            kwargs["update_fields"] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name != "total_salary"]
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _("Employee")
         verbose_name_plural = _("Employees")
 
 
+def add_to_salaries(amounts):
+    """Move the running balances of many employees, ``{employee_id: amount}``, with a single UPDATE"""
+    if not amounts:
+        return
+    delta = models.Case(*(models.When(pk=employee_id, then=models.Value(amount))
+                          for employee_id, amount in amounts.items()),
+                        output_field=models.DecimalField(max_digits=13, decimal_places=2))
+    Employee.objects.filter(pk__in=amounts).update(total_salary=models.F("total_salary") + delta)
+
+
+def add_to_salary(employee_id, amount):
+    add_to_salaries({employee_id: amount})
+
+
+class EmployeePaymentQuerySet(models.QuerySet):
+    def bulk_pay(self, payments):
+        """Insert many payments with one INSERT and move the balances of the PAID ones with one UPDATE"""
+        amounts = defaultdict(Decimal)
+        for payment in payments:
+            if payment.status == EmployeePayment.PaymentStatus.PAID:
+                amounts[payment.employee_id] += payment.amount
+        with transaction.atomic():
+            payments = self.bulk_create(payments)
+            add_to_salaries(amounts)
+        return payments
+
+    def approve(self):
+        """Mark the DRAFT payments of the queryset PAID and add them to the balances, returns the count"""
+        with transaction.atomic():
+            drafts = self.filter(status=EmployeePayment.PaymentStatus.DRAFT)
+            totals = drafts.order_by().values("employee_id").annotate(total=models.Sum("amount"))
+            add_to_salaries({row["employee_id"]: row["total"] for row in totals})
+            return drafts.update(status=EmployeePayment.PaymentStatus.PAID, updated_at=timezone.now())
+
+    def delete(self):
+        with transaction.atomic():
+            totals = (self.filter(status=EmployeePayment.PaymentStatus.PAID)
+                      .order_by().values("employee_id").annotate(total=models.Sum("amount")))
+            add_to_salaries({row["employee_id"]: -row["total"] for row in totals})
+            return super().delete()
+
+
 class EmployeePayment(BaseModel):
+    class PaymentStatus(models.TextChoices):
+        DRAFT = "DRAFT", _("Draft")  # hisoblangan, hali to'lanmagan
+        PAID = "PAID", _("Paid")
+
     employee = models.ForeignKey(Employee,
                                  on_delete=models.CASCADE,
                                  related_name="payments",
@@ -130,9 +219,42 @@ class EmployeePayment(BaseModel):
     amount = models.DecimalField(max_digits=11, 
                                  decimal_places=2,
                                  verbose_name=_("Amount"))
+    # faqat PAID to'lovlar Employee.total_salary ga qo'shiladi
+    status = models.CharField(max_length=16,
+                              choices=PaymentStatus.choices,
+                              default=PaymentStatus.PAID,
+                              verbose_name=_("Payment status"))
+    # ulushdan hisoblangan to'lovlar uchun hisob davri (apps.accounts.earnings)
+    period_start = models.DateField(null=True,
+                                    blank=True,
+                                    verbose_name=_("Period start"))
+    period_end = models.DateField(null=True,
+                                  blank=True,
+                                  verbose_name=_("Period end"))
+
+    objects = EmployeePaymentQuerySet.as_manager()
     
     def __str__(self):
         return self.employee.full_name
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            if not self._state.adding:
+                previous = (EmployeePayment.objects.filter(pk=self.pk, status=self.PaymentStatus.PAID)
+                            .values("employee_id", "amount").first())
+                if previous:
+                    add_to_salary(previous["employee_id"], -previous["amount"])
+            super().save(*args, **kwargs)
+            if self.status == self.PaymentStatus.PAID:
+                add_to_salary(self.employee_id, self.amount)
+        if "employee" in self._state.fields_cache:
+            self.employee.refresh_from_db(fields=["total_salary"])
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            if self.status == self.PaymentStatus.PAID:
+                add_to_salary(self.employee_id, -self.amount)
+            return super().delete(*args, **kwargs)
     
     class Meta:
         verbose_name = _("Employee Payment")
@@ -0,0 +1,203 @@
+"""
+One-time login codes.
+
+A code is issued per phone number and kept in an ``OTPStore`` shared by every
+worker process, so the code issued by one gunicorn worker can be verified by
+another. The store is chosen with ``settings.OTP_STORE``:
+
+* ``SQLiteOTPStore`` keeps codes in a local SQLite file
+  (``settings.OTP_SQLITE_PATH``). It is the stand-in for development and for
+  a single host, where all workers share the same file.
+* ``CacheOTPStore`` keeps codes in a Django cache (``settings.OTP_CACHE_ALIAS``).
+  Use it with a cache that all hosts share, e.g. Redis. A per-process cache
+  such as LocMemCache does not work here.
+
+Only a keyed hash of the code is stored. A new code for the same phone is
+refused for ``OTP_RESEND_COOLDOWN`` seconds. Every wrong guess counts against
+the code, and after ``OTP_MAX_ATTEMPTS`` wrong guesses the code is burned. A
+correct code is consumed by the same atomic step that checks it, so two
+concurrent requests can never both log in with one code.
+
+Verification runs before any ``User`` query, so guesses against a locked or
+missing code never reach the users table.
+"""
+import enum
+import hashlib
+import hmac
+import secrets
+import sqlite3
+import string
+import time
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+
+class VerifyResult(enum.Enum):
+    OK = "ok"
+    INVALID = "invalid"
+    EXPIRED = "expired"
+    LOCKED = "locked"
+
+
+class OTPCooldown(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"A new code can be requested in {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+def generate_code(length=6):
+    return "".join(secrets.choice(string.digits) for _ in range(length))
+
+
+def hash_code(phone_number, code):
+    key = settings.SECRET_KEY.encode() if settings.SECRET_KEY else b""
+    return hmac.new(key, f"{phone_number}:{code}".encode(), hashlib.sha256).hexdigest()
+
+
+class OTPStore(ABC):
+    """Shared storage of issued codes, implemented by the backends below"""
+
+    def __init__(self):
+        self.ttl = settings.OTP_TTL
+        self.cooldown = settings.OTP_RESEND_COOLDOWN
+        self.max_attempts = settings.OTP_MAX_ATTEMPTS
+
+    @abstractmethod
+    def issue(self, phone_number, code_hash):
+        """Store a new code, raises OTPCooldown while the previous one is too recent"""
+
+    @abstractmethod
+    def verify(self, phone_number, code_hash):
+        """Check a code and consume it when it matches, returns a VerifyResult"""
+
+
+class SQLiteOTPStore(OTPStore):
+    """Codes in a SQLite file; BEGIN IMMEDIATE serializes the workers of one host"""
+
+    def __init__(self, path=None):
+        super().__init__()
+        self.path = str(path or settings.OTP_SQLITE_PATH)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS otp_codes ("
+                "phone_number TEXT PRIMARY KEY, code_hash TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, resend_at REAL NOT NULL, attempts INTEGER NOT NULL)"
+            )
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def _transaction(self, callback):
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                result = callback(connection, time.time())
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            return result
+        finally:
+            connection.close()
+
+    def issue(self, phone_number, code_hash):
+        def run(connection, now):
+            row = connection.execute("SELECT resend_at FROM otp_codes WHERE phone_number = ?",
+                                     (phone_number,)).fetchone()
+            if row and row[0] > now:
+                raise OTPCooldown(int(row[0] - now) + 1)
+            connection.execute(
+                "INSERT OR REPLACE INTO otp_codes (phone_number, code_hash, expires_at, resend_at, attempts) "
+                "VALUES (?, ?, ?, ?, 0)",
+                (phone_number, code_hash, now + self.ttl, now + self.cooldown),
+            )
+            # muddati o'tgan kodlar vaqti-vaqti bilan tozalanadi
+            connection.execute("DELETE FROM otp_codes WHERE expires_at < ? AND resend_at < ?", (now, now))
+        self._transaction(run)
+
+    def verify(self, phone_number, code_hash):
+        def run(connection, now):
+            row = connection.execute("SELECT code_hash, expires_at, attempts FROM otp_codes WHERE phone_number = ?",
+                                     (phone_number,)).fetchone()
+            if row is None or row[1] < now:
+                return VerifyResult.EXPIRED
+            stored_hash, _, attempts = row
+            if attempts >= self.max_attempts:
+                return VerifyResult.LOCKED
+            if hmac.compare_digest(stored_hash, code_hash):
+                # kod ishlatildi, lekin qayta yuborish kutish vaqti saqlanib qoladi
+                connection.execute("UPDATE otp_codes SET expires_at = 0 WHERE phone_number = ?", (phone_number,))
+                return VerifyResult.OK
+            connection.execute("UPDATE otp_codes SET attempts = attempts + 1 WHERE phone_number = ?",
+                               (phone_number,))
+            return VerifyResult.LOCKED if attempts + 1 >= self.max_attempts else VerifyResult.INVALID
+        return self._transaction(run)
+
+
+class CacheOTPStore(OTPStore):
+    """
+    Codes in a shared Django cache.
+
+    ``add`` sets the resend cooldown and ``incr`` counts attempts. ``delete``
+    consumes the code, and only the request whose delete removed the key logs
+    in. On Redis each of these steps is a single atomic command.
+    """
+
+    def __init__(self, alias=None):
+        super().__init__()
+        self.cache = caches[alias or settings.OTP_CACHE_ALIAS]
+
+    def _keys(self, phone_number):
+        return f"otp_code_{phone_number}", f"otp_attempts_{phone_number}", f"otp_resend_{phone_number}"
+
+    def issue(self, phone_number, code_hash):
+        code_key, attempts_key, resend_key = self._keys(phone_number)
+        if not self.cache.add(resend_key, time.time() + self.cooldown, timeout=self.cooldown):
+            resend_at = self.cache.get(resend_key) or time.time() + self.cooldown
+            raise OTPCooldown(max(1, int(resend_at - time.time()) + 1))
+        self.cache.set_many({code_key: code_hash, attempts_key: 0}, timeout=self.ttl)
+
+    def verify(self, phone_number, code_hash):
+        code_key, attempts_key, _ = self._keys(phone_number)
+        stored_hash = self.cache.get(code_key)
+        if stored_hash is None:
+            return VerifyResult.EXPIRED
+        try:
+            attempts = self.cache.incr(attempts_key)
+        except ValueError:
+            # urinishlar hisoblagichi koddan oldin o'chib ketgan
+            return VerifyResult.EXPIRED
+        if attempts > self.max_attempts:
+            self.cache.delete(code_key)
+            return VerifyResult.LOCKED
+        if hmac.compare_digest(stored_hash, code_hash):
+            return VerifyResult.OK if self.cache.delete(code_key) else VerifyResult.EXPIRED
+        return VerifyResult.LOCKED if attempts >= self.max_attempts else VerifyResult.INVALID
+
+
+_store = None
+
+
+def get_store():
+    """The configured store, created once per process"""
+    global _store
+    if _store is None:
+        _store = import_string(settings.OTP_STORE)()
+    return _store
+
+
+def issue_code(phone_number):
+    """Issue a new code for a phone number and return it, raises OTPCooldown"""
+    code = generate_code()
+    get_store().issue(phone_number, hash_code(phone_number, code))
+    return code
+
+
+def verify_code(phone_number, code):
+    return get_store().verify(phone_number, hash_code(phone_number, code))
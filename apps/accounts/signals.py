@@ -0,0 +1,20 @@
+from django.dispatch import receiver
+from django.db.models.signals import post_delete, post_save
+
+from apps.accounts.authentication import invalidate_user
+from apps.accounts.models import AuthenticatedUser, User
+from apps.company.models import Company
+
+
+# profil o'zgarganda yoki akkaunt o'chirilganda keshdagi foydalanuvchi eskiradi
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=AuthenticatedUser)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_cached_master(sender, instance, **kwargs):
+    invalidate_user(instance.master_id)
@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.accounts.tokens import prune_tokens
+from apps.tasks.queue import enqueue, task
+
+
+@task(name="accounts.prune_tokens")
+def prune_expired_tokens(reschedule=True):
+    prune_tokens(settings.TOKEN_PRUNE_BATCH_SIZE)
+    # keyingi tozalash navbatga qo'yiladi, shu tariqa vazifa davriy ishlaydi
+    if reschedule:
+        enqueue("accounts.prune_tokens", {"reschedule": True},
+                run_after=timezone.now() + timedelta(seconds=settings.TOKEN_PRUNE_INTERVAL))
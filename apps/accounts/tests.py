@@ -1,3 +1,406 @@
-from django.test import TestCase
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts import earnings, otp, tokens
+from apps.accounts.actions import deactivate_users
+from apps.accounts.authentication import load_snapshot
+from apps.accounts.models import Employee, EmployeePayment, User
+from apps.common.models import Country, District, Region
+from apps.company.models import Company, Dealer
+
+
+def statements(queries):
+    """First keyword of every captured query, without the savepoints of atomic requests"""
+    return [query["sql"].split()[0] for query in queries if not query["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+
+
+class EmployeeBalanceTests(TestCase):
+    def setUp(self):
+        self.employer = User.all_objects.create(full_name="Employer", phone_number="+998900000001")
+        self.employee = Employee.objects.create(full_name="Worker", phone_number="+998900000002",
+                                                profession=Employee.ProfessionsChoices.INSTALLER,
+                                                share=10, employer=self.employer)
+
+    def test_stale_save_keeps_balance(self):
+        stale = Employee.objects.get(pk=self.employee.pk)
+        EmployeePayment.objects.create(employee_id=self.employee.pk, amount=Decimal("100"))
+
+        stale.full_name = "Renamed"
+        stale.save()
+
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.full_name, "Renamed")
+        self.assertEqual(self.employee.total_salary, Decimal("100"))
+
+
+class EmployeeListTests(APITestCase):
+    def setUp(self):
+        self.employer = User.all_objects.create(full_name="Employer", phone_number="+998900000001")
+        self.client.force_authenticate(self.employer)
+
+    def add_employee(self, salary):
+        employee = Employee.objects.create(full_name="Worker", phone_number="+998900000002",
+                                           profession=Employee.ProfessionsChoices.INSTALLER,
+                                           share=10, employer=self.employer)
+        EmployeePayment.objects.create(employee=employee, amount=Decimal(salary))
+        return employee
+
+    def test_query_count_does_not_grow_with_employees(self):
+        self.add_employee("10")
+        with CaptureQueriesContext(connection) as one:
+            self.client.get("/api/accounts/employees/list/")
+        queries = len(one)
+
+        for salary in ("20", "30", "40"):
+            self.add_employee(salary)
+        with self.assertNumQueries(queries):
+            response = self.client.get("/api/accounts/employees/list/")
+        self.assertEqual(sorted(row["total_salary"] for row in response.data), ["10.00", "20.00", "30.00", "40.00"])
+
+    def test_salary_endpoint_moves_balance(self):
+        employee = self.add_employee("10")
+
+        response = self.client.post("/api/accounts/employee/salary/", {"employee": employee.id, "amount": "15.50"})
+        self.assertEqual(response.status_code, 201, response.data)
+        employee.refresh_from_db()
+        self.assertEqual(employee.total_salary, Decimal("25.50"))
+
+
+class PayrollRunTests(APITestCase):
+    def setUp(self):
+        self.employer = User.all_objects.create(full_name="Employer", phone_number="+998900000001")
+        self.other = User.all_objects.create(full_name="Other", phone_number="+998900000003")
+        self.first, self.second = (Employee.objects.create(full_name=f"Worker {index}",
+                                                           phone_number="+998900000002",
+                                                           profession=Employee.ProfessionsChoices.DRIVER,
+                                                           share=5, employer=self.employer)
+                                   for index in range(2))
+        self.client.force_authenticate(self.employer)
+
+    def run_payroll(self, payments):
+        return self.client.post("/api/accounts/employee/salary/payroll/", {"payments": payments}, format="json")
+
+    def test_payroll_moves_every_balance(self):
+        payments = [{"employee": self.first.id, "amount": "100.00"},
+                    {"employee": self.second.id, "amount": "50.00"},
+                    {"employee": self.first.id, "amount": "25.25"}]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.run_payroll(payments)
+
+        # egalik tekshiruvi, bitta INSERT va bitta UPDATE
+        self.assertEqual(statements(queries), ["SELECT", "INSERT", "UPDATE"])
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual((response.data["payments_count"], response.data["employees_count"]), (3, 2))
+        self.assertEqual(response.data["total_amount"], "175.25")
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual((self.first.total_salary, self.second.total_salary), (Decimal("125.25"), Decimal("50")))
+
+    def test_foreign_employee_is_refused(self):
+        stranger = Employee.objects.create(full_name="Stranger", phone_number="+998900000004",
+                                           profession=Employee.ProfessionsChoices.DRIVER,
+                                           share=5, employer=self.other)
+
+        response = self.run_payroll([{"employee": self.first.id, "amount": "10"},
+                                     {"employee": stranger.id, "amount": "10"}])
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(EmployeePayment.objects.exists())
+
+
+class DraftPaymentTests(TestCase):
+    period = (date(2026, 9, 1), date(2026, 9, 30))
+
+    def setUp(self):
+        employer = User.all_objects.create(full_name="Employer", phone_number="+998900000001")
+        self.employee = Employee.objects.create(full_name="Worker", phone_number="+998900000002",
+                                                profession=Employee.ProfessionsChoices.INSTALLER,
+                                                share=10, employer=employer)
+
+    def balance(self):
+        self.employee.refresh_from_db()
+        return self.employee.total_salary
+
+    def create_drafts(self, amount):
+        earning = earnings.Earning(self.employee.id, 1, amount * 10, 10.0, amount)
+        with mock.patch.object(earnings, "compute_earnings", return_value=[earning]):
+            return earnings.create_draft_payments(*self.period)
+
+    def test_draft_is_not_counted_until_approved(self):
+        self.create_drafts(Decimal("30"))
+        self.assertEqual(self.balance(), Decimal("0"))
+
+        self.assertEqual(EmployeePayment.objects.approve(), 1)
+        self.assertEqual(self.balance(), Decimal("30"))
+        # allaqachon tasdiqlangan to'lov ikkinchi marta qo'shilmaydi
+        self.assertEqual(EmployeePayment.objects.approve(), 0)
+        self.assertEqual(self.balance(), Decimal("30"))
+
+    def test_recomputed_period_replaces_drafts(self):
+        self.create_drafts(Decimal("30"))
+        self.create_drafts(Decimal("45"))
+
+        self.assertEqual(list(EmployeePayment.objects.values_list("amount", "status")),
+                         [(Decimal("45"), EmployeePayment.PaymentStatus.DRAFT)])
+
+    def test_approved_period_is_not_recomputed(self):
+        self.create_drafts(Decimal("30"))
+        EmployeePayment.objects.approve()
+
+        self.assertEqual(self.create_drafts(Decimal("45")), [])
+        self.assertEqual(EmployeePayment.objects.count(), 1)
+
+    def test_deleting_payments_moves_balance(self):
+        EmployeePayment.objects.create(employee=self.employee, amount=Decimal("100"))
+        self.create_drafts(Decimal("30"))
+
+        EmployeePayment.objects.all().delete()
+        self.assertEqual(self.balance(), Decimal("0"))
+
+    def test_draft_turned_paid_on_save(self):
+        payment = EmployeePayment.objects.create(employee=self.employee, amount=Decimal("20"),
+                                                 status=EmployeePayment.PaymentStatus.DRAFT)
+        self.assertEqual(self.balance(), Decimal("0"))
+
+        payment.status = EmployeePayment.PaymentStatus.PAID
+        payment.save()
+        self.assertEqual(self.balance(), Decimal("20"))
+
+        payment.delete()
+        self.assertEqual(self.balance(), Decimal("0"))
+
+    def test_no_closed_orders(self):
+        self.assertEqual(earnings.compute_earnings(*self.period), [])
+
+
+class OTPStoreTests:
+    """Shared checks of an ``otp.OTPStore`` backend, ``make_store`` is set by the subclasses"""
+    phone_number = "+998900000001"
+
+    def setUp(self):
+        cache.clear()
+        self.store = self.make_store()
+
+    def issue(self, code="123456"):
+        self.store.issue(self.phone_number, otp.hash_code(self.phone_number, code))
+
+    def verify(self, code="123456"):
+        return self.store.verify(self.phone_number, otp.hash_code(self.phone_number, code))
+
+    def test_code_is_used_once(self):
+        self.issue()
+
+        self.assertEqual(self.verify(), otp.VerifyResult.OK)
+        self.assertEqual(self.verify(), otp.VerifyResult.EXPIRED)
+
+    def test_resend_cooldown(self):
+        self.issue()
+
+        with self.assertRaises(otp.OTPCooldown) as raised:
+            self.issue("654321")
+        self.assertGreater(raised.exception.retry_after, 0)
+        self.assertEqual(self.verify(), otp.VerifyResult.OK)
+
+    @override_settings(OTP_MAX_ATTEMPTS=3)
+    def test_wrong_guesses_burn_the_code(self):
+        self.store = self.make_store()
+        self.issue()
+
+        self.assertEqual(self.verify("000000"), otp.VerifyResult.INVALID)
+        self.assertEqual(self.verify("000001"), otp.VerifyResult.INVALID)
+        self.assertEqual(self.verify("000002"), otp.VerifyResult.LOCKED)
+        self.assertEqual(self.verify(), otp.VerifyResult.LOCKED)
+
+    def test_unknown_phone(self):
+        self.assertEqual(self.verify(), otp.VerifyResult.EXPIRED)
+
+
+class SQLiteOTPStoreTests(OTPStoreTests, SimpleTestCase):
+    def make_store(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return otp.SQLiteOTPStore(Path(directory.name) / "otp.sqlite3")
+
+
+class CacheOTPStoreTests(OTPStoreTests, SimpleTestCase):
+    def make_store(self):
+        return otp.CacheOTPStore()
+
+
+@override_settings(OTP_STORE="apps.accounts.otp.CacheOTPStore")
+class LoginCodeTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        otp._store = None
+        self.addCleanup(setattr, otp, "_store", None)
+        self.user = User.all_objects.create(full_name="User", phone_number="+998900000001")
+
+    def login(self):
+        with mock.patch.object(otp, "generate_code", return_value="123456"):
+            return self.client.post("/api/accounts/login/", {"phone_number": self.user.phone_number})
+
+    def verify(self, code="123456"):
+        return self.client.post("/api/accounts/verify/code/", {"phone_number": self.user.phone_number, "code": code})
+
+    def test_login_code_is_used_once(self):
+        self.assertEqual(self.login().status_code, 200)
+
+        response = self.verify()
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertIn("access_token", response.data)
+        self.assertEqual(self.verify().status_code, 400)
+
+    def test_new_code_waits_for_cooldown(self):
+        self.assertEqual(self.login().status_code, 200)
+
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    def test_locked_code_is_refused(self):
+        self.login()
+
+        for _ in range(otp.get_store().max_attempts - 1):
+            self.assertEqual(self.verify("000000").status_code, 400)
+        self.assertEqual(self.verify("000000").status_code, 429)
+        # to'g'ri kod ham endi qabul qilinmaydi
+        self.assertEqual(self.verify().status_code, 429)
+
+
+class CachedAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.all_objects.create(full_name="User", phone_number="+998900000001")
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_warm_request_runs_no_query(self):
+        self.assertEqual(self.client.get("/api/accounts/profile/").status_code, 200)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/accounts/profile/")
+        self.assertEqual(response.data["full_name"], "User")
+        self.assertEqual(statements(queries), [])
+
+    def test_profile_update_drops_snapshot_after_commit(self):
+        self.client.get("/api/accounts/profile/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch("/api/accounts/profile/", {"full_name": "Renamed"})
+            self.assertEqual(response.status_code, 200, response.data)
+            # kommitgacha eski nusxa keshda qoladi
+            self.assertIsNotNone(cache.get(f"auth_user_{self.user.pk}"))
+
+        self.assertEqual(self.client.get("/api/accounts/profile/").data["full_name"], "Renamed")
+
+    def test_company_change_drops_master_snapshot(self):
+        self.assertEqual(load_snapshot(self.user.pk)["companies"], [])
+
+        region = Region.objects.create(country=Country.objects.create(name="Uzbekistan", code="UZ"), name="Tashkent")
+        with self.captureOnCommitCallbacks(execute=True):
+            Company.objects.create(region=region,
+                                   district=District.objects.create(region=region, name="Yunusobod"),
+                                   dealer=Dealer.objects.create(name="Dealer"),
+                                   master=self.user)
+
+        self.assertEqual(len(load_snapshot(self.user.pk)["companies"]), 1)
+
+    def test_deleted_account_is_refused(self):
+        self.client.get("/api/accounts/profile/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete_account()
+
+        self.assertEqual(self.client.get("/api/accounts/profile/").status_code, 401)
+
+
+class RefreshTokenRevocationTests(APITestCase):
+    def setUp(self):
+        patcher = mock.patch.object(tokens, "blacklist_filter", tokens.BlacklistFilter())
+        self.blacklist_filter = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.all_objects.create(full_name="User", phone_number="+998900000001")
+        self.refresh = str(tokens.FilteredRefreshToken.for_user(self.user))
+
+    def refresh_token(self):
+        return self.client.post("/api/token/refresh/", {"refresh": self.refresh})
+
+    def test_valid_token_skips_blacklist_query(self):
+        self.assertEqual(self.refresh_token().status_code, 200)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.refresh_token()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any("token_blacklist_blacklistedtoken" in query["sql"] for query in queries))
+
+    def test_logged_out_token_is_refused(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.post("/api/accounts/logout/", {"refresh": self.refresh}).status_code, 200)
+
+        self.assertEqual(self.refresh_token().status_code, 401)
+
+    @override_settings(TOKEN_BLACKLIST_SYNC_INTERVAL=0)
+    def test_token_revoked_by_another_worker_is_refused(self):
+        self.assertEqual(self.refresh_token().status_code, 200)
+
+        # boshqa worker qora ro'yxatga qo'shgan, bu workerning filtri hali bilmaydi
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get())
+        self.assertEqual(self.refresh_token().status_code, 401)
+
+    def test_prune_removes_expired_tokens(self):
+        expired = OutstandingToken.objects.create(user=self.user, jti="expired", token="-",
+                                                  expires_at=timezone.now() - timedelta(days=1))
+        BlacklistedToken.objects.create(token=expired)
+
+        self.assertEqual(tokens.prune_tokens(batch_size=1), (1, 1))
+        self.assertEqual(list(OutstandingToken.objects.values_list("jti", flat=True)),
+                         [RefreshToken(self.refresh)["jti"]])
+
+
+class SoftDeleteTests(TestCase):
+    def setUp(self):
+        self.users = [User.all_objects.create(full_name=f"User {index}", phone_number=f"+99890000000{index}")
+                      for index in range(3)]
+
+    def test_one_update_for_many_users(self):
+        with self.assertNumQueries(1):
+            deleted = User.all_objects.filter(pk__in=[user.pk for user in self.users[:2]]).soft_delete()
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(list(User.objects.values_list("pk", flat=True)), [self.users[2].pk])
+        self.assertTrue(all(user.phone_number.startswith(f"+99890000000{index}_deleted_")
+                            for index, user in enumerate(User.all_objects.filter(is_deleted=True).order_by("pk"))))
+        # allaqachon o'chirilganlar qayta o'zgartirilmaydi
+        self.assertEqual(User.all_objects.all().soft_delete(), 1)
+
+    def test_phone_number_can_register_again(self):
+        self.users[0].delete_account()
+
+        self.assertFalse(self.users[0].is_active)
+        self.assertIsNotNone(self.users[0].deleted_at)
+        User.all_objects.create(full_name="New", phone_number="+998900000000")
+        self.assertEqual(User.objects.get(phone_number="+998900000000").full_name, "New")
+
+    def test_admin_action(self):
+        cache.set(f"auth_user_{self.users[0].pk}", {"user": ()})
+
+        with mock.patch("apps.accounts.actions.messages") as messages, \
+                self.captureOnCommitCallbacks(execute=True):
+            deactivate_users(None, None, User.objects.filter(pk__in=[self.users[0].pk, self.users[1].pk]))
+
+        self.assertEqual(User.objects.count(), 1)
+        self.assertIn("2 user(s)", messages.success.call_args.args[1])
+        self.assertIsNone(cache.get(f"auth_user_{self.users[0].pk}"))
@@ -0,0 +1,152 @@
+"""
+Refresh token revocation and blacklist pruning.
+
+``rest_framework_simplejwt.token_blacklist`` checks every refresh token with a
+join against the blacklist tables, and nothing ever removed expired rows.
+
+``BlacklistFilter`` is a per-process Bloom filter over the jti of every
+blacklisted token. A token that misses the filter was not blacklisted when the
+filter was last synced, so ``FilteredRefreshToken`` skips the blacklist query
+for it. A hit (revoked, or a false positive, about 1%) still runs the exact
+query. Every ``TOKEN_BLACKLIST_SYNC_INTERVAL`` seconds the filter pulls rows
+newer than the last blacklist id it has seen, minus a small overlap for ids
+that commit out of order. That is an indexed range read.
+So a token revoked by another worker is refused there within that interval.
+Tokens revoked by this worker are added at once. Pruning only removes rows,
+which can only cause false positives, so the filter is rebuilt from scratch
+just when it fills up or after ``TOKEN_BLACKLIST_FILTER_REBUILD`` seconds.
+
+``prune_tokens`` deletes expired outstanding tokens and their blacklist rows
+in primary key batches, so no single statement locks the tables for long.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+FALSE_POSITIVE_RATE = 0.01
+MIN_CAPACITY = 10_000
+SYNC_OVERLAP = 1000
+
+
+class BloomFilter:
+    __slots__ = ("size", "hashes", "bits", "count", "capacity")
+
+    def __init__(self, capacity):
+        self.capacity = max(capacity, MIN_CAPACITY)
+        self.size = math.ceil(-self.capacity * math.log(FALSE_POSITIVE_RATE) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        # ikki xesh qiymatidan k ta pozitsiya olinadi (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class BlacklistFilter:
+    """Bloom filter of blacklisted jti values, synced incrementally from the database"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.last_id = 0
+        self.synced_at = 0.0
+        self.built_at = 0.0
+
+    def _rebuild(self):
+        rows = list(BlacklistedToken.objects.order_by().values_list("id", "token__jti"))
+        bloom = BloomFilter(len(rows) * 2)
+        for row_id, jti in rows:
+            bloom.add(jti)
+        self.bloom = bloom
+        self.last_id = max((row_id for row_id, jti in rows), default=0)
+        self.built_at = time.monotonic()
+
+    def _sync(self):
+        # id lar commit tartibida kelmasligi mumkin, shuning uchun oxirgi SYNC_OVERLAP ta yozuv qayta o'qiladi
+        rows = (BlacklistedToken.objects.filter(id__gt=self.last_id - SYNC_OVERLAP)
+                .order_by("id")
+                .values_list("id", "token__jti"))
+        for row_id, jti in rows:
+            if jti not in self.bloom:
+                self.bloom.add(jti)
+            self.last_id = max(self.last_id, row_id)
+
+    def refresh(self):
+        now = time.monotonic()
+        if self.bloom is not None and now - self.synced_at < settings.TOKEN_BLACKLIST_SYNC_INTERVAL:
+            return
+        with self.lock:
+            if self.bloom is not None and now - self.synced_at < settings.TOKEN_BLACKLIST_SYNC_INTERVAL:
+                return
+            if (self.bloom is None or self.bloom.count > self.bloom.capacity
+                    or now - self.built_at > settings.TOKEN_BLACKLIST_FILTER_REBUILD):
+                self._rebuild()
+            else:
+                self._sync()
+            self.synced_at = now
+
+    def might_contain(self, jti):
+        self.refresh()
+        return jti in self.bloom
+
+    def add(self, jti):
+        if self.bloom is not None:
+            self.bloom.add(jti)
+
+
+blacklist_filter = BlacklistFilter()
+
+
+class FilteredRefreshToken(RefreshToken):
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if not blacklist_filter.might_contain(jti):
+            return
+        if BlacklistedToken.objects.filter(token__jti=jti).exists():
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        blacklisted = super().blacklist()
+        jti = self.payload[api_settings.JTI_CLAIM]
+        transaction.on_commit(lambda: blacklist_filter.add(jti))
+        return blacklisted
+
+
+def _delete_in_batches(queryset, batch_size):
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            deleted += queryset.model.objects.filter(pk__in=ids).delete()[1].get(queryset.model._meta.label, 0)
+
+
+def prune_tokens(batch_size=5000):
+    """Delete expired blacklisted and outstanding tokens, returns (blacklisted, outstanding) counts"""
+    now = timezone.now()
+    # avval bog'liq qora ro'yxat yozuvlari, keyin tokenlarning o'zi
+    blacklisted = _delete_in_batches(BlacklistedToken.objects.filter(token__expires_at__lte=now), batch_size)
+    outstanding = _delete_in_batches(OutstandingToken.objects.filter(expires_at__lte=now), batch_size)
+    return blacklisted, outstanding
@@ -12,6 +12,7 @@ from apps.accounts.api_endpoints import (
     EmployeesListAPIView,
     EmployeeUpdateAPIView,
     EmployeeAddSalaryAPIView,
+    EmployeePayrollRunAPIView,
     EmployeeSalariesHistoryAPIView,
     EmployeeDeleteAPIView,
 )
@@ -30,6 +31,7 @@ urlpatterns = [
     path("employees/list/", EmployeesListAPIView.as_view(), name="employees-list"),
     path("employee/<int:pk>/update/", EmployeeUpdateAPIView.as_view(), name="employee-update"),
     path("employee/salary/", EmployeeAddSalaryAPIView.as_view(), name="employee-add-salary"),
+    path("employee/salary/payroll/", EmployeePayrollRunAPIView.as_view(), name="employee-payroll-run"),
     path("employee/<int:employee_id>/salaries/history/", 
          EmployeeSalariesHistoryAPIView.as_view(),
          name="employee-salaries-history"),
@@ -29,6 +29,7 @@ class CountryAdmin(admin.ModelAdmin):
 class RegionAdmin(admin.ModelAdmin):
     """Admin configuration for the Region model."""
     list_display = ("id", "name", "country", "created_at")
+    list_select_related = ("country",)
     list_filter = ("country",)
     search_fields = ("name", "country__name") 
     readonly_fields = ("created_at", "updated_at")
@@ -41,6 +42,7 @@ class RegionAdmin(admin.ModelAdmin):
 class DistrictAdmin(admin.ModelAdmin):
     """Admin configuration for the District model."""
     list_display = ("id", "name", "region", "country_name", "created_at")
+    list_select_related = ("region__country",)
     list_filter = ("region__country", "region") 
     search_fields = ("name", "region__name")
     readonly_fields = ("created_at", "updated_at")
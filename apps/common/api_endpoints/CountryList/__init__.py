@@ -0,0 +1 @@
+from .views import CountryListAPIView
\ No newline at end of file
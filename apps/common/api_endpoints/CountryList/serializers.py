@@ -0,0 +1,7 @@
+from rest_framework import serializers
+
+
+class CountrySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    code = serializers.CharField()
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.utils.decorators import method_decorator
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.reference import reference_registry, reference_response
+from .serializers import CountrySerializer
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class CountryListAPIView(GenericAPIView):
+    """All countries from the in-memory reference registry, with ETag / 304 support."""
+    serializer_class = CountrySerializer
+    permission_classes = [AllowAny, ]
+    authentication_classes = []
+    renderer_classes = [JSONRenderer, ]
+
+    def get(self, request, *args, **kwargs):
+        snapshot = reference_registry.get()
+        return reference_response(request, snapshot, "countries",
+                                  lambda snapshot: CountrySerializer(snapshot.countries, many=True).data)
+
+
+
+__all__ = [
+    "CountryListAPIView"
+]
@@ -0,0 +1 @@
+from .views import CurrencyListAPIView
\ No newline at end of file
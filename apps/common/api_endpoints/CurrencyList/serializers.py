@@ -0,0 +1,8 @@
+from rest_framework import serializers
+
+
+class CurrencySerializer(serializers.Serializer):
+    code = serializers.CharField()
+    name = serializers.CharField()
+    symbol = serializers.CharField()
+    unit = serializers.DecimalField(max_digits=6, decimal_places=2)
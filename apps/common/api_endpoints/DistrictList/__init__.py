@@ -0,0 +1 @@
+from .views import DistrictListAPIView
\ No newline at end of file
@@ -0,0 +1,7 @@
+from rest_framework import serializers
+
+
+class DistrictSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    region = serializers.IntegerField(source="region_id")
+    name = serializers.CharField()
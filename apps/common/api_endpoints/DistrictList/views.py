@@ -0,0 +1,33 @@
+from django.db import transaction
+from django.utils.decorators import method_decorator
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.reference import reference_registry, reference_response
+from .serializers import DistrictSerializer
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class DistrictListAPIView(GenericAPIView):
+    """Districts of one region from the in-memory reference registry, with ETag / 304 support."""
+    serializer_class = DistrictSerializer
+    permission_classes = [AllowAny, ]
+    authentication_classes = []
+    renderer_classes = [JSONRenderer, ]
+
+    def get(self, request, region_id, *args, **kwargs):
+        snapshot = reference_registry.get()
+        if region_id not in snapshot.region_ids:
+            raise NotFound("Region not found")
+        return reference_response(
+            request, snapshot, f"districts:{region_id}",
+            lambda snapshot: DistrictSerializer(snapshot.districts_by_region.get(region_id, []), many=True).data,
+        )
+
+
+
+__all__ = [
+    "DistrictListAPIView"
+]
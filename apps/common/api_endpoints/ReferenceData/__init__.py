@@ -0,0 +1 @@
+from .views import ReferenceDataAPIView
\ No newline at end of file
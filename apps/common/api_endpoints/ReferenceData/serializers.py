@@ -0,0 +1,14 @@
+from rest_framework import serializers
+
+from apps.common.api_endpoints.CountryList.serializers import CountrySerializer
+from apps.common.api_endpoints.CurrencyList.serializers import CurrencySerializer
+from apps.common.api_endpoints.DistrictList.serializers import DistrictSerializer
+from apps.common.api_endpoints.RegionList.serializers import RegionSerializer
+
+
+class ReferenceDataSerializer(serializers.Serializer):
+    version = serializers.CharField()
+    countries = CountrySerializer(many=True)
+    regions = RegionSerializer(many=True)
+    districts = DistrictSerializer(many=True)
+    currencies = CurrencySerializer(many=True)
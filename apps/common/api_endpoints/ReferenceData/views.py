@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.utils.decorators import method_decorator
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.reference import reference_registry, reference_response
+from .serializers import ReferenceDataSerializer
+
+
+# faqat xotiradan o'qiydi, ATOMIC_REQUESTS tranzaksiyasi kerak emas
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ReferenceDataAPIView(GenericAPIView):
+    """
+    Countries, regions, districts and currencies in one response, fetched by
+    the mobile app on start. Send the ETag back in If-None-Match to get 304.
+    """
+    serializer_class = ReferenceDataSerializer
+    permission_classes = [AllowAny, ]
+    authentication_classes = []
+    renderer_classes = [JSONRenderer, ]
+
+    def get(self, request, *args, **kwargs):
+        snapshot = reference_registry.get()
+        return reference_response(request, snapshot, "all",
+                                  lambda snapshot: ReferenceDataSerializer(snapshot).data)
+
+
+
+__all__ = [
+    "ReferenceDataAPIView"
+]
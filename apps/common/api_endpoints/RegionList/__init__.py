@@ -0,0 +1 @@
+from .views import RegionListAPIView
\ No newline at end of file
@@ -0,0 +1,7 @@
+from rest_framework import serializers
+
+
+class RegionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    country = serializers.IntegerField(source="country_id")
+    name = serializers.CharField()
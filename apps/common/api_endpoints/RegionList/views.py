@@ -0,0 +1,33 @@
+from django.db import transaction
+from django.utils.decorators import method_decorator
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.reference import reference_registry, reference_response
+from .serializers import RegionSerializer
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class RegionListAPIView(GenericAPIView):
+    """Regions of one country from the in-memory reference registry, with ETag / 304 support."""
+    serializer_class = RegionSerializer
+    permission_classes = [AllowAny, ]
+    authentication_classes = []
+    renderer_classes = [JSONRenderer, ]
+
+    def get(self, request, country_id, *args, **kwargs):
+        snapshot = reference_registry.get()
+        if country_id not in snapshot.country_ids:
+            raise NotFound("Country not found")
+        return reference_response(
+            request, snapshot, f"regions:{country_id}",
+            lambda snapshot: RegionSerializer(snapshot.regions_by_country.get(country_id, []), many=True).data,
+        )
+
+
+
+__all__ = [
+    "RegionListAPIView"
+]
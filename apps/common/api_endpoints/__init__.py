@@ -0,0 +1,5 @@
+from .CountryList import * # noqa
+from .RegionList import * # noqa
+from .DistrictList import * # noqa
+from .CurrencyList import * # noqa
+from .ReferenceData import * # noqa
@@ -0,0 +1,12 @@
+from django.utils.http import parse_etags
+
+
+def etag_matches(request, etag):
+    """True when the request's If-None-Match already names ``etag``"""
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match kuchsiz taqqoslash bilan tekshiriladi (RFC 9110)
+    return etag in {tag.removeprefix("W/") for tag in parse_etags(if_none_match)}
@@ -0,0 +1,154 @@
+"""
+Resized variants of uploaded catalog images.
+
+Catalog images (``IMAGE_FIELDS``) are uploaded at full size. After an upload
+commits, ``queue_variants`` queues the ``common.generate_image_variants``
+task. The task renders one WEBP file per size in ``settings.IMAGE_VARIANTS``,
+fitted to that many pixels on the longest side. Files are content-addressed,
+``variants/<aa>/<sha256 of the original>-<size>.webp``. The same picture
+uploaded twice is rendered once, and a file never changes, so it can be
+cached forever. An ``ImageVariant`` row maps each stored original to its
+variant files.
+
+``variant_urls`` resolves many originals with one query and keeps the result
+in the Django cache for ``settings.IMAGE_VARIANT_CACHE_TTL`` seconds. With the
+default per-process ``LocMemCache`` that cache, and the marker that queues an
+original only once, are per worker: other workers see new variants when
+their cached result expires, and may each queue the same original once. An
+original without variants (uploaded before this pipeline, or still queued) is
+served at full size until its variants exist. Then the
+``image_variants_ready`` signal is sent, so cached payloads can be rebuilt.
+An original that is missing or is not an image gets a ``NO_VARIANTS`` marker
+row instead, so it is served at full size and never queued again.
+"""
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.dispatch import Signal
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from apps.common.models import ImageVariant
+
+# modeldagi rasm maydonlari, yuklanganda variantlar yaratiladi
+IMAGE_FIELDS = {
+    "materials.DesignVariant": "image",
+    "materials.SashProfilType": "image",
+    "materials.FrameProfilType": "image",
+    "materials.HandleType": "image",
+    "materials.Product": "image",
+    "materials.CustomProduct": "image",
+    "company.Provider": "logo",
+}
+VARIANT_FORMAT = "WEBP"
+PENDING_TIMEOUT = 10 * 60
+# variantlari bo'lmaydigan asl fayl uchun belgi qatori (fayl yo'q yoki rasm emas)
+NO_VARIANTS = ""
+
+image_variants_ready = Signal()
+
+
+def _cache_key(name):
+    return f"image_variants_{hashlib.sha256(name.encode()).hexdigest()[:32]}"
+
+
+def _pending_key(name):
+    return f"image_variants_pending_{hashlib.sha256(name.encode()).hexdigest()[:32]}"
+
+
+def variant_path(digest, size):
+    return f"variants/{digest[:2]}/{digest}-{size}.{VARIANT_FORMAT.lower()}"
+
+
+def _render(image, size):
+    variant = image.copy()
+    variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+    if variant.mode not in ("RGB", "RGBA"):
+        variant = variant.convert("RGBA" if "A" in variant.getbands() or "transparency" in variant.info else "RGB")
+    buffer = BytesIO()
+    variant.save(buffer, VARIANT_FORMAT, quality=settings.IMAGE_VARIANT_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def _record_no_variants(name):
+    ImageVariant.objects.bulk_create([ImageVariant(source=name, variant=NO_VARIANTS, path="")],
+                                     ignore_conflicts=True)
+    cache.delete(_cache_key(name))
+
+
+def generate_variants(name):
+    """Render the variants of one stored original, returns the number of variants recorded"""
+    try:
+        with default_storage.open(name, "rb") as source:
+            data = source.read()
+    except FileNotFoundError:
+        _record_no_variants(name)
+        return 0
+    digest = hashlib.sha256(data).hexdigest()
+
+    image = None
+    rows = []
+    for variant, size in settings.IMAGE_VARIANTS.items():
+        path = variant_path(digest, size)
+        if not default_storage.exists(path):
+            if image is None:
+                try:
+                    image = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+                except (UnidentifiedImageError, OSError):
+                    # rasm bo'lmagan fayllar (masalan SVG) asl holida beriladi
+                    _record_no_variants(name)
+                    return 0
+            path = default_storage.save(path, ContentFile(_render(image, size)))
+        rows.append(ImageVariant(source=name, variant=variant, path=path))
+
+    ImageVariant.objects.bulk_create(rows, update_conflicts=True,
+                                     unique_fields=["source", "variant"],
+                                     update_fields=["path", "updated_at"])
+    cache.delete(_cache_key(name))
+    image_variants_ready.send(sender=ImageVariant, sources=[name])
+    return len(rows)
+
+
+def queue_variants(name):
+    """Queue the variants of an original once, until the task is done or PENDING_TIMEOUT passes"""
+    from apps.common.tasks import generate_image_variants
+
+    if name and cache.add(_pending_key(name), True, timeout=PENDING_TIMEOUT):
+        generate_image_variants.enqueue(name=name)
+
+
+def variant_urls(names):
+    """
+    ``{name: {variant: url}}`` for stored originals, one query for the uncached ones.
+
+    Originals without any row are left out and queued; originals with only
+    the ``NO_VARIANTS`` marker map to an empty dict.
+    """
+    names = {name for name in names if name}
+    keys = {_cache_key(name): name for name in names}
+    result = {keys[key]: urls for key, urls in cache.get_many(list(keys)).items()}
+
+    missing = names - result.keys()
+    if missing:
+        found = {}
+        for source, variant, path in (ImageVariant.objects.filter(source__in=missing)
+                                      .values_list("source", "variant", "path")):
+            urls = found.setdefault(source, {})
+            if variant != NO_VARIANTS:
+                urls[variant] = default_storage.url(path)
+        cache.set_many({_cache_key(name): urls for name, urls in found.items()},
+                       timeout=settings.IMAGE_VARIANT_CACHE_TTL)
+        result.update(found)
+        for name in missing - found.keys():
+            queue_variants(name)
+    return result
+
+
+def variant_url(field_file, variant="thumb"):
+    """URL of one variant of a FileField value, the original's URL until the variant exists"""
+    if not field_file:
+        return None
+    return variant_urls([field_file.name]).get(field_file.name, {}).get(variant) or field_file.url
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageVariant",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+                (
+                    "source",
+                    models.CharField(max_length=255, verbose_name="Original file name"),
+                ),
+                (
+                    "variant",
+                    models.CharField(max_length=16, verbose_name="Variant name"),
+                ),
+                (
+                    "path",
+                    models.CharField(max_length=255, verbose_name="Variant file name"),
+                ),
+            ],
+            options={
+                "verbose_name": "Image Variant",
+                "verbose_name_plural": "Image Variants",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("source", "variant"), name="unique_image_variant"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -27,6 +27,18 @@ class Country(BaseModel):
         return f"{self.name} - {self.code}"
     
 
+class RegionManager(models.Manager):
+    # __str__ ota qator nomini o'qiydi: admin formalari va filtrlaridagi tanlovlar
+    # har bir qator uchun alohida so'rov yubormaydi
+    def get_queryset(self):
+        return super().get_queryset().select_related("country")
+
+
+class DistrictManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().select_related("region")
+
+
 class Region(BaseModel):
     country = models.ForeignKey(Country,
                                 on_delete=models.CASCADE,
@@ -34,6 +46,8 @@ class Region(BaseModel):
                                 verbose_name=_("Country"))
     name = models.CharField(max_length=64,
                             verbose_name=_("Region name"))
+
+    objects = RegionManager()
     
     class Meta:
         verbose_name = _("Region")
@@ -50,6 +64,8 @@ class District(BaseModel):
                                verbose_name=_("Region"))
     name = models.CharField(max_length=64,
                             verbose_name=_("District name"))
+
+    objects = DistrictManager()
     
     class Meta:
         verbose_name = _("District")
@@ -77,4 +93,27 @@ class Currency(BaseModel):
         verbose_name_plural = _("Currencies")
 
     def __str__(self):
-        return f"{self.code} - {self.name}"
\ No newline at end of file
+        return f"{self.code} - {self.name}"
+
+
+class ImageVariant(BaseModel):
+    """A resized, content-addressed copy of an uploaded image, see ``apps.common.images``"""
+    source = models.CharField(max_length=255,
+                              verbose_name=_("Original file name"))
+    variant = models.CharField(max_length=16,
+                               verbose_name=_("Variant name"))
+    path = models.CharField(max_length=255,
+                            verbose_name=_("Variant file name"))
+
+    class Meta:
+        verbose_name = _("Image Variant")
+        verbose_name_plural = _("Image Variants")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source", "variant"],
+                name="unique_image_variant"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.source} - {self.variant}"
@@ -0,0 +1,121 @@
+"""
+Reference data registry: countries, regions, districts and currencies.
+
+The four tables are small and rarely change, yet every app start and every
+dropdown reads them. ``reference_registry`` keeps a ``ReferenceSnapshot`` of
+all four in worker memory. The snapshot holds the rows and the region and
+district lists grouped by parent.
+
+At most every ``settings.REFERENCE_DATA_SYNC_INTERVAL`` seconds the registry
+reads a fingerprint of the tables, the row count and latest ``updated_at`` of
+each. The tables are loaded again only when the fingerprint has changed. Saves
+and deletes in this worker (the admin) reset the interval through the signals
+in ``apps.common.signals``, so the next request reloads at once. Other
+workers pick the change up within the interval. A ``QuerySet.update()`` that
+does not touch ``updated_at`` is not seen.
+
+Every response built from a snapshot carries a strong ``ETag`` derived from
+the snapshot version. A client that sends it back in ``If-None-Match`` gets
+``304 Not Modified`` without a body and without a database query.
+"""
+import hashlib
+import json
+import threading
+import time
+from itertools import groupby
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.common.conditional import etag_matches
+from apps.common.models import Country, Currency, District, Region
+
+COUNTRY_FIELDS = ("id", "name", "code")
+REGION_FIELDS = ("id", "country_id", "name")
+DISTRICT_FIELDS = ("id", "region_id", "name")
+CURRENCY_FIELDS = ("code", "name", "symbol", "unit")
+MODELS = (Country, Region, District, Currency)
+
+
+class ReferenceSnapshot:
+    def __init__(self, countries, regions, districts, currencies):
+        self.countries = countries
+        self.regions = regions
+        self.districts = districts
+        self.currencies = currencies
+
+        self.country_ids = {country["id"] for country in countries}
+        self.region_ids = {region["id"] for region in regions}
+        self.regions_by_country = {key: list(rows) for key, rows in
+                                   groupby(sorted(regions, key=lambda row: row["country_id"]),
+                                           key=lambda row: row["country_id"])}
+        self.districts_by_region = {key: list(rows) for key, rows in
+                                    groupby(sorted(districts, key=lambda row: row["region_id"]),
+                                            key=lambda row: row["region_id"])}
+
+        content = json.dumps([countries, regions, districts, currencies], cls=DjangoJSONEncoder, sort_keys=True)
+        self.version = hashlib.sha256(content.encode()).hexdigest()[:32]
+        self._payloads = {}
+
+    def etag(self, key):
+        # bir xil versiya va kalit har doim bir xil javob beradi, shuning uchun kuchli ETag
+        return '"%s"' % hashlib.sha256(f"{self.version}:{key}".encode()).hexdigest()[:32]
+
+    def payload(self, key, build):
+        """Response data for ``key``, built once per snapshot"""
+        if key not in self._payloads:
+            self._payloads[key] = build(self)
+        return self._payloads[key]
+
+
+class ReferenceRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.fingerprint = None
+        self.checked_at = float("-inf")
+
+    def _fingerprint(self):
+        return tuple(tuple(model.objects.order_by().aggregate(count=Count("pk"), updated=Max("updated_at")).values())
+                     for model in MODELS)
+
+    def _load(self):
+        return ReferenceSnapshot(
+            countries=list(Country.objects.order_by("name", "id").values(*COUNTRY_FIELDS)),
+            regions=list(Region.objects.order_by("name", "id").values(*REGION_FIELDS)),
+            districts=list(District.objects.order_by("name", "id").values(*DISTRICT_FIELDS)),
+            currencies=list(Currency.objects.order_by("code").values(*CURRENCY_FIELDS)),
+        )
+
+    def get(self):
+        now = time.monotonic()
+        if self.snapshot is not None and now - self.checked_at < settings.REFERENCE_DATA_SYNC_INTERVAL:
+            return self.snapshot
+        with self.lock:
+            if self.snapshot is not None and now - self.checked_at < settings.REFERENCE_DATA_SYNC_INTERVAL:
+                return self.snapshot
+            fingerprint = self._fingerprint()
+            if self.snapshot is None or fingerprint != self.fingerprint:
+                self.snapshot = self._load()
+                self.fingerprint = fingerprint
+            self.checked_at = now
+            return self.snapshot
+
+    def invalidate(self):
+        """Check the tables again on the next read"""
+        self.checked_at = float("-inf")
+
+
+reference_registry = ReferenceRegistry()
+
+
+def reference_response(request, snapshot, key, build):
+    """200 with the payload of ``key``, or 304 when the client already has it"""
+    etag = snapshot.etag(key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(snapshot.payload(key, build), headers=headers)
@@ -0,0 +1,31 @@
+from django.db import transaction
+from django.dispatch import receiver
+from django.db.models.signals import post_delete, post_save
+
+from apps.common.images import IMAGE_FIELDS, queue_variants
+from apps.common.models import Country, Currency, District, ImageVariant, Region
+from apps.common.reference import reference_registry
+
+
+# ma'lumotnoma o'zgarganda keyingi so'rov jadvallarni qayta tekshiradi
+@receiver(post_save, sender=Country)
+@receiver(post_save, sender=Region)
+@receiver(post_save, sender=District)
+@receiver(post_save, sender=Currency)
+@receiver(post_delete, sender=Country)
+@receiver(post_delete, sender=Region)
+@receiver(post_delete, sender=District)
+@receiver(post_delete, sender=Currency)
+def invalidate_reference_data(sender, instance, **kwargs):
+    transaction.on_commit(reference_registry.invalidate)
+
+
+# yangi yuklangan rasm uchun kichik variantlar navbatga qo'yiladi
+def queue_uploaded_image_variants(sender, instance, **kwargs):
+    name = getattr(instance, IMAGE_FIELDS[sender._meta.label]).name
+    if name and not ImageVariant.objects.filter(source=name).exists():
+        queue_variants(name)
+
+
+for label in IMAGE_FIELDS:
+    post_save.connect(queue_uploaded_image_variants, sender=label, dispatch_uid=f"image_variants_{label}")
@@ -0,0 +1,7 @@
+from apps.common.images import generate_variants
+from apps.tasks.queue import task
+
+
+@task(name="common.generate_image_variants")
+def generate_image_variants(name):
+    generate_variants(name)
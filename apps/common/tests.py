@@ -1,3 +1,229 @@
-from django.test import TestCase
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import User
+from apps.common import images
+from apps.common.models import Country, Currency, District, ImageVariant, Region
+from apps.common.reference import reference_registry
+from apps.company.models import Company, Dealer
+from apps.tasks.models import Task
+from core.media import serve_file
+
+
+class ReferenceDataTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.country = Country.objects.create(name="Uzbekistan", code="UZ")
+        cls.region = Region.objects.create(country=cls.country, name="Tashkent")
+        District.objects.create(region=cls.region, name="Yunusobod")
+        Currency.objects.create(code="UZS", name="Sum", symbol="s")
+
+    def setUp(self):
+        # registr worker xotirasida, boshqa testlarning snapshoti qolmasligi kerak
+        reference_registry.snapshot = None
+        reference_registry.invalidate()
+
+    def test_known_etag_gets_304_without_query(self):
+        response = self.client.get("/api/common/reference/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+        with self.assertNumQueries(0):
+            cached = self.client.get("/api/common/reference/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], response["ETag"])
+        self.assertEqual(cached.content, b"")
+
+    def test_change_is_seen_after_commit(self):
+        etag = self.client.get("/api/common/reference/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Region.objects.create(country=self.country, name="Samarkand")
+
+        response = self.client.get("/api/common/reference/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_regions_of_country(self):
+        response = self.client.get(f"/api/common/countries/{self.country.id}/regions/")
+        self.assertEqual([region["name"] for region in response.json()], ["Tashkent"])
+
+        cached = self.client.get(f"/api/common/countries/{self.country.id}/regions/",
+                                 HTTP_IF_NONE_MATCH=f'W/{response["ETag"]}')
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(self.client.get(f"/api/common/countries/{self.country.id + 1}/regions/").status_code, 404)
+
+
+class ReferenceModelTests(TestCase):
+    def test_names_come_from_related_rows(self):
+        region = Region.objects.create(country=Country.objects.create(name="Uzbekistan", code="UZ"), name="Tashkent")
+        district = District.objects.create(region=region, name="Yunusobod")
+
+        self.assertEqual(str(region), "Tashkent - Uzbekistan")
+        self.assertEqual(str(district), "Tashkent - Yunusobod")
+
+    def test_admin_choices_do_not_query_per_row(self):
+        admin = User.all_objects.create(full_name="Admin", phone_number="+998900000001",
+                                        is_staff=True, is_superuser=True)
+        country = Country.objects.create(name="Uzbekistan", code="UZ")
+        master = User.all_objects.create(full_name="Master", phone_number="+998900000002")
+        self.client.force_login(admin)
+
+        def add_rows(count):
+            for index in range(count):
+                region = Region.objects.create(country=country, name=f"Region {Region.objects.count()}")
+                district = District.objects.create(region=region, name=f"District {index}")
+            Company.objects.get_or_create(region=region, district=district, master=master,
+                                          dealer=Dealer.objects.get_or_create(name="Dealer")[0])
+
+        def count_queries(url):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            return len(queries)
+
+        add_rows(10)
+        # birinchi so'rov kontent turlarini keshga oladi
+        count_queries("/admin/company/company/add/")
+        add_form = count_queries("/admin/company/company/add/")
+        changelist = count_queries("/admin/company/company/")
+        add_rows(10)
+        self.assertEqual(count_queries("/admin/company/company/add/"), add_form)
+        self.assertEqual(count_queries("/admin/company/company/"), changelist)
+
+
+class ServeFileTests(SimpleTestCase):
+    content = b"0123456789"
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        (Path(self.root) / "file.txt").write_bytes(self.content)
+
+    def get(self, path="file.txt", **headers):
+        request = RequestFactory().get(f"/media/{path}", headers=headers)
+        return serve_file(request, path, document_root=self.root, url_prefix="/media/")
+
+    def body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_whole_file(self):
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.content)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertNotIn("immutable", response["Cache-Control"])
+
+    def test_not_modified(self):
+        response = self.get()
+
+        self.assertEqual(self.get(If_None_Match=response["ETag"]).status_code, 304)
+        self.assertEqual(self.get(If_Modified_Since=response["Last-Modified"]).status_code, 304)
+        # If-None-Match bo'lsa If-Modified-Since e'tiborga olinmaydi
+        self.assertEqual(self.get(If_None_Match='"other"', If_Modified_Since=response["Last-Modified"]).status_code,
+                         200)
+
+    def test_byte_ranges(self):
+        response = self.get(Range="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(self.body(response), b"2345")
+
+        response = self.get(Range="bytes=-3")
+        self.assertEqual((response["Content-Range"], self.body(response)), ("bytes 7-9/10", b"789"))
+
+    def test_unsatisfiable_range(self):
+        response = self.get(Range="bytes=20-")
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+
+    def test_stale_if_range_sends_whole_file(self):
+        response = self.get(Range="bytes=2-5", If_Range='"stale"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.content)
+
+    def test_hashed_variant_is_immutable(self):
+        path = f"variants/ab/{'a' * 64}-320.webp"
+        (Path(self.root) / path).parent.mkdir(parents=True)
+        (Path(self.root) / path).write_bytes(self.content)
+
+        self.assertIn("immutable", self.get(path)["Cache-Control"])
+
+    def test_outside_root_is_not_served(self):
+        for path in ("../secret.txt", "missing.txt", "."):
+            with self.assertRaises(Http404):
+                self.get(path)
+
+    @override_settings(FILE_OFFLOAD="x-accel-redirect", FILE_OFFLOAD_PREFIX="/internal")
+    def test_offload_to_proxy(self):
+        response = self.get()
+
+        self.assertEqual(response["X-Accel-Redirect"], "/internal/media/file.txt")
+        self.assertEqual(response.content, b"")
+
+    @override_settings(FILE_OFFLOAD="x-accel-redirect", FILE_OFFLOAD_PREFIX="/internal")
+    def test_offload_path_is_quoted(self):
+        (Path(self.root) / "oyna #1 ё.txt").write_bytes(self.content)
+
+        response = self.get("oyna #1 ё.txt")
+        self.assertEqual(response["X-Accel-Redirect"], "/internal/media/oyna%20%231%20%D1%91.txt")
+
+
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(MEDIA_ROOT=directory.name, IMAGE_VARIANTS={"thumb": 16, "small": 32})
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def save_image(self, name, size=(100, 50)):
+        buffer = BytesIO()
+        Image.new("RGB", size, "red").save(buffer, "PNG")
+        return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+    def test_variants_are_rendered_once_per_content(self):
+        first, second = self.save_image("products/a.png"), self.save_image("products/b.png")
+
+        with mock.patch.object(images.image_variants_ready, "send") as ready:
+            self.assertEqual(images.generate_variants(first), 2)
+            images.generate_variants(second)
+        ready.assert_called_with(sender=ImageVariant, sources=[second])
+
+        urls = images.variant_urls([first, second])
+        self.assertEqual(urls[first], urls[second])
+        with default_storage.open(ImageVariant.objects.get(source=first, variant="small").path) as variant:
+            self.assertEqual(Image.open(variant).size, (32, 16))
+
+    def test_original_without_variants_is_queued_once(self):
+        name = self.save_image("products/a.png")
+
+        self.assertEqual(images.variant_urls([name]), {})
+        self.assertEqual(images.variant_urls([name]), {})
+        self.assertEqual(Task.objects.filter(name="common.generate_image_variants").count(), 1)
+
+    def test_broken_original_is_not_queued_again(self):
+        name = default_storage.save("products/logo.svg", ContentFile(b"<svg/>"))
+
+        self.assertEqual(images.generate_variants(name), 0)
+        self.assertEqual(images.generate_variants("products/missing.png"), 0)
+        cache.clear()
+        self.assertEqual(images.variant_urls([name, "products/missing.png"]),
+                         {name: {}, "products/missing.png": {}})
+        self.assertFalse(Task.objects.exists())
@@ -1,7 +1,19 @@
 from django.urls import path
 
+from apps.common.api_endpoints import (
+    ReferenceDataAPIView,
+    CountryListAPIView,
+    RegionListAPIView,
+    DistrictListAPIView,
+    CurrencyListAPIView,
+)
+
 app_name = "common"
 
-ulr_patterns = [
-    
-]
\ No newline at end of file
+urlpatterns = [
+    path("reference/", ReferenceDataAPIView.as_view(), name="reference-data"),
+    path("countries/", CountryListAPIView.as_view(), name="country-list"),
+    path("countries/<int:country_id>/regions/", RegionListAPIView.as_view(), name="region-list"),
+    path("regions/<int:region_id>/districts/", DistrictListAPIView.as_view(), name="district-list"),
+    path("currencies/", CurrencyListAPIView.as_view(), name="currency-list"),
+]
@@ -3,7 +3,9 @@ from decimal import Decimal
 from django.contrib import admin
 from django.utils.html import format_html
 
+from apps.common.images import variant_url
 from apps.company.models import Dealer, Company, ProductConfig, Provider 
+from apps.orders.price_books import rebuild_price_book
 
 
 class ProductConfigInline(admin.TabularInline):
@@ -72,6 +74,11 @@ class CompanyAdmin(admin.ModelAdmin):
     )
     
     inlines = [ProductConfigInline]
+
+    # ProductConfig qatorlari o'zgargan bo'lishi mumkin, narxlar kitobi qayta quriladi
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        rebuild_price_book(form.instance.pk)
     
 
     @admin.display(description='Dealer Name')
@@ -120,6 +127,20 @@ class ProductConfigAdmin(admin.ModelAdmin):
     def company_dealer_name(self, obj):
         return obj.company.dealer.name
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        rebuild_price_book(obj.company_id)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        rebuild_price_book(obj.company_id)
+
+    def delete_queryset(self, request, queryset):
+        company_ids = set(queryset.values_list("company_id", flat=True))
+        super().delete_queryset(request, queryset)
+        for company_id in company_ids:
+            rebuild_price_book(company_id)
+
 
 @admin.register(Provider)
 class ProviderAdmin(admin.ModelAdmin):
@@ -134,5 +155,5 @@ class ProviderAdmin(admin.ModelAdmin):
     def logo_thumbnail(self, obj):
         if obj.logo:
             # Adjust max_height to control thumbnail size
-            return format_html('<img src="{}" style="max-height: 50px;" />', obj.logo.url)
+            return format_html('<img src="{}" style="max-height: 50px;" />', variant_url(obj.logo))
         return "No Image"
\ No newline at end of file
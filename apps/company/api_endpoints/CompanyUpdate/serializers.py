@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from apps.company.models import Company, ProductConfig
+from apps.orders.price_books import rebuild_price_book
 from apps.company.api_endpoints.CompanyAdd.serializers import CompanySerializer, ProductConfigSerializer
 
 
@@ -26,6 +27,8 @@ class CompanyProductConfigUpdateSerializer(serializers.Serializer):
                     product_type=product_type,
                     defaults=config
                 )
+            # foyda qoidalari o'zgardi, kompaniyaning narxlar kitobi yangi versiya bilan quriladi
+            rebuild_price_book(instance.id)
         return instance
 
     def to_representation(self, instance):
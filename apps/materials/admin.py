@@ -8,6 +8,41 @@ from apps.materials.models import (
     GlassLayer, GlassType, SashProfilType, FrameProfilType, 
     HandleType, Category, Product, CustomProduct
 )
+from apps.common.images import variant_url
+from apps.materials.catalog import invalidate_catalog
+from apps.orders.price_books import catalog_changed
+
+
+class CatalogPriceAdminMixin:
+    """Narxlar o'zgarganda barcha kompaniyalarning narxlar kitobi qayta quriladi"""
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        catalog_changed()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        catalog_changed()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        catalog_changed()
+
+
+class CatalogVersionAdminMixin:
+    """Konfigurator katalogidagi o'zgarish katalog versiyasini oshiradi"""
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        invalidate_catalog()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_catalog()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_catalog()
 
 
 class DesignVariantInline(admin.TabularInline):
@@ -19,7 +54,7 @@ class DesignVariantInline(admin.TabularInline):
     @admin.display(description='Image Preview')
     def image_thumbnail(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', obj.image.url)
+            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', variant_url(obj.image))
         return "No Image"
 
 class ProfilTypeInline(admin.TabularInline):
@@ -34,7 +69,7 @@ class GlassTypeInline(admin.TabularInline):
     raw_id_fields = ('currency',) 
 
 @admin.register(DesignOption)
-class DesignOptionAdmin(admin.ModelAdmin):
+class DesignOptionAdmin(CatalogVersionAdminMixin, admin.ModelAdmin):
     list_display = ("id", "name", "created_at")
     search_fields = ("name",)
     readonly_fields = ("created_at", "updated_at")
@@ -42,7 +77,7 @@ class DesignOptionAdmin(admin.ModelAdmin):
 
 
 @admin.register(MaterialType)
-class MaterialTypeAdmin(admin.ModelAdmin):
+class MaterialTypeAdmin(CatalogVersionAdminMixin, admin.ModelAdmin):
     list_display = ("id", "name", "created_at")
     search_fields = ("name",)
     readonly_fields = ("created_at", "updated_at")
@@ -50,7 +85,7 @@ class MaterialTypeAdmin(admin.ModelAdmin):
 
 
 @admin.register(GlassLayer)
-class GlassLayerAdmin(admin.ModelAdmin):
+class GlassLayerAdmin(CatalogVersionAdminMixin, CatalogPriceAdminMixin, admin.ModelAdmin):
     list_display = ("id", "layer", "created_at")
     search_fields = ("layer",)
     readonly_fields = ("created_at", "updated_at")
@@ -58,25 +93,25 @@ class GlassLayerAdmin(admin.ModelAdmin):
 
 def get_image_thumbnail_display(obj):
     if obj.image:
-        return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', obj.image.url)
+        return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', variant_url(obj.image))
     return "No Image"
 
 
 @admin.register(SashProfilType)
-class SashProfilTypeAdmin(admin.ModelAdmin):
+class SashProfilTypeAdmin(CatalogVersionAdminMixin, admin.ModelAdmin):
     list_display = ("id", get_image_thumbnail_display, "created_at")
     readonly_fields = ("created_at", "updated_at", get_image_thumbnail_display)
 
 
 @admin.register(FrameProfilType)
-class FrameProfilTypeAdmin(admin.ModelAdmin):
+class FrameProfilTypeAdmin(CatalogVersionAdminMixin, admin.ModelAdmin):
     list_display = ("id", "name", get_image_thumbnail_display, "created_at")
     search_fields = ("name",)
     readonly_fields = ("created_at", "updated_at", get_image_thumbnail_display)
 
 
 @admin.register(HandleType)
-class HandleTypeAdmin(admin.ModelAdmin):
+class HandleTypeAdmin(CatalogVersionAdminMixin, admin.ModelAdmin):
     list_display = ("id", get_image_thumbnail_display, "created_at")
     readonly_fields = ("created_at", "updated_at", get_image_thumbnail_display)
 
@@ -89,7 +124,7 @@ class CategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
+class ProductAdmin(CatalogPriceAdminMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "name", 
@@ -102,6 +137,9 @@ class ProductAdmin(admin.ModelAdmin):
     )
     
     list_filter = ("provider", "category", "material", "design")
+    list_select_related = ("provider", "category", "material", "design")
+    # katta katalogda filtrlanmagan COUNT(*) so'rovi yuborilmaydi
+    show_full_result_count = False
     
     search_fields = (
         "name", 
@@ -115,12 +153,12 @@ class ProductAdmin(admin.ModelAdmin):
     @admin.display(description='Image Preview')
     def image_thumbnail(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', obj.image.url)
+            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', variant_url(obj.image))
         return "No Image"
 
 
 @admin.register(CustomProduct)
-class CustomProductAdmin(admin.ModelAdmin):
+class CustomProductAdmin(CatalogPriceAdminMixin, admin.ModelAdmin):
     """Admin for the CustomProduct model."""
     list_display = (
         "id",
@@ -134,6 +172,8 @@ class CustomProductAdmin(admin.ModelAdmin):
     )
     
     list_filter = ("category", "measurement_unit")
+    list_select_related = ("category",)
+    show_full_result_count = False
     
     search_fields = ("name", "provider_name", "category__name")
     
@@ -160,5 +200,5 @@ class CustomProductAdmin(admin.ModelAdmin):
     @admin.display(description='Image Preview')
     def image_thumbnail(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', obj.image.url)
+            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', variant_url(obj.image))
         return "No Image"
\ No newline at end of file
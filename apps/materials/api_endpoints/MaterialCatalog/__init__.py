@@ -0,0 +1 @@
+from .views import MaterialCatalogAPIView
\ No newline at end of file
@@ -0,0 +1,61 @@
+from rest_framework import serializers
+
+
+class ProfilTypeSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class MaterialTypeSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    profils = ProfilTypeSerializer(many=True)
+
+
+class GlassTypeSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    price = serializers.DecimalField(max_digits=9, decimal_places=2)
+    currency = serializers.CharField(source="currency_id")
+
+
+class GlassLayerSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    layer = serializers.CharField()
+    glasses = GlassTypeSerializer(many=True)
+
+
+class DesignVariantSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    image = serializers.CharField(allow_null=True)
+    image_variants = serializers.DictField(child=serializers.CharField())
+
+
+class DesignOptionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    variants = DesignVariantSerializer(many=True)
+
+
+class FrameProfilTypeSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    image = serializers.CharField(allow_null=True)
+    image_variants = serializers.DictField(child=serializers.CharField())
+
+
+class ImageOnlySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    image = serializers.CharField(allow_null=True)
+    image_variants = serializers.DictField(child=serializers.CharField())
+
+
+class MaterialCatalogSerializer(serializers.Serializer):
+    version = serializers.IntegerField(read_only=True)
+    material_types = MaterialTypeSerializer(many=True)
+    glass_layers = GlassLayerSerializer(many=True)
+    design_options = DesignOptionSerializer(many=True)
+    frame_profil_types = FrameProfilTypeSerializer(many=True)
+    sash_profil_types = ImageOnlySerializer(many=True)
+    handle_types = ImageOnlySerializer(many=True)
@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.utils.decorators import method_decorator
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from apps.common.conditional import etag_matches
+from apps.materials.catalog import get_catalog
+from .serializers import MaterialCatalogSerializer
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class MaterialCatalogAPIView(GenericAPIView):
+    """
+    The whole configurator catalog in one response, rendered once per catalog
+    version. Send the ETag back in If-None-Match to get 304.
+    """
+    serializer_class = MaterialCatalogSerializer
+    permission_classes = [IsAuthenticated, ]
+    renderer_classes = [JSONRenderer, ]
+
+    def get(self, request, *args, **kwargs):
+        version, payload = get_catalog(lambda tree: MaterialCatalogSerializer(tree).data)
+        headers = {"ETag": f'"catalog-{version}"', "Cache-Control": "private, no-cache"}
+        if etag_matches(request, headers["ETag"]):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response({"version": version, **payload}, status=status.HTTP_200_OK, headers=headers)
+
+
+
+__all__ = [
+    "MaterialCatalogAPIView"
+]
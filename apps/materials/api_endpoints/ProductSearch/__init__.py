@@ -0,0 +1 @@
+from .views import ProductSearchAPIView
\ No newline at end of file
@@ -0,0 +1,43 @@
+from rest_framework import serializers
+
+from apps.materials.models import Product
+
+
+class ProductSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(required=False, allow_blank=True, max_length=64)
+    provider = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    category = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    material = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    design = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+
+
+class ProductSearchResultSerializer(serializers.ModelSerializer):
+    # nomlar select_related orqali sahifa so'rovining o'zida olinadi
+    provider_name = serializers.CharField(source="provider.name", read_only=True)
+    category_name = serializers.CharField(source="category.name", read_only=True)
+    material_name = serializers.CharField(source="material.name", read_only=True)
+    design_name = serializers.CharField(source="design.name", read_only=True)
+    image_variants = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Product
+        fields = (
+            "id",
+            "name",
+            "price",
+            "image",
+            "image_variants",
+            "provider",
+            "provider_name",
+            "category",
+            "category_name",
+            "material",
+            "material_name",
+            "design",
+            "design_name",
+            "created_at",
+        )
+        read_only_fields = fields
+
+    def get_image_variants(self, obj):
+        return self.context.get("image_variants", {}).get(obj.image.name, {})
@@ -0,0 +1,52 @@
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import AllowAny
+
+from apps.common.images import variant_urls
+from apps.common.pagination import KeysetPagination
+from apps.materials.models import Product
+from apps.materials.search import product_facets, search_products
+from .serializers import ProductSearchQuerySerializer, ProductSearchResultSerializer
+
+
+class ProductSearchAPIView(ListAPIView):
+    """
+    Product catalog search by name and by provider, category, material and design.
+
+    A page is one query, cut with keyset pagination on (created_at, id). The
+    first page (no cursor) also carries the facet counts, one grouped query.
+    """
+    serializer_class = ProductSearchResultSerializer
+    pagination_class = KeysetPagination
+    permission_classes = [AllowAny, ]
+
+    def get_params(self):
+        if not hasattr(self, "_params"):
+            params = ProductSearchQuerySerializer(data=self.request.query_params)
+            params.is_valid(raise_exception=True)
+            self._params = params.validated_data
+        return self._params
+
+    def get_queryset(self):
+        queryset = Product.objects.select_related("provider", "category", "material", "design")
+        return search_products(queryset, self.get_params())
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["image_variants"] = getattr(self, "image_variants", {})
+        return context
+
+    def list(self, request, *args, **kwargs):
+        params = self.get_params()
+        page = self.paginate_queryset(self.get_queryset())
+        self.image_variants = variant_urls(product.image.name for product in page)
+        response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+        if not request.query_params.get(self.paginator.cursor_query_param):
+            response.data["facets"] = product_facets(Product.objects.all(), params)
+        return response
+
+
+
+__all__ = [
+    "ProductSearchAPIView"
+]
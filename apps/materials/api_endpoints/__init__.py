@@ -0,0 +1,2 @@
+from .MaterialCatalog import * # noqa
+from .ProductSearch import * # noqa
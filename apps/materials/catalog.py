@@ -0,0 +1,127 @@
+"""
+Configurator catalog: the whole materials tree in one payload.
+
+The tree is material types with their profile types, glass layers with their
+glass types, design options with their variants, and the frame, sash and
+handle profile types. ``load_catalog_tree`` builds it with one query per
+table and joins the children to their parents in Python. Every image comes
+with the URLs of its resized variants (``apps.common.images``).
+
+The payload is kept per worker, keyed by the catalog version. The version is
+the single ``CatalogVersion`` row. It lives in the Django cache for
+``settings.MATERIALS_CATALOG_VERSION_TTL`` seconds, so with a warm cache the
+catalog is served without any query. The materials admins call
+``invalidate_catalog`` after saving. It bumps the version in the database
+and drops the cached version, and every worker rebuilds the payload once
+it reads the new version. Finished image variants bump it the same way
+(``apps.materials.signals``). The version is also the ``ETag`` of the
+catalog endpoint.
+
+Invalidation is per worker and eventually consistent: the default
+``LocMemCache`` is private to each process, so the drop only reaches the
+worker that handled the save. Other workers keep serving the previous
+payload and ``ETag`` until their cached version expires, at most
+``MATERIALS_CATALOG_VERSION_TTL`` seconds later. A cache shared by all
+workers (Redis, memcached) makes it immediate.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+
+from apps.common.images import variant_urls
+from apps.materials.models import (
+    CatalogVersion, DesignOption, DesignVariant, FrameProfilType, GlassLayer,
+    GlassType, HandleType, MaterialType, ProfilType, SashProfilType,
+)
+
+CATALOG_VERSION_PK = 1
+CATALOG_VERSION_KEY = "materials_catalog_version"
+
+_catalog = (None, None)
+
+
+def _attach_images(rows):
+    # barcha rasmlarning variantlari bitta so'rov bilan olinadi
+    variants = variant_urls(row["image"] for row in rows)
+    for row in rows:
+        name = row["image"]
+        row["image"] = default_storage.url(name) if name else None
+        row["image_variants"] = variants.get(name, {})
+
+
+def _nest(parents, children, parent_field, children_field):
+    grouped = defaultdict(list)
+    for child in children:
+        grouped[child.pop(parent_field)].append(child)
+    for parent in parents:
+        parent[children_field] = grouped.get(parent["id"], [])
+    return parents
+
+
+def load_catalog_tree():
+    """The catalog as nested dicts, one query per table plus one for the image variants"""
+    design_variants = list(DesignVariant.objects.order_by("name", "id").values("id", "option_id", "name", "image"))
+    frame_profil_types = list(FrameProfilType.objects.order_by("name", "id").values("id", "name", "image"))
+    sash_profil_types = list(SashProfilType.objects.order_by("id").values("id", "image"))
+    handle_types = list(HandleType.objects.order_by("id").values("id", "image"))
+    _attach_images(design_variants + frame_profil_types + sash_profil_types + handle_types)
+
+    return {
+        "material_types": _nest(list(MaterialType.objects.order_by("name", "id").values("id", "name")),
+                                ProfilType.objects.order_by("name", "id").values("id", "material_id", "name"),
+                                "material_id", "profils"),
+        "glass_layers": _nest(list(GlassLayer.objects.order_by("layer", "id").values("id", "layer")),
+                              GlassType.objects.order_by("name", "id").values("id", "layer_id", "name",
+                                                                              "price", "currency_id"),
+                              "layer_id", "glasses"),
+        "design_options": _nest(list(DesignOption.objects.order_by("name", "id").values("id", "name")),
+                                design_variants, "option_id", "variants"),
+        "frame_profil_types": frame_profil_types,
+        "sash_profil_types": sash_profil_types,
+        "handle_types": handle_types,
+    }
+
+
+def get_catalog_version():
+    """Catalog version, read from the database once per ``MATERIALS_CATALOG_VERSION_TTL`` in this worker"""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        version = (CatalogVersion.objects.filter(pk=CATALOG_VERSION_PK)
+                   .values_list("version", flat=True).first())
+        if version is None:
+            CatalogVersion.objects.bulk_create([CatalogVersion(pk=CATALOG_VERSION_PK)], ignore_conflicts=True)
+            version = CatalogVersion.objects.values_list("version", flat=True).get(pk=CATALOG_VERSION_PK)
+        cache.set(CATALOG_VERSION_KEY, version, timeout=settings.MATERIALS_CATALOG_VERSION_TTL)
+    return version
+
+
+def get_catalog(build):
+    """
+    Return ``(version, payload)`` of the current catalog.
+
+    ``build(tree)`` renders the payload from ``load_catalog_tree()``; it runs
+    once per worker and catalog version.
+    """
+    global _catalog
+    version = get_catalog_version()
+    catalog = _catalog
+    if catalog[0] != version:
+        # juftlik bitta o'zlashtirish bilan almashtiriladi, parallel so'rovlar eski nusxani o'qiy oladi
+        catalog = _catalog = (version, build(load_catalog_tree()))
+    return catalog
+
+
+def invalidate_catalog():
+    """
+    Bump the catalog version. This worker rebuilds the payload at once, the
+    others when their cached version expires.
+    """
+    updated = CatalogVersion.objects.filter(pk=CATALOG_VERSION_PK).update(version=F("version") + 1)
+    if not updated:
+        CatalogVersion.objects.bulk_create([CatalogVersion(pk=CATALOG_VERSION_PK, version=2)],
+                                           ignore_conflicts=True)
+    transaction.on_commit(lambda: cache.delete(CATALOG_VERSION_KEY))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("materials", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+                (
+                    "version",
+                    models.PositiveBigIntegerField(
+                        default=1, verbose_name="Catalog version"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Catalog Version",
+                "verbose_name_plural": "Catalog Versions",
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:04
+
+from django.db import migrations, models
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # icontains UPPER(name::text) LIKE UPPER(...) ko'rinishida yoziladi, indeks ham shu ifodaga quriladi
+    "CREATE INDEX materials_product_name_trgm_idx ON materials_product "
+    "USING gin ((UPPER(name::text)) gin_trgm_ops)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS materials_product_name_trgm_idx",
+]
+
+
+def run_on_postgres(statements):
+    def run(apps, schema_editor):
+        # boshqa bazalarda nom bo'yicha qidiruv indekssiz ishlaydi
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("company", "0002_company_master"),
+        ("materials", "0002_catalog_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customproduct",
+            index=models.Index(
+                fields=["category", "-created_at", "-id"],
+                name="custom_product_category_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="product_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["provider", "-created_at", "-id"],
+                name="product_provider_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["category", "-created_at", "-id"],
+                name="product_category_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["material", "-created_at", "-id"],
+                name="product_material_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["design", "-created_at", "-id"],
+                name="product_design_created_idx",
+            ),
+        ),
+        migrations.RunPython(run_on_postgres(POSTGRES_FORWARD), run_on_postgres(POSTGRES_BACKWARD)),
+    ]
@@ -183,6 +183,14 @@ class Product(BaseModel):
     class Meta:
         verbose_name = _("Product")
         verbose_name_plural = _("Products")
+        # mahsulot qidiruvi (apps.materials.search) facet filtri + (created_at, id) kursori bo'yicha
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="product_created_idx"),
+            models.Index(fields=["provider", "-created_at", "-id"], name="product_provider_created_idx"),
+            models.Index(fields=["category", "-created_at", "-id"], name="product_category_created_idx"),
+            models.Index(fields=["material", "-created_at", "-id"], name="product_material_created_idx"),
+            models.Index(fields=["design", "-created_at", "-id"], name="product_design_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.provider.name} - {self.material.name} - {self.name}"
@@ -224,7 +232,22 @@ class CustomProduct(BaseModel):
     class Meta:
         verbose_name = _("Custom Product")
         verbose_name_plural = _("Custom Products")
+        indexes = [
+            models.Index(fields=["category", "-created_at", "-id"], name="custom_product_category_idx"),
+        ]
 
     def __str__(self):
         return f"{self.provider_name} - {self.name}"
 
+
+class CatalogVersion(BaseModel):
+    """Single row with the version of the configurator catalog, see ``apps.materials.catalog``"""
+    version = models.PositiveBigIntegerField(default=1,
+                                             verbose_name=_("Catalog version"))
+
+    class Meta:
+        verbose_name = _("Catalog Version")
+        verbose_name_plural = _("Catalog Versions")
+
+    def __str__(self):
+        return str(self.version)
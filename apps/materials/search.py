@@ -0,0 +1,64 @@
+"""
+Product search with facet counts.
+
+``search_products`` filters products by name (``icontains``) and by any
+number of providers, categories, materials and designs. The results are
+paged by ``KeysetPagination`` on ``(created_at, id)``. Every filter column
+has a composite index ending with ``(created_at, id)`` (see ``Product.Meta``),
+so a page is an index range scan whichever facet is selected. On PostgreSQL
+migration ``0003_product_search_indexes`` adds a trigram index on
+``UPPER(name)`` for the name search.
+
+``product_facets`` counts products per provider, category, material and
+design with a single grouped query over the name matches. The query groups
+by all four facets at once. The counts of each facet are then summed in
+Python over the groups that pass the filters of the *other* facets. So
+selecting a category narrows the provider counts, while the other categories
+keep their counts and stay selectable.
+"""
+from collections import defaultdict
+
+from django.db.models import Count
+
+FACETS = ("provider", "category", "material", "design")
+
+
+def search_products(queryset, params):
+    query = params.get("q")
+    if query:
+        queryset = queryset.filter(name__icontains=" ".join(query.split()))
+    for facet in FACETS:
+        if params.get(facet):
+            queryset = queryset.filter(**{f"{facet}_id__in": params[facet]})
+    return queryset
+
+
+def product_facets(queryset, params):
+    """``{facet: [{"id", "name", "count", "selected"}]}``, one query"""
+    query = params.get("q")
+    if query:
+        queryset = queryset.filter(name__icontains=" ".join(query.split()))
+    selected = {facet: set(params.get(facet) or ()) for facet in FACETS}
+
+    groups = (queryset.order_by()
+              .values(*(f"{facet}_id" for facet in FACETS), *(f"{facet}__name" for facet in FACETS))
+              .annotate(count=Count("id")))
+
+    counts = {facet: defaultdict(int) for facet in FACETS}
+    names = {facet: {} for facet in FACETS}
+    for group in groups:
+        for facet in FACETS:
+            # har bir facet boshqa facetlar filtri bilan hisoblanadi, o'zining filtri hisobga olinmaydi
+            if all(not selected[other] or group[f"{other}_id"] in selected[other]
+                   for other in FACETS if other != facet):
+                value = group[f"{facet}_id"]
+                counts[facet][value] += group["count"]
+                names[facet][value] = group[f"{facet}__name"]
+
+    return {
+        facet: sorted(({"id": value, "name": names[facet][value], "count": count,
+                        "selected": value in selected[facet]}
+                       for value, count in counts[facet].items()),
+                      key=lambda item: (-item["count"], item["name"]))
+        for facet in FACETS
+    }
@@ -0,0 +1,10 @@
+from django.dispatch import receiver
+
+from apps.common.images import image_variants_ready
+from apps.materials.catalog import invalidate_catalog
+
+
+# rasm variantlari tayyor bo'lganda katalog ularning URL lari bilan qayta quriladi
+@receiver(image_variants_ready)
+def rebuild_catalog_with_variants(sender, sources, **kwargs):
+    invalidate_catalog()
@@ -1,3 +1,107 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import User
+from apps.common.models import Currency
+from apps.materials import catalog
+from apps.company.models import Provider
+from apps.materials.models import Category, DesignOption, GlassLayer, GlassType, MaterialType, Product, ProfilType
+
+
+class MaterialCatalogTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.all_objects.create(full_name="User", phone_number="+998900000001")
+        cls.material = MaterialType.objects.create(name="PVC")
+        ProfilType.objects.create(material=cls.material, name="P60")
+        GlassType.objects.create(layer=GlassLayer.objects.create(layer="2"), name="Clear", price=Decimal("50"),
+                                 currency=Currency.objects.create(code="UZS", name="Sum", symbol="s"))
+
+    def setUp(self):
+        # katalog worker xotirasida saqlanadi
+        cache.clear()
+        catalog._catalog = (None, None)
+        self.client.force_authenticate(self.user)
+
+    def test_tree_is_nested(self):
+        response = self.client.get("/api/materials/catalog/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(material["name"], [profil["name"] for profil in material["profils"]])
+                          for material in response.data["material_types"]], [("PVC", ["P60"])])
+        self.assertEqual(response.data["glass_layers"][0]["glasses"][0]["name"], "Clear")
+
+    def test_known_etag_gets_304_without_query(self):
+        etag = self.client.get("/api/materials/catalog/")["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/materials/catalog/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_invalidation_changes_etag_after_commit(self):
+        etag = self.client.get("/api/materials/catalog/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProfilType.objects.create(material=self.material, name="P70")
+            catalog.invalidate_catalog()
+            # kommitgacha eski versiya beriladi
+            self.assertEqual(self.client.get("/api/materials/catalog/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        response = self.client.get("/api/materials/catalog/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["material_types"][0]["profils"]), 2)
+
+
+class ProductSearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.acme, cls.globex = Provider.objects.create(name="Acme"), Provider.objects.create(name="Globex")
+        cls.handles, cls.locks = Category.objects.create(name="Handles"), Category.objects.create(name="Locks")
+        material, design = MaterialType.objects.create(name="PVC"), DesignOption.objects.create(name="Color")
+        cls.products = {
+            name: Product.objects.create(name=name, provider=provider, category=category,
+                                         material=material, design=design, price=Decimal("10"))
+            for name, provider, category in [("Acme handle", cls.acme, cls.handles),
+                                             ("Acme lock", cls.acme, cls.locks),
+                                             ("Globex handle", cls.globex, cls.handles)]
+        }
+
+    def search(self, **params):
+        response = self.client.get("/api/materials/products/", params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def counts(self, data, facet):
+        return {item["name"]: (item["count"], item["selected"]) for item in data["facets"][facet]}
+
+    def test_name_search(self):
+        data = self.search(q="  HANDLE ")
+
+        self.assertEqual({row["name"] for row in data["results"]}, {"Acme handle", "Globex handle"})
+        self.assertEqual(self.counts(data, "provider"), {"Acme": (1, False), "Globex": (1, False)})
+
+    def test_facet_keeps_its_other_values(self):
+        data = self.search(category=self.handles.id)
+
+        self.assertEqual({row["name"] for row in data["results"]}, {"Acme handle", "Globex handle"})
+        # tanlangan kategoriya boshqa kategoriyalar sonini kamaytirmaydi
+        self.assertEqual(self.counts(data, "category"), {"Handles": (2, True), "Locks": (1, False)})
+        self.assertEqual(self.counts(data, "provider"), {"Acme": (1, False), "Globex": (1, False)})
+
+    def test_cross_filtered_facets(self):
+        data = self.search(category=self.handles.id, provider=self.acme.id)
+
+        self.assertEqual([row["name"] for row in data["results"]], ["Acme handle"])
+        self.assertEqual(self.counts(data, "provider"), {"Acme": (1, True), "Globex": (1, False)})
+        self.assertEqual(self.counts(data, "category"), {"Handles": (1, True), "Locks": (1, False)})
+        self.assertEqual(self.counts(data, "material"), {"PVC": (1, False)})
+
+    def test_next_page_has_no_facets(self):
+        first = self.search(page_size=2)
+        self.assertIn("facets", first)
+
+        second = self.client.get(first["next"]).data
+        self.assertNotIn("facets", second)
+        self.assertEqual(len(first["results"]) + len(second["results"]), 3)
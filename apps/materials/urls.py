@@ -0,0 +1,13 @@
+from django.urls import path
+
+from apps.materials.api_endpoints import (
+    MaterialCatalogAPIView,
+    ProductSearchAPIView,
+)
+
+app_name = "materials"
+
+urlpatterns = [
+    path("catalog/", MaterialCatalogAPIView.as_view(), name="material-catalog"),
+    path("products/", ProductSearchAPIView.as_view(), name="product-search"),
+]
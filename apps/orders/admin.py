@@ -10,7 +10,14 @@ from apps.orders.models import (NewOrder,
                                 TemplateSection,
                                 WindowOrderSection, 
                                 DoorOrder,
-                                DoorOrderSection)
+                                DoorOrderSection,
+                                PriceBook,
+                                PriceCatalog,
+                                CuttingPlan,
+                                OrderRollup)
+from apps.orders.price_books import catalog_changed
+from apps.orders.search import search_orders
+from apps.orders.template_cache import invalidate_template_layout
 
 
 class OrderDetailInline(admin.TabularInline):
@@ -88,6 +95,7 @@ class NewOrderAdmin(admin.ModelAdmin):
         "total_price", 
         "profit",
         "cost_price",
+        "price_book_version",
         "created_at",
     )
     list_filter = ("order_type", "created_at")
@@ -109,7 +117,8 @@ class NewOrderAdmin(admin.ModelAdmin):
                 "cost_price", 
                 "profit", 
                 "discount_price", 
-                "advance_payment"
+                "advance_payment",
+                "price_book_version",
             ),
         }),
         (_("Timestamps"), {
@@ -118,9 +127,15 @@ class NewOrderAdmin(admin.ModelAdmin):
         })
     )
     
-    readonly_fields = ("created_at", "updated_at", "profit") # Profit is typically calculated
+    readonly_fields = ("created_at", "updated_at", "profit", "price_book_version") # Profit is typically calculated
     inlines = [OrderDetailInline]
 
+    # icontains skanerlash o'rniga trigram/full-text indekslari ishlatiladi (apps.orders.search)
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_orders(queryset, search_term), False
+
 
 @admin.register(OrderDetail)
 class OrderDetailAdmin(admin.ModelAdmin):
@@ -163,7 +178,8 @@ class OrderAdmin(admin.ModelAdmin):
     )
     list_filter = ("status", "created_at")
     search_fields = ("status",)
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("created_at", "updated_at", "closed_at")
+    filter_horizontal = ("employees",)
     
     # inlines = [NewOrderInline]
 
@@ -172,7 +188,9 @@ class OrderAdmin(admin.ModelAdmin):
             'fields': (
                 "status", 
                 "total_orders_number", 
-                "total_price"
+                "total_price",
+                "closed_at",
+                "employees",
             ),
         }),
         (_("Timestamps"), {
@@ -201,6 +219,26 @@ class TemplateAdmin(admin.ModelAdmin):
     search_fields = ('name',)
     inlines = [TemplateSectionInline]
 
+    # Template va uning qismlari saqlangandan keyin compiled layout cache va
+    # narxlar kitoblari (base_price_per_m2 o'zgargan bo'lishi mumkin) yangilanadi
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        invalidate_template_layout(form.instance.pk)
+        catalog_changed()
+
+    def delete_model(self, request, obj):
+        template_id = obj.pk
+        super().delete_model(request, obj)
+        invalidate_template_layout(template_id)
+        catalog_changed()
+
+    def delete_queryset(self, request, queryset):
+        template_ids = list(queryset.values_list("pk", flat=True))
+        super().delete_queryset(request, queryset)
+        for template_id in template_ids:
+            invalidate_template_layout(template_id)
+        catalog_changed()
+
 
 @admin.register(WindowOrder)
 class WindowOrderAdmin(admin.ModelAdmin):
@@ -222,7 +260,7 @@ class WindowOrderAdmin(admin.ModelAdmin):
     )
     
     def display_area(self, obj):
-        return f"{obj.calculate_area_m2():.2f} m²"
+        return f"{obj.area_m2:.2f} m²"
     display_area.short_description = "Area (m²)"
 
 
@@ -232,6 +270,20 @@ class TemplateSectionAdmin(admin.ModelAdmin):
     list_filter = ('template', 'orientation')
     search_fields = ('template__name',)
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        invalidate_template_layout(obj.template_id)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_template_layout(obj.template_id)
+
+    def delete_queryset(self, request, queryset):
+        template_ids = set(queryset.values_list("template_id", flat=True))
+        super().delete_queryset(request, queryset)
+        for template_id in template_ids:
+            invalidate_template_layout(template_id)
+
 
 @admin.register(WindowOrderSection)
 class WindowOrderSectionAdmin(admin.ModelAdmin):
@@ -290,7 +342,7 @@ class DoorOrderAdmin(admin.ModelAdmin):
     )
     
     def display_area(self, obj):
-        return f"{obj.calculate_area_m2():.2f} m²"
+        return f"{obj.area_m2:.2f} m²"
     display_area.short_description = "Area (m²)"
 
 
@@ -326,4 +378,53 @@ class DoorOrderSectionAdmin(admin.ModelAdmin):
         ('Dimensions and Area', {
             'fields': ('width_mm', 'height_mm', 'area_m2')
         }),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(PriceCatalog)
+class PriceCatalogAdmin(admin.ModelAdmin):
+    list_display = ("id", "created_at")
+    readonly_fields = ("payload", "created_at", "updated_at")
+
+    # Katalog o'zgarmas, narxlar o'zgarganda yangi versiya yoziladi
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(PriceBook)
+class PriceBookAdmin(admin.ModelAdmin):
+    list_display = ("id", "company", "version", "catalog", "created_at")
+    list_filter = ("company",)
+    readonly_fields = ("company", "version", "catalog", "payload", "created_at", "updated_at")
+
+    # Narxlar kitobi o'zgarmas, faqat qayta qurish orqali yangi versiya yoziladi
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(CuttingPlan)
+class CuttingPlanAdmin(admin.ModelAdmin):
+    list_display = ("id", "company", "profil_type", "cuts_count", "bars_count", "waste_percentage", "elapsed_ms",
+                    "created_at")
+    list_filter = ("company", "profil_type")
+    readonly_fields = ("created_at", "updated_at")
+
+
+@admin.register(OrderRollup)
+class OrderRollupAdmin(admin.ModelAdmin):
+    list_display = ("day", "company", "dealer", "order_type", "material_type", "orders_count", "total_price", "profit")
+    list_filter = ("day", "dealer", "region", "order_type", "material_type")
+    readonly_fields = [field.name for field in OrderRollup._meta.fields]
+
+    # Yig'indilar buyurtmalardan hisoblanadi (apps.orders.rollups), qo'lda o'zgartirilmaydi
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
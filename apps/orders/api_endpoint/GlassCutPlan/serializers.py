@@ -0,0 +1,27 @@
+from rest_framework import serializers
+
+
+class GlassCutPlanQuerySerializer(serializers.Serializer):
+    sheet_width_mm = serializers.IntegerField(min_value=100, max_value=10_000, required=False)
+    sheet_height_mm = serializers.IntegerField(min_value=100, max_value=10_000, required=False)
+
+
+def serialize_nesting(glass_type_id, result):
+    return {
+        "glass_type": glass_type_id,
+        "sheet_width_mm": result.sheet_width_mm,
+        "sheet_height_mm": result.sheet_height_mm,
+        "sheets_count": len(result.sheets),
+        "panes_count": sum(len(sheet) for sheet in result.sheets),
+        "utilization": result.utilization,
+        "sheets": [
+            [{"x_mm": placement.x_mm,
+              "y_mm": placement.y_mm,
+              "width_mm": placement.width_mm,
+              "height_mm": placement.height_mm,
+              "rotated": placement.rotated,
+              **placement.ref}
+             for placement in sheet]
+            for sheet in result.sheets
+        ],
+    }
@@ -0,0 +1,39 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+
+from apps.orders.nesting import nest_open_orders
+from .serializers import GlassCutPlanQuerySerializer, serialize_nesting
+
+
+class GlassCutPlanAPIView(GenericAPIView):
+    """Glass sheet cut plan for the glazed sections of the company's open orders."""
+    serializer_class = GlassCutPlanQuerySerializer
+    permission_classes = [IsAuthenticated, ]
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        company = request.user.company.first()
+        if company is None:
+            return Response({"glass_types": []}, status=status.HTTP_200_OK)
+
+        try:
+            plans = nest_open_orders(company.id,
+                                     serializer.validated_data.get("sheet_width_mm"),
+                                     serializer.validated_data.get("sheet_height_mm"))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {"glass_types": [serialize_nesting(glass_type_id, result) for glass_type_id, result in plans.items()]},
+            status=status.HTTP_200_OK
+        )
+
+
+
+__all__ = [
+    "GlassCutPlanAPIView"
+]
@@ -20,12 +20,15 @@ class NewOrderSerializer(serializers.ModelSerializer):
             "order_owner",
             "phone_number",
             "location",
-            "additional_info"
+            "additional_info",
+            "price_book_version",
         )
 
         read_only_fields = (
             "company",
+            "order_number",
             "total_price",
             "cost_price",
             "profit",
+            "price_book_version",
         )
\ No newline at end of file
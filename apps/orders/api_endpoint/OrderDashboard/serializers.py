@@ -0,0 +1,33 @@
+from rest_framework import serializers
+
+from apps.orders.rollups import DIMENSIONS
+
+
+class OrderDashboardQuerySerializer(serializers.Serializer):
+    # bo'sh qoldirilsa joriy oy boshidan bugungacha (month-to-date)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    group_by = serializers.ChoiceField(choices=DIMENSIONS, required=False)
+    # faqat staff uchun, boshqa foydalanuvchilar o'z kompaniyasini ko'radi
+    dealer = serializers.IntegerField(min_value=1, required=False)
+    region = serializers.IntegerField(min_value=1, required=False)
+    company = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        if "date_from" in attrs and "date_to" in attrs and attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError({"date_to": "Must not be before date_from."})
+        return attrs
+
+
+class OrderRollupSummarySerializer(serializers.Serializer):
+    orders_count = serializers.IntegerField()
+    total_price = serializers.DecimalField(max_digits=16, decimal_places=2)
+    cost_price = serializers.DecimalField(max_digits=16, decimal_places=2)
+    profit = serializers.DecimalField(max_digits=16, decimal_places=2)
+    closed_count = serializers.IntegerField()
+    closed_total_price = serializers.DecimalField(max_digits=16, decimal_places=2)
+    closed_profit = serializers.DecimalField(max_digits=16, decimal_places=2)
+
+
+def serialize_group(group_by, row):
+    return {group_by: row[group_by], **OrderRollupSummarySerializer(row).data}
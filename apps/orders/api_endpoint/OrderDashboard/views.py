@@ -0,0 +1,51 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+from django.utils import timezone
+
+from apps.orders.models import OrderRollup
+from apps.orders.rollups import summarize
+from .serializers import OrderDashboardQuerySerializer, OrderRollupSummarySerializer, serialize_group
+
+
+class OrderDashboardAPIView(GenericAPIView):
+    """Revenue, cost and profit totals read from the daily order rollups only."""
+    serializer_class = OrderDashboardQuerySerializer
+    permission_classes = [IsAuthenticated, ]
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        date_to = params.get("date_to", timezone.localdate())
+        date_from = params.get("date_from", date_to.replace(day=1))
+        rollups = OrderRollup.objects.filter(day__gte=date_from, day__lte=date_to)
+
+        if request.user.is_staff:
+            for dimension in ("dealer", "region", "company"):
+                if dimension in params:
+                    rollups = rollups.filter(**{f"{dimension}_id": params[dimension]})
+        else:
+            company = request.user.company.first()
+            if company is None:
+                rollups = rollups.none()
+            else:
+                rollups = rollups.filter(company=company)
+
+        group_by = params.get("group_by")
+        totals, groups = summarize(rollups, group_by)
+        return Response({
+            "date_from": date_from,
+            "date_to": date_to,
+            "totals": OrderRollupSummarySerializer(totals).data,
+            "group_by": group_by,
+            "groups": [serialize_group(group_by, row) for row in groups],
+        }, status=status.HTTP_200_OK)
+
+
+
+__all__ = [
+    "OrderDashboardAPIView"
+]
@@ -1,9 +1,9 @@
-from decimal import Decimal
-
 from rest_framework import serializers
 
-from apps.company.models import ProductConfig
 from apps.orders.models import OrderDetail, NewOrder
+from apps.orders.price_books import get_price_book, rebuild_price_book, store_catalog
+from apps.orders.pricing import from_minor, price_order_detail
+from apps.orders.sequences import next_order_number
 from apps.orders.api_endpoint.NewOrder.serializers import NewOrderSerializer
 from apps.orders.api_endpoint.WindowOrder.serializers import WindowOrderSerializer
 
@@ -43,51 +43,36 @@ class OrderDetailCreateSerializer(serializers.ModelSerializer):
         window_order_data = validated_data.pop("window_order")
 
         company = self.context["request"].user.company.first()
+        if company is None:
+            raise serializers.ValidationError("You must create a company before adding orders.")
 
         order = NewOrder.objects.create(
             company=company,
+            order_number=next_order_number(company.id),
             **order_data
             )
         window_order = WindowOrderSerializer().create(window_order_data)
 
-        order_detail = OrderDetail.objects.create(
+        # narx hisoblangandan keyin saqlanadi, o'lchangan chiqindi foizi ham yoziladi
+        order_detail = OrderDetail(
             order=order,
             window_order=window_order,
             **validated_data
         )
-        
-        # calculation with master's profit values
-        config = ProductConfig.objects.filter(
-            company=company, 
-            product_type=order_detail.material_type
-        ).first()
-
-        base_cost = window_order.total_price 
-        profit_amount = Decimal("0.00")
-
-        if config:
-            # Percentage Profit
-            if config.is_in_percentage:
-                profit_amount = base_cost * (config.profit / Decimal("100"))
 
-            # Per Meter Profit
-            elif config.is_in_meter:
-                width_m = Decimal(window_order.width) / Decimal("1000")
-                height_m = Decimal(window_order.height) / Decimal("1000")
-            
-                area_m2 = width_m * height_m
-                profit_amount = area_m2 * config.profit
-
-
-        order.cost_price = base_cost           # window's base price
-        order.profit = profit_amount           # master's profit value (ustaning qancha foyda olishi)
-        order.total_price = base_cost + profit_amount  # overall price (buyurtmani umumiy narxi)
-        order.save()
+        # calculation with master's profit values (ustaning foydasi kompaniya narxlar kitobidan olinadi)
+        price_book = get_price_book(company.id)
+        try:
+            price = price_order_detail(price_book, order_detail)
+        except KeyError:
+            # Shablon yoki shisha turi katalog saqlangandan keyin qo'shilgan
+            price_book = rebuild_price_book(company.id, store_catalog())
+            price = price_order_detail(price_book, order_detail)
+        order_detail.save()
+
+        order.cost_price = from_minor(price.cost)    # window, glass and waste price
+        order.profit = from_minor(price.profit)      # master's profit value (ustaning qancha foyda olishi)
+        order.total_price = from_minor(price.total)  # overall price (buyurtmani umumiy narxi)
+        order.price_book_version = price_book.version
+        order.save(update_fields=["cost_price", "profit", "total_price", "price_book_version", "updated_at"])
         return order_detail
-    
-
-        
-    
-
-
-
@@ -0,0 +1,40 @@
+from rest_framework import serializers
+
+from apps.orders.models import NewOrder, Order
+
+
+class OrderListFilterSerializer(serializers.Serializer):
+    order_type = serializers.ChoiceField(choices=NewOrder.OrderTypeChoices.choices, required=False)
+    status = serializers.ChoiceField(choices=Order.OrderStatusChoices.choices, required=False)
+    created_from = serializers.DateField(required=False)
+    created_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if "created_from" in attrs and "created_to" in attrs and attrs["created_from"] > attrs["created_to"]:
+            raise serializers.ValidationError({"created_to": "Must not be before created_from."})
+        return attrs
+
+
+class OrderListSerializer(serializers.ModelSerializer):
+    # Order.status subquery orqali bitta so'rovda olinadi
+    status = serializers.CharField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = NewOrder
+        fields = (
+            "id",
+            "order_number",
+            "order_type",
+            "status",
+            "quantity",
+            "total_price",
+            "cost_price",
+            "profit",
+            "discount_price",
+            "advance_payment",
+            "order_owner",
+            "phone_number",
+            "location",
+            "created_at",
+        )
+        read_only_fields = fields
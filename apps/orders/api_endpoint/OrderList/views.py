@@ -0,0 +1,61 @@
+from datetime import datetime, time, timedelta
+
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import IsAuthenticated
+
+from apps.common.pagination import KeysetPagination
+from apps.orders.models import NewOrder, Order
+from .serializers import OrderListFilterSerializer, OrderListSerializer
+
+
+def with_latest_status(queryset):
+    """Annotate NewOrder rows with the status of their latest Order record"""
+    orders = Order.objects.filter(order__order=OuterRef("pk")).order_by("-id")
+    return queryset.annotate(status=Subquery(orders.values("status")[:1]))
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class OrderListAPIView(ListAPIView):
+    """
+    Orders of the user's company, newest first.
+
+    Every page is one query: the latest Order status is a subquery and the
+    page is cut with keyset pagination on (created_at, id).
+    """
+    serializer_class = OrderListSerializer
+    pagination_class = KeysetPagination
+    permission_classes = [IsAuthenticated, ]
+
+    def get_queryset(self):
+        company = self.request.user.company.first()
+        if company is None:
+            return NewOrder.objects.none()
+
+        filters = OrderListFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+        params = filters.validated_data
+
+        queryset = with_latest_status(NewOrder.objects.filter(company=company))
+
+        if "order_type" in params:
+            queryset = queryset.filter(order_type=params["order_type"])
+        if "status" in params:
+            queryset = queryset.filter(status=params["status"])
+        # sana oralig'i created_at indeksidan foydalanishi uchun vaqt chegaralariga aylantiriladi
+        if "created_from" in params:
+            queryset = queryset.filter(created_at__gte=day_start(params["created_from"]))
+        if "created_to" in params:
+            queryset = queryset.filter(created_at__lt=day_start(params["created_to"] + timedelta(days=1)))
+        return queryset
+
+
+
+__all__ = [
+    "OrderListAPIView",
+    "with_latest_status",
+]
@@ -0,0 +1,85 @@
+from rest_framework import serializers
+
+from apps.orders.template_cache import get_compiled_templates
+
+MAX_QUOTE_CONFIGURATIONS = 5000
+
+
+def _positive_int(value):
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError
+    value = int(value)
+    if value < 1:
+        raise ValueError
+    return value
+
+
+class OrderQuoteSerializer(serializers.Serializer):
+    """
+    Validates a batch of (template, width_mm, height_mm, sections) configurations.
+
+    Items are checked in a plain loop instead of a nested serializer per item,
+    which keeps validation of thousands of configurations cheap, and all
+    templates of the batch are resolved at once from the template layout
+    cache.
+    """
+    configurations = serializers.ListField(allow_empty=False,
+                                           max_length=MAX_QUOTE_CONFIGURATIONS)
+
+    def validate_configurations(self, value):
+        configurations = []
+        errors = {}
+
+        for index, item in enumerate(value):
+            if not isinstance(item, dict):
+                errors[index] = ["Expected an object."]
+                continue
+            try:
+                config = {
+                    "template": _positive_int(item.get("template")),
+                    "width_mm": _positive_int(item.get("width_mm")),
+                    "height_mm": _positive_int(item.get("height_mm")),
+                }
+                sections = item.get("sections") or []
+                config["sections"] = [
+                    {
+                        "section_order": int(sec["section_order"]),
+                        "width_mm": _positive_int(sec["width_mm"]) if sec.get("width_mm") is not None else None,
+                        "height_mm": _positive_int(sec["height_mm"]) if sec.get("height_mm") is not None else None,
+                    }
+                    for sec in sections
+                ]
+            except (ValueError, TypeError, KeyError):
+                errors[index] = ["template, width_mm and height_mm must be positive integers, "
+                                 "sections must contain section_order and optional positive sizes."]
+                continue
+            configurations.append(config)
+
+        if errors:
+            raise serializers.ValidationError(errors)
+        return configurations
+
+    def validate(self, attrs):
+        configurations = attrs["configurations"]
+        template_ids = {config["template"] for config in configurations}
+
+        templates = get_compiled_templates(template_ids)
+
+        missing = template_ids - templates.keys()
+        if missing:
+            raise serializers.ValidationError(
+                {"configurations": f"Templates not found: {sorted(missing)}"}
+            )
+
+        errors = {}
+        for index, config in enumerate(configurations):
+            sections_by_order = templates[config["template"]].sections_by_order
+            unknown = [sec["section_order"] for sec in config["sections"]
+                       if sec["section_order"] not in sections_by_order]
+            if unknown:
+                errors[index] = [f"Template has no sections with order {unknown}."]
+        if errors:
+            raise serializers.ValidationError({"configurations": errors})
+
+        attrs["templates"] = templates
+        return attrs
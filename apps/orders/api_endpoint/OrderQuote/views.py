@@ -0,0 +1,28 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+
+from apps.orders.layout import quote_configurations
+from .serializers import OrderQuoteSerializer
+
+
+class OrderQuoteAPIView(GenericAPIView):
+    """Prices window/door configurations without creating any orders."""
+    serializer_class = OrderQuoteSerializer
+    permission_classes = [IsAuthenticated, ]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        quotes = quote_configurations(serializer.validated_data["configurations"],
+                                      serializer.validated_data["templates"])
+
+        return Response({"count": len(quotes), "quotes": quotes}, status=status.HTTP_200_OK)
+
+
+
+__all__ = [
+    "OrderQuoteAPIView"
+]
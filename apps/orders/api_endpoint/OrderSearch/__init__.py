@@ -0,0 +1 @@
+from .views import OrderSearchAPIView
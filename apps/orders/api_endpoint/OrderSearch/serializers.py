@@ -0,0 +1,16 @@
+from rest_framework import serializers
+
+from apps.orders.api_endpoint.OrderList.serializers import OrderListSerializer
+
+
+class OrderSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(min_length=2, max_length=64, trim_whitespace=True)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class OrderSearchResultSerializer(OrderListSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(OrderListSerializer.Meta):
+        fields = OrderListSerializer.Meta.fields + ("rank",)
+        read_only_fields = fields
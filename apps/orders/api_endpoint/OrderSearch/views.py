@@ -0,0 +1,35 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+
+from apps.orders.models import NewOrder
+from apps.orders.search import search_orders
+from apps.orders.api_endpoint.OrderList.views import with_latest_status
+from .serializers import OrderSearchQuerySerializer, OrderSearchResultSerializer
+
+
+class OrderSearchAPIView(GenericAPIView):
+    """Ranked search over the company's orders by number, owner, phone and location."""
+    serializer_class = OrderSearchResultSerializer
+    permission_classes = [IsAuthenticated, ]
+
+    def get(self, request, *args, **kwargs):
+        params = OrderSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        company = request.user.company.first()
+        if company is None:
+            return Response({"count": 0, "results": []}, status=status.HTTP_200_OK)
+
+        queryset = with_latest_status(NewOrder.objects.filter(company=company))
+        orders = search_orders(queryset, params.validated_data["q"])[:params.validated_data["limit"]]
+        data = self.get_serializer(orders, many=True).data
+
+        return Response({"count": len(data), "results": data}, status=status.HTTP_200_OK)
+
+
+
+__all__ = [
+    "OrderSearchAPIView"
+]
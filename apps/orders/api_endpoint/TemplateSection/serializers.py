@@ -1,8 +1,43 @@
 from rest_framework import serializers
 
+from apps.orders.template_cache import get_compiled_template
+
 
 class TemplateSectionSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     order = serializers.IntegerField()
     width_mm = serializers.IntegerField()
-    height_mm = serializers.IntegerField()
\ No newline at end of file
+    height_mm = serializers.IntegerField()
+
+
+class TemplateLayoutField(serializers.Field):
+    """
+    Accepts a template id and resolves it to the compiled template layout.
+
+    Unlike ``PrimaryKeyRelatedField`` it reads from the template layout cache,
+    so a warm cache validates the template without a query. On output it
+    returns the template id.
+    """
+    default_error_messages = {
+        "does_not_exist": 'Invalid pk "{pk_value}" - object does not exist.',
+        "incorrect_type": "Incorrect type. Expected pk value, received {data_type}.",
+    }
+
+    def get_attribute(self, instance):
+        return instance.template_id
+
+    def to_representation(self, value):
+        return value
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+        template = get_compiled_template(pk)
+        if template is None:
+            self.fail("does_not_exist", pk_value=data)
+        return template
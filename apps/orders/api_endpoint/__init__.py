@@ -1,3 +1,8 @@
 from .WindowOrder import * # noqa
 from .DoorOrder import * # noqa
-from .OrderDetailCreate import * # noqa
\ No newline at end of file
+from .OrderDetailCreate import * # noqa
+from .OrderQuote import * # noqa
+from .GlassCutPlan import * # noqa
+from .OrderList import * # noqa
+from .OrderSearch import * # noqa
+from .OrderDashboard import * # noqa
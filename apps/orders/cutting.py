@@ -0,0 +1,268 @@
+"""
+One-dimensional cutting stock optimizer for profile bars.
+
+Profiles are cut from stock bars of ``settings.PROFILE_BAR_LENGTH_MM`` and
+every cut loses ``settings.PROFILE_SAW_KERF_MM`` to the saw. A piece
+therefore takes ``length + kerf`` of a bar whose usable length is
+``bar_length + kerf`` (the last piece of a bar needs no cut after it).
+
+Plans are built in two stages:
+
+    1. first-fit decreasing: pieces, longest first, go into the first bar
+       with room. The first fitting bar is found in O(log n) with a max
+       segment tree over the bars' free lengths.
+    2. local improvement, until ``time_budget`` runs out: the emptiest bars
+       are dissolved by moving their pieces into the free space of other
+       bars, a bar is only dropped when all of its pieces found a place.
+
+``gather_open_cuts`` collects the pieces of the window sections of open
+orders, grouped by the order's company and profile type; ``plan_open_orders``
+stores a ``CuttingPlan`` per company and profile type, and the measured waste
+of a company's latest plan is what its price book uses for orders without a
+typed-in waste percentage. Pieces longer than the bar are left out of the plan
+and listed in its ``oversized_cuts``.
+"""
+import time
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.orders.models import CuttingPlan, Order, WindowOrderSection
+from apps.orders.price_books import current_catalog, rebuild_price_book
+
+
+class CuttingResult(NamedTuple):
+    bars: list
+    bar_length_mm: int
+    kerf_mm: int
+    cuts_count: int
+    waste_percentage: float
+    elapsed_ms: int
+
+
+def section_cuts(width_mm, height_mm):
+    """Profile pieces framing one rectangular section"""
+    return (width_mm, width_mm, height_mm, height_mm)
+
+
+def first_fit_decreasing(lengths, capacity):
+    """
+    Pack ``lengths`` into bars of ``capacity``.
+
+    Returns (bars, free) where ``bars[i]`` is the list of lengths cut from bar
+    ``i`` and ``free[i]`` is its unused capacity.
+    """
+    size = 1
+    while size < max(len(lengths), 1):
+        size *= 2
+    # tree[1] ildiz, barglar tree[size:] da - har bir barning bo'sh joyi
+    tree = [capacity] * (2 * size)
+    bars = []
+
+    for length in sorted(lengths, reverse=True):
+        node = 1
+        while node < size:
+            node *= 2
+            if tree[node] < length:
+                node += 1
+        index = node - size
+        if index == len(bars):
+            bars.append([length])
+        else:
+            bars[index].append(length)
+
+        tree[node] -= length
+        node //= 2
+        while node:
+            best = max(tree[2 * node], tree[2 * node + 1])
+            if tree[node] == best:
+                break
+            tree[node] = best
+            node //= 2
+
+    return bars, tree[size:size + len(bars)]
+
+
+def best_fill(pieces, capacity):
+    """Bitmask of the subset of ``pieces`` with the largest sum not above ``capacity``"""
+    # reachable sums as bits of a Python int, one state per prefix of pieces
+    limit = (1 << (capacity + 1)) - 1
+    states = [1]
+    for piece in pieces:
+        states.append((states[-1] | states[-1] << piece) & limit)
+
+    total = states[-1].bit_length() - 1
+    mask = 0
+    for bit in range(len(pieces) - 1, -1, -1):
+        if not states[bit] >> total & 1:
+            mask |= 1 << bit
+            total -= pieces[bit]
+    return mask
+
+
+def _split(pieces, capacity):
+    """Pieces split into (tightest bar that fits, rest)"""
+    mask = best_fill(pieces, capacity)
+    kept = [piece for bit, piece in enumerate(pieces) if mask >> bit & 1]
+    rest = [piece for bit, piece in enumerate(pieces) if not mask >> bit & 1]
+    return kept, rest
+
+
+def improve(bars, free, capacity, deadline, candidates=24):
+    """
+    Local improvement of a packing, in place, until ``deadline`` (a
+    ``time.perf_counter`` value) or until a pass changes nothing.
+
+    For the emptiest bar, pairs of the ``candidates`` other bars with the
+    most free space are tried: when the pieces of all three bars can be
+    repacked into two, the emptiest bar is dropped. Otherwise it is repacked
+    with each fuller bar so that bar is filled as tightly as possible, moving
+    free space into the emptiest bar for the next pass.
+
+    Returns the number of bars removed.
+    """
+    removed = set()
+    changed = True
+    while changed and time.perf_counter() < deadline:
+        changed = False
+        alive = sorted((index for index in range(len(bars)) if index not in removed),
+                       key=free.__getitem__, reverse=True)
+        roomy = [index for index in alive[:candidates + 1] if free[index] > 0]
+
+        for target in roomy:
+            if time.perf_counter() >= deadline:
+                break
+            others = [index for index in roomy if index != target and index not in removed]
+
+            for i, first in enumerate(others):
+                if time.perf_counter() >= deadline:
+                    break
+                for second in others[i + 1:]:
+                    pieces = bars[target] + bars[first] + bars[second]
+                    kept, rest = _split(pieces, capacity)
+                    if sum(rest) <= capacity:
+                        bars[first], bars[second], bars[target] = kept, rest, []
+                        free[first] = capacity - sum(kept)
+                        free[second] = capacity - sum(rest)
+                        removed.add(target)
+                        changed = True
+                        break
+                if target in removed:
+                    break
+            if target in removed:
+                break
+
+            for other in others:
+                # faqat to'laroq barga ko'chiriladi, aks holda almashtirishlar aylanib qolishi mumkin
+                if free[other] > free[target]:
+                    continue
+                kept, rest = _split(bars[other] + bars[target], capacity)
+                if capacity - sum(kept) < free[other]:
+                    bars[other], bars[target] = kept, rest
+                    free[other] = capacity - sum(kept)
+                    free[target] = capacity - sum(rest)
+                    changed = True
+
+    if removed:
+        bars[:] = [bar for index, bar in enumerate(bars) if index not in removed]
+        free[:] = [space for index, space in enumerate(free) if index not in removed]
+    return len(removed)
+
+
+def optimize_cuts(lengths, bar_length_mm=None, kerf_mm=None, time_budget=None):
+    """Cutting plan for piece ``lengths`` (mm), sizes default to the settings"""
+    started = time.perf_counter()
+    bar_length_mm = bar_length_mm or settings.PROFILE_BAR_LENGTH_MM
+    kerf_mm = settings.PROFILE_SAW_KERF_MM if kerf_mm is None else kerf_mm
+    time_budget = settings.CUTTING_TIME_BUDGET if time_budget is None else time_budget
+
+    too_long = [length for length in lengths if length > bar_length_mm]
+    if too_long:
+        raise ValueError(f"{len(too_long)} pieces are longer than the {bar_length_mm} mm bar, "
+                         f"longest is {max(too_long)} mm")
+
+    capacity = bar_length_mm + kerf_mm
+    bars, free = first_fit_decreasing([length + kerf_mm for length in lengths], capacity)
+    improve(bars, free, capacity, started + time_budget)
+
+    bars = [sorted((piece - kerf_mm for piece in bar), reverse=True) for bar in bars]
+    used = sum(lengths)
+    total = len(bars) * bar_length_mm
+    waste_percentage = round((total - used) * 100 / total, 2) if total else 0.0
+
+    return CuttingResult(bars=bars,
+                         bar_length_mm=bar_length_mm,
+                         kerf_mm=kerf_mm,
+                         cuts_count=len(lengths),
+                         waste_percentage=waste_percentage,
+                         elapsed_ms=int((time.perf_counter() - started) * 1000))
+
+
+OPEN_ORDER_STATUSES = (Order.OrderStatusChoices.WAITING, Order.OrderStatusChoices.IN_PROCESS)
+
+
+def gather_open_cuts(company_id=None):
+    """
+    {(company_id, profil_type_id): [length_mm, ...]} of window sections of
+    open orders, one query. A section is cut ``NewOrder.quantity`` times.
+    """
+    rows = WindowOrderSection.objects.filter(order__window_detail__order_related__status__in=OPEN_ORDER_STATUSES,
+                                             width_mm__isnull=False,
+                                             height_mm__isnull=False)
+    if company_id is not None:
+        rows = rows.filter(order__window_detail__order__company_id=company_id)
+    rows = (rows.values_list("order__window_detail__order__company_id",
+                             "order__window_detail__profil_type_id",
+                             "id",
+                             "width_mm",
+                             "height_mm",
+                             "order__window_detail__order__quantity")
+            .distinct())
+
+    cuts = defaultdict(list)
+    for company_id, profil_type_id, _, width_mm, height_mm, quantity in rows:
+        cuts[company_id, profil_type_id].extend(section_cuts(width_mm, height_mm) * quantity)
+    return cuts
+
+
+@transaction.atomic
+def plan_open_orders(bar_length_mm=None, kerf_mm=None, time_budget=None, company_id=None):
+    """
+    Optimize and store a CuttingPlan per company and profile type of the open
+    orders, then rebuild the price books of the planned companies.
+
+    ``time_budget`` is the whole run: what is left of it is split evenly over
+    the profile types still to plan, so time a quick one does not use passes
+    on to the next ones. Pieces longer than the bar do not stop the run, they
+    are stored in the plan's ``oversized_cuts``.
+    """
+    bar_length_mm = bar_length_mm or settings.PROFILE_BAR_LENGTH_MM
+    time_budget = settings.CUTTING_TIME_BUDGET if time_budget is None else time_budget
+    deadline = time.perf_counter() + time_budget
+    groups = list(gather_open_cuts(company_id).items())
+
+    plans = []
+    for index, ((plan_company_id, profil_type_id), lengths) in enumerate(groups):
+        share = max(deadline - time.perf_counter(), 0) / (len(groups) - index)
+        oversized = [length for length in lengths if length > bar_length_mm]
+        result = optimize_cuts([length for length in lengths if length <= bar_length_mm],
+                               bar_length_mm, kerf_mm, share)
+        plans.append(CuttingPlan(company_id=plan_company_id,
+                                 profil_type_id=profil_type_id,
+                                 bar_length_mm=result.bar_length_mm,
+                                 kerf_mm=result.kerf_mm,
+                                 cuts_count=result.cuts_count,
+                                 bars_count=len(result.bars),
+                                 waste_percentage=result.waste_percentage,
+                                 elapsed_ms=result.elapsed_ms,
+                                 bars=result.bars,
+                                 oversized_cuts=oversized))
+    plans = CuttingPlan.objects.bulk_create(plans)
+
+    # o'lchangan chiqindi foizi faqat shu kompaniyaning narxlar kitobiga o'tadi
+    catalog = current_catalog() if plans else None
+    for plan_company_id in sorted({plan.company_id for plan in plans}):
+        rebuild_price_book(plan_company_id, catalog)
+    return plans
@@ -0,0 +1,176 @@
+"""
+Section layout stage shared by window and door orders.
+
+Geometry of every section of an order is computed in memory in one pass from
+the template's compiled layout (see ``apps.orders.template_cache``) and the
+section rows are persisted with a single bulk insert. Creating an order
+through ``create_order_with_sections`` therefore costs a constant number of
+queries, whatever the number of template sections:
+
+    1. INSERT the order row
+    2. INSERT all section rows (one ``bulk_create``)
+    3. SELECT the sections back with their template sections, as the order's
+       prefetched relation
+
+With a warm template cache the layout is planned without querying the
+template, and ``Order.save()`` reuses the template instance held by the
+compiled layout.
+"""
+from decimal import Decimal
+from typing import NamedTuple
+
+from django.db.models import Prefetch, prefetch_related_objects
+from rest_framework import serializers
+
+from apps.orders.pricing import area_price
+from apps.orders.template_cache import CompiledSection
+
+
+MM2_IN_M2 = Decimal(1_000_000)
+
+
+class SectionLayout(NamedTuple):
+    template_section: CompiledSection
+    section_order: int
+    width_mm: int
+    height_mm: int
+
+
+def default_section_size(template_section, order_width_mm, order_height_mm):
+    """Return (width_mm, height_mm) of a compiled section laid out with the template's ratios"""
+    # Vertical sections split the order by width, horizontal ones by height
+    if template_section.is_vertical:
+        width_mm = int(order_width_mm * template_section.width_ratio)
+    else:
+        width_mm = order_width_mm
+    return width_mm, int(order_height_mm * template_section.height_ratio)
+
+
+def section_size(template_section, order_width_mm, order_height_mm, width_mm=None, height_mm=None):
+    """Return (width_mm, height_mm) of a section sent by the client, explicit sizes take precedence"""
+    # Vertikal qismda foydalanuvchi asosan enini yuboradi, bo'yi buyurtmaning umumiy bo'yi bo'ladi.
+    # Gorizontal qismda bo'yini yuboradi, eni buyurtmaning umumiy eni bo'ladi
+    if template_section.is_vertical:
+        default_width = int(order_width_mm * template_section.width_ratio)
+        default_height = order_height_mm
+    else:
+        default_width = order_width_mm
+        default_height = int(order_height_mm * template_section.height_ratio)
+
+    return (
+        width_mm if width_mm is not None else default_width,
+        height_mm if height_mm is not None else default_height,
+    )
+
+
+def plan_sections(template, order_width_mm, order_height_mm, sections_data=None):
+    """
+    Compute the layout of all sections of an order from a compiled template.
+
+    When the client sends ``sections_data`` only those sections are laid out,
+    using the given sizes where present; otherwise every template section is
+    laid out with the template's default ratios.
+    """
+    if not sections_data:
+        return [
+            SectionLayout(tmp_sec, tmp_sec.section_order,
+                          *default_section_size(tmp_sec, order_width_mm, order_height_mm))
+            for tmp_sec in template.sections
+        ]
+
+    layout = []
+    for sec in sections_data:
+        tmp_section = template.sections_by_order.get(sec["section_order"])
+        if tmp_section is None:
+            raise serializers.ValidationError(
+                {"sections": f"Template has no section with order {sec['section_order']}."}
+            )
+        width_mm, height_mm = section_size(tmp_section,
+                                           order_width_mm,
+                                           order_height_mm,
+                                           sec.get("width_mm"),
+                                           sec.get("height_mm"))
+        layout.append(SectionLayout(tmp_section, sec["section_order"], width_mm, height_mm))
+    return layout
+
+
+def layout_area_m2(layout):
+    """Total area in m² of laid out sections, or None when there are none"""
+    if not layout:
+        return None
+    return Decimal(sum(sec.width_mm * sec.height_mm for sec in layout)) / MM2_IN_M2
+
+
+def create_order_with_sections(order_model, section_model, related_name, validated_data, sections_data=None):
+    """
+    Create an order and all of its sections in three queries.
+
+    ``validated_data["template"]`` is the compiled template layout. The
+    sections' total area is stored on the order before it is inserted, so
+    ``Order.save()`` prices it once and reads never recompute it. The
+    created sections are loaded once as the order's prefetched
+    ``related_name`` relation, so serializing and pricing the result does not
+    query them again.
+    """
+    template = validated_data["template"]
+
+    layout = plan_sections(template,
+                           validated_data["width_mm"],
+                           validated_data["height_mm"],
+                           sections_data)
+
+    order = order_model.objects.create(**{**validated_data,
+                                          "template": template.instance,
+                                          "sections_area_m2": layout_area_m2(layout)})
+    section_model.objects.bulk_create(
+        section_model(order=order,
+                      template_section=sec.template_section.instance,
+                      section_order=sec.section_order,
+                      width_mm=sec.width_mm,
+                      height_mm=sec.height_mm)
+        for sec in layout
+    )
+
+    sections = section_model.objects.select_related("template_section").order_by("id")
+    prefetch_related_objects([order], Prefetch(related_name, queryset=sections))
+    return order
+
+
+def quote_configurations(configurations, templates):
+    """
+    Price many order configurations without writing anything.
+
+    ``templates`` maps a template id to its compiled layout, so the whole
+    batch is priced in one in-memory pass. Areas are summed in integer mm² and
+    converted to m² once per configuration, matching how created orders are
+    priced: by the sections' area when the template has sections, by the full
+    size otherwise.
+    """
+    quotes = []
+    for config in configurations:
+        template = templates[config["template"]]
+        width_mm = config["width_mm"]
+        height_mm = config["height_mm"]
+        layout = plan_sections(template, width_mm, height_mm, config.get("sections"))
+
+        if layout:
+            area_mm2 = sum(sec.width_mm * sec.height_mm for sec in layout)
+        else:
+            area_mm2 = width_mm * height_mm
+
+        quotes.append({
+            "template": template.id,
+            "template_type": template.template_type,
+            "width_mm": width_mm,
+            "height_mm": height_mm,
+            "area_m2": Decimal(area_mm2) / MM2_IN_M2,
+            "total_price": area_price(area_mm2, template.base_price_per_m2),
+            "sections": [
+                {"section_order": sec.section_order,
+                 "width_mm": sec.width_mm,
+                 "height_mm": sec.height_mm,
+                 "area_m2": Decimal(sec.width_mm * sec.height_mm) / MM2_IN_M2}
+                for sec in layout
+            ],
+        })
+    return quotes
@@ -0,0 +1,37 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.orders.cutting import optimize_cuts, section_cuts
+
+
+class Command(BaseCommand):
+    help = "Measure the profile cutting optimizer on a synthetic day of window sections."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sections", type=int, default=10_000,
+                            help="Number of sections, each one gives four cuts.")
+        parser.add_argument("--bar-length", type=int, default=6000)
+        parser.add_argument("--kerf", type=int, default=4)
+        parser.add_argument("--time-budget", type=float, default=0.5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        lengths = []
+        for _ in range(options["sections"]):
+            lengths.extend(section_cuts(rng.randint(300, 2000), rng.randint(400, 2400)))
+
+        bar_length, kerf = options["bar_length"], options["kerf"]
+        # ideal holatda kerakli bruslar soni (quyi chegara)
+        lower_bound = -(-sum(length + kerf for length in lengths) // (bar_length + kerf))
+
+        for label, budget in (("first-fit decreasing", 0), ("with local improvement", options["time_budget"])):
+            start = time.perf_counter()
+            result = optimize_cuts(lengths, bar_length, kerf, budget)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{label}: {len(lengths)} cuts, {len(result.bars)} bars (lower bound {lower_bound}), "
+                f"waste {result.waste_percentage}%, {elapsed * 1000:.0f} ms"
+            )
@@ -0,0 +1,30 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.orders.nesting import Pane, nest_panes
+
+
+class Command(BaseCommand):
+    help = "Measure glass sheet nesting time and utilization for growing numbers of panes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[250, 1000, 4000, 16000])
+        parser.add_argument("--sheet-width", type=int, default=3210)
+        parser.add_argument("--sheet-height", type=int, default=2250)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        for size in options["sizes"]:
+            panes = [Pane(rng.randint(250, 1600), rng.randint(300, 2000)) for _ in range(size)]
+
+            start = time.perf_counter()
+            result = nest_panes(panes, options["sheet_width"], options["sheet_height"])
+            elapsed = time.perf_counter() - start
+
+            self.stdout.write(
+                f"{size} panes: {len(result.sheets)} sheets, utilization {result.utilization}%, "
+                f"{elapsed * 1000:.0f} ms ({elapsed * 1_000_000 / size:.0f} us per pane)"
+            )
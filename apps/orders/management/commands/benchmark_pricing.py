@@ -0,0 +1,86 @@
+import random
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+from apps.common.models import Currency
+from apps.company.models import ProductConfig
+from apps.materials.models import CustomProduct, GlassType, Product
+from apps.orders import pricing
+
+
+class Command(BaseCommand):
+    help = "Measure pricing engine throughput (line items/s) on a synthetic in-memory snapshot."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lines", type=int, default=100_000)
+        parser.add_argument("--lines-per-order", type=int, default=8)
+        parser.add_argument("--catalog", type=int, default=200,
+                            help="Number of templates, glass types, products and custom products each.")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        catalog = range(1, options["catalog"] + 1)
+
+        def price():
+            return Decimal(rng.randint(100, 50_000)).scaleb(-2)
+
+        snapshot = pricing.PriceSnapshot(
+            templates=[SimpleNamespace(id=pk, base_price_per_m2=price()) for pk in catalog],
+            glass_types=[GlassType(id=pk, price=price()) for pk in catalog],
+            products=[Product(id=pk, price=price()) for pk in catalog],
+            custom_products=[
+                CustomProduct(id=pk,
+                              measurement_unit=rng.choice(CustomProduct.MeasurementUnitChoices.values),
+                              measurement_value=Decimal(rng.randint(50, 600)).scaleb(-2),
+                              ordinary_price=price(),
+                              colorful_price=price())
+                for pk in catalog
+            ],
+            profit_configs=[
+                ProductConfig(product_type=product_type,
+                              is_in_percentage=product_type != ProductConfig.ProductType.THERMO,
+                              is_in_meter=product_type == ProductConfig.ProductType.THERMO,
+                              profit=Decimal(rng.randint(500, 5000)).scaleb(-2),
+                              currency=Currency(code="UZS", unit=Decimal("1.00")))
+                for product_type in ProductConfig.ProductType.values
+            ],
+        )
+
+        kinds = (pricing.TEMPLATE, pricing.GLASS, pricing.PRODUCT, pricing.CUSTOM, pricing.CUSTOM_COLORFUL)
+        lines = []
+        for _ in range(options["lines"]):
+            kind = rng.choice(kinds)
+            if kind in (pricing.TEMPLATE, pricing.GLASS):
+                quantity = rng.randint(400, 3000) * rng.randint(400, 2500)
+            else:
+                quantity = rng.randint(1, 5000)
+            lines.append(pricing.LineItem(kind, rng.choice(catalog), quantity))
+
+        per_order = options["lines_per_order"]
+        orders = [
+            (rng.choice(ProductConfig.ProductType.values), lines[i:i + per_order],
+             rng.randint(400, 3000) * rng.randint(400, 2500), rng.choice((None, 5.0, 7.5)))
+            for i in range(0, len(lines), per_order)
+        ]
+
+        self.report("price_lines", len(lines), options["repeat"], lambda: snapshot.price_lines(lines))
+        self.report("price_order", len(lines), options["repeat"],
+                    lambda: [snapshot.price_order(*order) for order in orders])
+
+    def report(self, label, count, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        self.stdout.write(
+            f"{label}: {count} line items, best {best * 1000:.1f} ms of {repeat} runs, "
+            f"{count / best:,.0f} line items/s"
+        )
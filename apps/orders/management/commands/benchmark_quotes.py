@@ -0,0 +1,60 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from apps.orders.layout import quote_configurations
+from apps.orders.models import Template, TemplateSection
+from apps.orders.template_cache import compile_template
+
+
+class Command(BaseCommand):
+    help = "Measure quote throughput per 1k configurations on synthetic in-memory templates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--configurations", type=int, default=1000)
+        parser.add_argument("--templates", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        templates = {}
+        for template_id in range(1, options["templates"] + 1):
+            template = Template(id=template_id,
+                                template_type=rng.choice(Template.TemplateType.values),
+                                base_width_mm=1000,
+                                base_height_mm=1000,
+                                base_price_per_m2=Decimal(rng.randint(50, 300)))
+            section_count = rng.randint(1, 6)
+            sections = [
+                TemplateSection(section_order=order,
+                                orientation=rng.choice(TemplateSection.OrientationType.values),
+                                width_ratio=round(1 / section_count, 3),
+                                height_ratio=round(1 / section_count, 3))
+                for order in range(1, section_count + 1)
+            ]
+            templates[template_id] = compile_template(template, sections)
+
+        configurations = [
+            {"template": rng.randint(1, options["templates"]),
+             "width_mm": rng.randint(400, 3000),
+             "height_mm": rng.randint(400, 2500),
+             "sections": []}
+            for _ in range(options["configurations"])
+        ]
+
+        timings = []
+        for _ in range(options["repeat"]):
+            start = time.perf_counter()
+            quote_configurations(configurations, templates)
+            timings.append(time.perf_counter() - start)
+
+        count = len(configurations)
+        best = min(timings)
+        self.stdout.write(
+            f"{count} configurations: best {best * 1000:.1f} ms of {options['repeat']} runs, "
+            f"{best * 1000 / (count / 1000):.2f} ms per 1k, {count / best:,.0f} configurations/s"
+        )
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from apps.orders.cutting import plan_open_orders
+
+
+class Command(BaseCommand):
+    help = "Build profile bar cutting plans for the window sections of open orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bar-length", type=int, default=None, help="Stock bar length in mm.")
+        parser.add_argument("--kerf", type=int, default=None, help="Saw kerf in mm.")
+        parser.add_argument("--time-budget", type=float, default=None,
+                            help="Seconds of local improvement, split over all profile types.")
+        parser.add_argument("--company", type=int, default=None, help="Plan only this company's orders.")
+
+    def handle(self, *args, **options):
+        plans = plan_open_orders(options["bar_length"], options["kerf"], options["time_budget"],
+                                 company_id=options["company"])
+        for plan in plans:
+            self.stdout.write(
+                f"company {plan.company_id}, profil type {plan.profil_type_id}: "
+                f"{plan.cuts_count} cuts on {plan.bars_count} bars of {plan.bar_length_mm} mm, waste {plan.waste_percentage}% ({plan.elapsed_ms} ms)"
+            )
+            if plan.oversized_cuts:
+                self.stdout.write(f"  {len(plan.oversized_cuts)} pieces longer than the bar were skipped, "
+                                  f"longest is {max(plan.oversized_cuts)} mm")
+        if not plans:
+            self.stdout.write("No open orders with sections to cut.")
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("orders", "0007_orderdetail_material_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="template",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1, editable=False, verbose_name="Layout version"
+            ),
+        ),
+    ]
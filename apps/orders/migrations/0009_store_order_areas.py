@@ -0,0 +1,118 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:26
+
+import django.db.models.expressions
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_order_totals(apps, schema_editor):
+    Template = apps.get_model("orders", "Template")
+    base_price = Template.objects.filter(pk=OuterRef("template_id")).values("base_price_per_m2")
+
+    for order_name, section_name in (("WindowOrder", "WindowOrderSection"),
+                                     ("DoorOrder", "DoorOrderSection")):
+        Order = apps.get_model("orders", order_name)
+        Section = apps.get_model("orders", section_name)
+        sections_area = (Section.objects.filter(order=OuterRef("pk"))
+                         .values("order")
+                         .annotate(total=Sum("area_m2"))
+                         .values("total"))
+        Order.objects.update(sections_area_m2=Subquery(sections_area))
+        Order.objects.update(total_price=Coalesce("sections_area_m2", "area_m2") * Subquery(base_price))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("orders", "0008_template_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="doororder",
+            name="area_m2",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    django.db.models.expressions.CombinedExpression(
+                        models.F("width_mm"), "*", models.F("height_mm")
+                    ),
+                    "/",
+                    models.Value(1000000.0),
+                ),
+                output_field=models.DecimalField(decimal_places=4, max_digits=10),
+                verbose_name="Area m²",
+            ),
+        ),
+        migrations.AddField(
+            model_name="doororder",
+            name="sections_area_m2",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=4,
+                max_digits=10,
+                null=True,
+                verbose_name="Sections area m²",
+            ),
+        ),
+        migrations.AddField(
+            model_name="doorordersection",
+            name="area_m2",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    django.db.models.expressions.CombinedExpression(
+                        models.F("width_mm"), "*", models.F("height_mm")
+                    ),
+                    "/",
+                    models.Value(1000000.0),
+                ),
+                output_field=models.DecimalField(decimal_places=4, max_digits=10),
+                verbose_name="Area m²",
+            ),
+        ),
+        migrations.AddField(
+            model_name="windoworder",
+            name="area_m2",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    django.db.models.expressions.CombinedExpression(
+                        models.F("width_mm"), "*", models.F("height_mm")
+                    ),
+                    "/",
+                    models.Value(1000000.0),
+                ),
+                output_field=models.DecimalField(decimal_places=4, max_digits=10),
+                verbose_name="Area m²",
+            ),
+        ),
+        migrations.AddField(
+            model_name="windoworder",
+            name="sections_area_m2",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=4,
+                max_digits=10,
+                null=True,
+                verbose_name="Sections area m²",
+            ),
+        ),
+        migrations.AddField(
+            model_name="windowordersection",
+            name="area_m2",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    django.db.models.expressions.CombinedExpression(
+                        models.F("width_mm"), "*", models.F("height_mm")
+                    ),
+                    "/",
+                    models.Value(1000000.0),
+                ),
+                output_field=models.DecimalField(decimal_places=4, max_digits=10),
+                verbose_name="Area m²",
+            ),
+        ),
+        migrations.RunPython(backfill_order_totals, migrations.RunPython.noop),
+    ]
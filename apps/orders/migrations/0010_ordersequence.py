@@ -0,0 +1,94 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def seed_order_sequences(apps, schema_editor):
+    NewOrder = apps.get_model("orders", "NewOrder")
+    Order = apps.get_model("orders", "Order")
+    OrderSequence = apps.get_model("orders", "OrderSequence")
+
+    sequences = [
+        OrderSequence(company_id=company_id, name="NEW_ORDER", last_value=total)
+        for company_id, total in NewOrder.objects.values("company")
+        .annotate(total=Count("id"))
+        .values_list("company", "total")
+    ]
+    sequences += [
+        OrderSequence(company_id=company_id, name="ORDER", last_value=last)
+        for company_id, last in Order.objects.values("order__order__company")
+        .annotate(last=Max("total_orders_number"))
+        .values_list("order__order__company", "last")
+    ]
+    OrderSequence.objects.bulk_create(sequences)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("company", "0002_company_master"),
+        ("orders", "0009_store_order_areas"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        choices=[
+                            ("NEW_ORDER", "New order number"),
+                            ("ORDER", "Order record number"),
+                        ],
+                        max_length=32,
+                        verbose_name="Sequence name",
+                    ),
+                ),
+                (
+                    "last_value",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Last allocated value"
+                    ),
+                ),
+                (
+                    "company",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="order_sequences",
+                        to="company.company",
+                        verbose_name="Company",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Order Sequence",
+                "verbose_name_plural": "Order Sequences",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("company", "name"),
+                        name="unique_order_sequence_per_company",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(seed_order_sequences, migrations.RunPython.noop),
+    ]
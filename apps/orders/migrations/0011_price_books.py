@@ -0,0 +1,113 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("company", "0002_company_master"),
+        ("orders", "0010_ordersequence"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PriceCatalog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+                ("payload", models.JSONField(verbose_name="Compiled catalog prices")),
+            ],
+            options={
+                "verbose_name": "Price Catalog",
+                "verbose_name_plural": "Price Catalogs",
+            },
+        ),
+        migrations.AddField(
+            model_name="neworder",
+            name="price_book_version",
+            field=models.PositiveIntegerField(
+                blank=True, editable=False, null=True, verbose_name="Price book version"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="ordersequence",
+            name="name",
+            field=models.CharField(
+                choices=[
+                    ("NEW_ORDER", "New order number"),
+                    ("ORDER", "Order record number"),
+                    ("PRICE_BOOK", "Price book version"),
+                ],
+                max_length=32,
+                verbose_name="Sequence name",
+            ),
+        ),
+        migrations.CreateModel(
+            name="PriceBook",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+                ("version", models.PositiveIntegerField(verbose_name="Version")),
+                ("payload", models.JSONField(verbose_name="Compiled prices")),
+                (
+                    "catalog",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="price_books",
+                        to="orders.pricecatalog",
+                        verbose_name="Catalog",
+                    ),
+                ),
+                (
+                    "company",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="price_books",
+                        to="company.company",
+                        verbose_name="Company",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Price Book",
+                "verbose_name_plural": "Price Books",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("company", "version"),
+                        name="unique_price_book_version_per_company",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("company", "0002_company_master"),
+        ("materials", "0001_initial"),
+        ("orders", "0011_price_books"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CuttingPlan",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+                (
+                    "bar_length_mm",
+                    models.PositiveIntegerField(verbose_name="Bar length in mm"),
+                ),
+                (
+                    "kerf_mm",
+                    models.PositiveSmallIntegerField(verbose_name="Saw kerf in mm"),
+                ),
+                (
+                    "cuts_count",
+                    models.PositiveIntegerField(verbose_name="Number of cuts"),
+                ),
+                (
+                    "bars_count",
+                    models.PositiveIntegerField(verbose_name="Number of bars"),
+                ),
+                (
+                    "waste_percentage",
+                    models.FloatField(verbose_name="Waste percentage"),
+                ),
+                (
+                    "elapsed_ms",
+                    models.PositiveIntegerField(verbose_name="Optimization time in ms"),
+                ),
+                ("bars", models.JSONField(verbose_name="Bars")),
+                (
+                    "oversized_cuts",
+                    models.JSONField(
+                        default=list, verbose_name="Pieces longer than the bar"
+                    ),
+                ),
+                (
+                    "company",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cutting_plans",
+                        to="company.company",
+                        verbose_name="Company",
+                    ),
+                ),
+                (
+                    "profil_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cutting_plans",
+                        to="materials.profiltype",
+                        verbose_name="Profil type",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Cutting Plan",
+                "verbose_name_plural": "Cutting Plans",
+                "indexes": [
+                    models.Index(
+                        fields=["company", "profil_type", "-created_at"],
+                        name="cutting_plan_company_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("company", "0002_company_master"),
+        ("orders", "0012_cuttingplan"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="neworder",
+            index=models.Index(
+                fields=["company", "-created_at", "-id"],
+                name="neworder_company_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="neworder",
+            index=models.Index(
+                fields=["company", "order_type", "-created_at", "-id"],
+                name="neworder_company_type_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["order", "status"], name="order_detail_status_idx"
+            ),
+        ),
+    ]
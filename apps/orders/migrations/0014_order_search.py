@@ -0,0 +1,66 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:41
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_COLUMNS = ("order_number", "order_owner", "phone_number", "location")
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE OR REPLACE FUNCTION orders_neworder_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := to_tsvector('simple',
+            coalesce(NEW.order_number, '') || ' ' || coalesce(NEW.order_owner, '') || ' ' ||
+            coalesce(NEW.phone_number, '') || ' ' || coalesce(NEW.location, ''));
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER orders_neworder_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF order_number, order_owner, phone_number, location
+    ON orders_neworder FOR EACH ROW EXECUTE FUNCTION orders_neworder_search_vector()
+    """,
+    # mavjud qatorlar uchun vektor to'ldiriladi (trigger UPDATE da ishlaydi)
+    "UPDATE orders_neworder SET order_number = order_number",
+    "CREATE INDEX orders_neworder_search_vector_idx ON orders_neworder USING gin (search_vector)",
+    # icontains UPPER(col::text) LIKE UPPER(...) ko'rinishida yoziladi, indeks ham shu ifodaga quriladi
+    *(f"CREATE INDEX orders_neworder_{column}_trgm_idx ON orders_neworder "
+      f"USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+      for column in SEARCH_COLUMNS),
+]
+
+POSTGRES_BACKWARD = [
+    *(f"DROP INDEX IF EXISTS orders_neworder_{column}_trgm_idx" for column in SEARCH_COLUMNS),
+    "DROP INDEX IF EXISTS orders_neworder_search_vector_idx",
+    "DROP TRIGGER IF EXISTS orders_neworder_search_vector_trigger ON orders_neworder",
+    "DROP FUNCTION IF EXISTS orders_neworder_search_vector()",
+]
+
+
+def run_on_postgres(statements):
+    def run(apps, schema_editor):
+        # SQLite va boshqa bazalarda qidiruv SimpleOrderSearch orqali ishlaydi
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("orders", "0013_order_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="neworder",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True, verbose_name="Search vector"
+            ),
+        ),
+        migrations.RunPython(run_on_postgres(POSTGRES_FORWARD), run_on_postgres(POSTGRES_BACKWARD)),
+    ]
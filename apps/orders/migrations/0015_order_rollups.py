@@ -0,0 +1,172 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0001_initial"),
+        ("company", "0002_company_master"),
+        ("orders", "0014_order_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+                ("day", models.DateField(verbose_name="Day")),
+                (
+                    "order_type",
+                    models.CharField(
+                        choices=[
+                            ("WINDOW", "Window"),
+                            ("DOOR", "Door"),
+                            ("FORTOCHKA", "Fortochka"),
+                        ],
+                        max_length=32,
+                        verbose_name="Order type",
+                    ),
+                ),
+                (
+                    "material_type",
+                    models.CharField(
+                        choices=[
+                            ("ALUMIN", "Alumin"),
+                            ("PLAST", "Plast"),
+                            ("THERMO", "Thermo"),
+                        ],
+                        max_length=32,
+                        verbose_name="Material type",
+                    ),
+                ),
+                (
+                    "orders_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Number of orders"
+                    ),
+                ),
+                (
+                    "total_price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Revenue",
+                    ),
+                ),
+                (
+                    "cost_price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Cost price",
+                    ),
+                ),
+                (
+                    "profit",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Profit",
+                    ),
+                ),
+                (
+                    "closed_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Number of closed orders"
+                    ),
+                ),
+                (
+                    "closed_total_price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Closed orders revenue",
+                    ),
+                ),
+                (
+                    "closed_profit",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Closed orders profit",
+                    ),
+                ),
+                (
+                    "company",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="order_rollups",
+                        to="company.company",
+                        verbose_name="Company",
+                    ),
+                ),
+                (
+                    "dealer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="order_rollups",
+                        to="company.dealer",
+                        verbose_name="Dealer",
+                    ),
+                ),
+                (
+                    "region",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="order_rollups",
+                        to="common.region",
+                        verbose_name="Region",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Order Rollup",
+                "verbose_name_plural": "Order Rollups",
+                "indexes": [
+                    models.Index(
+                        fields=["dealer", "day"], name="order_rollup_dealer_day_idx"
+                    ),
+                    models.Index(
+                        fields=["region", "day"], name="order_rollup_region_day_idx"
+                    ),
+                    models.Index(fields=["day"], name="order_rollup_day_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "company",
+                            "day",
+                            "dealer",
+                            "region",
+                            "order_type",
+                            "material_type",
+                        ),
+                        name="unique_order_rollup_key",
+                    )
+                ],
+            },
+        ),
+    ]
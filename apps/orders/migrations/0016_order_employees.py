@@ -0,0 +1,44 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:49
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_closed_at(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    # yopilish vaqti saqlanmagan, eng yaqin taxmin oxirgi o'zgarish vaqti
+    Order.objects.filter(status="CLOSED").update(closed_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0003_employee_payment_status"),
+        ("orders", "0015_order_rollups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="closed_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="Closed at"
+            ),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="employees",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="orders",
+                to="accounts.employee",
+                verbose_name="Assigned employees",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["status", "closed_at"], name="order_status_closed_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_closed_at, migrations.RunPython.noop),
+    ]
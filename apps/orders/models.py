@@ -1,10 +1,18 @@
 from decimal import Decimal
 
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import RegexValidator
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.common.models import BaseModel
+from apps.orders.pricing import MM2_IN_M2, area_price
+
+
+def area_m2_expression():
+    """Area in m² of a width_mm x height_mm row, computed by the database"""
+    return models.F("width_mm") * models.F("height_mm") / models.Value(1_000_000.0)
 
 
 # Umumiy deraza/eshik/fortochka shablonlari uchun model
@@ -31,6 +39,10 @@ class Template(BaseModel):
                                             decimal_places=2,
                                             verbose_name=_("Base price"),
                                             help_text=_("Window/Door/Fortochka's base price per m2."))
+    # shablon yoki uning qismlari o'zgarganda oshiriladi (compiled layout cache uchun)
+    version = models.PositiveIntegerField(default=1,
+                                          editable=False,
+                                          verbose_name=_("Layout version"))
     
     def __str__(self):
         return self.name if self.name else self.id
@@ -103,6 +115,16 @@ class WindowOrder(BaseModel):
                                  verbose_name=_("Template"))
     width_mm = models.PositiveIntegerField(verbose_name=_("Order's width size."))
     height_mm = models.PositiveIntegerField(verbose_name=_("Order's height size."))
+    area_m2 = models.GeneratedField(expression=area_m2_expression(),
+                                    output_field=models.DecimalField(max_digits=10, decimal_places=4),
+                                    db_persist=True,
+                                    verbose_name=_("Area m²"))
+    # ichki qismlar yuzalarining yig'indisi, buyurtma yaratilganda bir marta saqlanadi
+    sections_area_m2 = models.DecimalField(max_digits=10,
+                                           decimal_places=4,
+                                           null=True,
+                                           blank=True,
+                                           verbose_name=_("Sections area m²"))
     total_price = models.DecimalField(max_digits=12, 
                                       decimal_places=2,
                                       blank=True,
@@ -118,8 +140,12 @@ class WindowOrder(BaseModel):
         return width_m * height_m
     
     def calculate_price(self):
-        area = self.calculate_area_m2()
-        return area * self.template.base_price_per_m2
+        # Ichki qismlari bo'lsa narx qismlar yuzasi bo'yicha, aks holda umumiy yuza bo'yicha
+        if self.sections_area_m2 is not None:
+            area_mm2 = int(self.sections_area_m2 * MM2_IN_M2)
+        else:
+            area_mm2 = self.width_mm * self.height_mm
+        return area_price(area_mm2, self.template.base_price_per_m2)
     
     def save(self, *args, **kwargs):
         self.total_price = self.calculate_price()
@@ -148,9 +174,10 @@ class WindowOrderSection(BaseModel):
                                             blank=True,
                                             verbose_name=_("Section height in mm"))
     # O'sha qismni yuzasi uchun
-    area_m2 = models.DecimalField(max_digits=10,
-                                  decimal_places=4,
-                                  verbose_name=_("Area m²"))
+    area_m2 = models.GeneratedField(expression=area_m2_expression(),
+                                    output_field=models.DecimalField(max_digits=10, decimal_places=4),
+                                    db_persist=True,
+                                    verbose_name=_("Area m²"))
 
     class Meta:
         verbose_name = _("Window order section")
@@ -159,12 +186,6 @@ class WindowOrderSection(BaseModel):
     def __str__(self):
         return f"Section {self.section_order} of Order {self.order_id}"
 
-    @property
-    def area_m2(self):
-        width_m = Decimal(self.width_mm) / Decimal(1000)
-        height_m = Decimal(self.height_mm) / Decimal(1000)
-        return width_m * height_m
-
 
 # Door models
 class DoorOrder(BaseModel):
@@ -173,6 +194,16 @@ class DoorOrder(BaseModel):
                                  verbose_name=_("Template"))
     width_mm = models.PositiveIntegerField(verbose_name=_("Order's width size."))
     height_mm = models.PositiveIntegerField(verbose_name=_("Order's height size."))
+    area_m2 = models.GeneratedField(expression=area_m2_expression(),
+                                    output_field=models.DecimalField(max_digits=10, decimal_places=4),
+                                    db_persist=True,
+                                    verbose_name=_("Area m²"))
+    # ichki qismlar yuzalarining yig'indisi, buyurtma yaratilganda bir marta saqlanadi
+    sections_area_m2 = models.DecimalField(max_digits=10,
+                                           decimal_places=4,
+                                           null=True,
+                                           blank=True,
+                                           verbose_name=_("Sections area m²"))
     total_price = models.DecimalField(max_digits=12, 
                                       decimal_places=2,
                                       blank=True,
@@ -188,8 +219,12 @@ class DoorOrder(BaseModel):
         return width_m * height_m
     
     def calculate_price(self):
-        area = self.calculate_area_m2()
-        return area * self.template.base_price_per_m2
+        # Ichki qismlari bo'lsa narx qismlar yuzasi bo'yicha, aks holda umumiy yuza bo'yicha
+        if self.sections_area_m2 is not None:
+            area_mm2 = int(self.sections_area_m2 * MM2_IN_M2)
+        else:
+            area_mm2 = self.width_mm * self.height_mm
+        return area_price(area_mm2, self.template.base_price_per_m2)
     
     def save(self, *args, **kwargs):
         self.total_price = self.calculate_price()
@@ -216,9 +251,10 @@ class DoorOrderSection(BaseModel):
                                             blank=True,
                                             verbose_name=_("Section height in mm"))
     # O'sha qismni yuzasi uchun
-    area_m2 = models.DecimalField(max_digits=10,
-                                  decimal_places=4,
-                                  verbose_name=_("Area m²"))
+    area_m2 = models.GeneratedField(expression=area_m2_expression(),
+                                    output_field=models.DecimalField(max_digits=10, decimal_places=4),
+                                    db_persist=True,
+                                    verbose_name=_("Area m²"))
 
     class Meta:
         verbose_name = _("Door order section")
@@ -227,12 +263,6 @@ class DoorOrderSection(BaseModel):
     def __str__(self):
         return f"Section {self.section_order} of Order {self.order_id}"
 
-    @property
-    def area_m2(self):
-        width_m = Decimal(self.width_mm) / Decimal(1000)
-        height_m = Decimal(self.height_mm) / Decimal(1000)
-        return width_m * height_m
-
 
 class NewOrder(BaseModel):
     class OrderTypeChoices(models.TextChoices):
@@ -290,10 +320,24 @@ class NewOrder(BaseModel):
         verbose_name=_("Phone number"))
     location = models.TextField(verbose_name=_("Location"))
     additional_info = models.TextField(verbose_name=_("Additional info"))
+    # PostgreSQL'da trigger orqali yangilanadi (apps.orders.search)
+    search_vector = SearchVectorField(null=True,
+                                      editable=False,
+                                      verbose_name=_("Search vector"))
+    # buyurtma narxi hisoblangan narxlar kitobining (PriceBook) versiyasi
+    price_book_version = models.PositiveIntegerField(null=True,
+                                                     blank=True,
+                                                     editable=False,
+                                                     verbose_name=_("Price book version"))
 
     class Meta:
         verbose_name = _("New Order")
         verbose_name_plural = _("New Orders")
+        # kompaniya buyurtmalari ro'yxati (created_at, id) bo'yicha keyset pagination qiladi
+        indexes = [
+            models.Index(fields=["company", "-created_at", "-id"], name="neworder_company_created_idx"),
+            models.Index(fields=["company", "order_type", "-created_at", "-id"], name="neworder_company_type_idx"),
+        ]
 
     def __str__(self):
         return f"{self.order_type} - {self.order_number}"
@@ -399,4 +443,200 @@ class Order(BaseModel):
     status = models.CharField(max_length=32,
                               choices=OrderStatusChoices.choices,
                               default=OrderStatusChoices.WAITING,
-                              verbose_name=_("Order status"))
\ No newline at end of file
+                              verbose_name=_("Order status"))
+    # buyurtma yopilgan vaqt, xodimlar ish haqi shu sana bo'yicha hisoblanadi
+    closed_at = models.DateTimeField(null=True,
+                                     blank=True,
+                                     editable=False,
+                                     verbose_name=_("Closed at"))
+    employees = models.ManyToManyField("accounts.Employee",
+                                       blank=True,
+                                       related_name="orders",
+                                       verbose_name=_("Assigned employees"))
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["order", "status"], name="order_detail_status_idx"),
+            models.Index(fields=["status", "closed_at"], name="order_status_closed_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.status == self.OrderStatusChoices.CLOSED:
+            self.closed_at = self.closed_at or timezone.now()
+        else:
+            self.closed_at = None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "status" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "closed_at"}
+        super().save(*args, **kwargs)
+
+
+# Har bir kompaniya uchun buyurtma raqamlarini ketma-ket ajratib beruvchi hisoblagich
+class OrderSequence(BaseModel):
+    class SequenceName(models.TextChoices):
+        NEW_ORDER = "NEW_ORDER", _("New order number")
+        ORDER = "ORDER", _("Order record number")
+        PRICE_BOOK = "PRICE_BOOK", _("Price book version")
+
+    company = models.ForeignKey("company.Company",
+                                on_delete=models.CASCADE,
+                                related_name="order_sequences",
+                                verbose_name=_("Company"))
+    name = models.CharField(max_length=32,
+                            choices=SequenceName.choices,
+                            verbose_name=_("Sequence name"))
+    last_value = models.PositiveBigIntegerField(default=0,
+                                                verbose_name=_("Last allocated value"))
+
+    class Meta:
+        verbose_name = _("Order Sequence")
+        verbose_name_plural = _("Order Sequences")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "name"],
+                name="unique_order_sequence_per_company"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.company_id} - {self.name}: {self.last_value}"
+
+
+# Shablon va material narxlarining o'zgarmas nusxasi, barcha kompaniyalar kitoblari uchun bitta.
+# Versiyasi - id, katalog o'zgarganda yangi qator yoziladi.
+class PriceCatalog(BaseModel):
+    payload = models.JSONField(verbose_name=_("Compiled catalog prices"))
+
+    class Meta:
+        verbose_name = _("Price Catalog")
+        verbose_name_plural = _("Price Catalogs")
+
+    def __str__(self):
+        return f"v{self.id}"
+
+
+# Kompaniyaning narxlar kitobi: umumiy katalog versiyasi, foyda qoidalari va chiqindi foizlarining
+# o'zgarmas nusxasi. Har safar qayta qurilganda yangi versiya bilan yoziladi.
+class PriceBook(BaseModel):
+    company = models.ForeignKey("company.Company",
+                                on_delete=models.CASCADE,
+                                related_name="price_books",
+                                verbose_name=_("Company"))
+    version = models.PositiveIntegerField(verbose_name=_("Version"))
+    catalog = models.ForeignKey(PriceCatalog,
+                                on_delete=models.PROTECT,
+                                related_name="price_books",
+                                verbose_name=_("Catalog"))
+    payload = models.JSONField(verbose_name=_("Compiled prices"))
+
+    class Meta:
+        verbose_name = _("Price Book")
+        verbose_name_plural = _("Price Books")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "version"],
+                name="unique_price_book_version_per_company"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.company_id} - v{self.version}"
+
+
+# Ochiq buyurtmalar profillarini standart uzunlikdagi bruslardan kesish rejasi, har bir kompaniya uchun alohida
+class CuttingPlan(BaseModel):
+    company = models.ForeignKey("company.Company",
+                                on_delete=models.CASCADE,
+                                related_name="cutting_plans",
+                                verbose_name=_("Company"))
+    profil_type = models.ForeignKey("materials.ProfilType",
+                                    on_delete=models.CASCADE,
+                                    related_name="cutting_plans",
+                                    verbose_name=_("Profil type"))
+    bar_length_mm = models.PositiveIntegerField(verbose_name=_("Bar length in mm"))
+    kerf_mm = models.PositiveSmallIntegerField(verbose_name=_("Saw kerf in mm"))
+    cuts_count = models.PositiveIntegerField(verbose_name=_("Number of cuts"))
+    bars_count = models.PositiveIntegerField(verbose_name=_("Number of bars"))
+    # haqiqiy chiqindi foizi, narxlar kitobiga shu qiymat beriladi
+    waste_percentage = models.FloatField(verbose_name=_("Waste percentage"))
+    elapsed_ms = models.PositiveIntegerField(verbose_name=_("Optimization time in ms"))
+    # har bir brusdan kesiladigan qismlar uzunliklari (mm)
+    bars = models.JSONField(verbose_name=_("Bars"))
+    # brusdan uzun qismlar rejaga kirmaydi, ular alohida kesilishi kerak
+    oversized_cuts = models.JSONField(default=list, verbose_name=_("Pieces longer than the bar"))
+
+    class Meta:
+        verbose_name = _("Cutting Plan")
+        verbose_name_plural = _("Cutting Plans")
+        indexes = [
+            models.Index(fields=["company", "profil_type", "-created_at"], name="cutting_plan_company_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.company_id} - {self.profil_type_id}: {self.bars_count} bars, {self.waste_percentage}%"
+
+
+# Kunlik tushum va foyda yig'indilari: hisobotlar NewOrder jadvalini skanerlamasdan shu jadvaldan o'qiladi
+class OrderRollup(BaseModel):
+    day = models.DateField(verbose_name=_("Day"))
+    company = models.ForeignKey("company.Company",
+                                on_delete=models.CASCADE,
+                                related_name="order_rollups",
+                                verbose_name=_("Company"))
+    dealer = models.ForeignKey("company.Dealer",
+                               on_delete=models.DO_NOTHING,
+                               related_name="order_rollups",
+                               verbose_name=_("Dealer"))
+    region = models.ForeignKey("common.Region",
+                               on_delete=models.DO_NOTHING,
+                               related_name="order_rollups",
+                               verbose_name=_("Region"))
+    order_type = models.CharField(max_length=32,
+                                  choices=NewOrder.OrderTypeChoices.choices,
+                                  verbose_name=_("Order type"))
+    material_type = models.CharField(max_length=32,
+                                     choices=OrderDetail.MaterialTypeChoices.choices,
+                                     verbose_name=_("Material type"))
+    orders_count = models.PositiveIntegerField(default=0,
+                                               verbose_name=_("Number of orders"))
+    total_price = models.DecimalField(max_digits=14,
+                                      decimal_places=2,
+                                      default=0,
+                                      verbose_name=_("Revenue"))
+    cost_price = models.DecimalField(max_digits=14,
+                                     decimal_places=2,
+                                     default=0,
+                                     verbose_name=_("Cost price"))
+    profit = models.DecimalField(max_digits=14,
+                                 decimal_places=2,
+                                 default=0,
+                                 verbose_name=_("Profit"))
+    # yopilgan (CLOSED) buyurtmalar, status o'zgarganda yangilanadi
+    closed_count = models.PositiveIntegerField(default=0,
+                                               verbose_name=_("Number of closed orders"))
+    closed_total_price = models.DecimalField(max_digits=14,
+                                             decimal_places=2,
+                                             default=0,
+                                             verbose_name=_("Closed orders revenue"))
+    closed_profit = models.DecimalField(max_digits=14,
+                                        decimal_places=2,
+                                        default=0,
+                                        verbose_name=_("Closed orders profit"))
+
+    class Meta:
+        verbose_name = _("Order Rollup")
+        verbose_name_plural = _("Order Rollups")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "day", "dealer", "region", "order_type", "material_type"],
+                name="unique_order_rollup_key"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["dealer", "day"], name="order_rollup_dealer_day_idx"),
+            models.Index(fields=["region", "day"], name="order_rollup_region_day_idx"),
+            models.Index(fields=["day"], name="order_rollup_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} - {self.company_id} - {self.order_type}/{self.material_type}"
@@ -0,0 +1,181 @@
+"""
+Two-dimensional glass sheet nesting for the glass cutter.
+
+Glass panes are packed onto standard sheets of ``settings.GLASS_SHEET_WIDTH_MM``
+x ``settings.GLASS_SHEET_HEIGHT_MM`` with guillotine cuts only (every cut runs
+from edge to edge of the piece being cut), which is how glass is scored and
+broken. Panes are placed largest first, may be turned by 90 degrees, and go
+into the free rectangle with the best short side fit; the rest of that
+rectangle is split along the shorter leftover axis.
+
+Free rectangles of all open sheets are kept in a grid index keyed by their
+width and height rounded down to ``GRID_MM``. Every width row keeps an int
+bitmask of its non-empty height cells, so a lookup visits only cells that
+can hold the pane instead of every free rectangle.
+
+``gather_open_panes`` collects the glazed window sections of a company's open
+orders grouped by glass type and ``nest_open_orders`` returns a cut plan with
+utilization per glass type.
+"""
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.conf import settings
+
+from apps.orders.cutting import OPEN_ORDER_STATUSES
+from apps.orders.models import WindowOrderSection
+
+GRID_MM = 100
+
+
+class Pane(NamedTuple):
+    width_mm: int
+    height_mm: int
+    ref: object = None
+
+
+class Placement(NamedTuple):
+    sheet: int
+    x_mm: int
+    y_mm: int
+    width_mm: int
+    height_mm: int
+    rotated: bool
+    ref: object
+
+
+class NestingResult(NamedTuple):
+    sheet_width_mm: int
+    sheet_height_mm: int
+    sheets: list
+    utilization: float
+
+
+class FreeRectIndex:
+    """Free rectangles of all sheets, found by minimum width and height"""
+    __slots__ = ("rows", "masks")
+
+    def __init__(self):
+        # rows[width cell][height cell] -> set of (x, y, w, h, sheet)
+        self.rows = defaultdict(lambda: defaultdict(set))
+        self.masks = defaultdict(int)
+
+    def add(self, rect):
+        w_cell, h_cell = rect[2] // GRID_MM, rect[3] // GRID_MM
+        self.rows[w_cell][h_cell].add(rect)
+        self.masks[w_cell] |= 1 << h_cell
+
+    def remove(self, rect):
+        w_cell, h_cell = rect[2] // GRID_MM, rect[3] // GRID_MM
+        cell = self.rows[w_cell][h_cell]
+        cell.discard(rect)
+        if not cell:
+            self.masks[w_cell] &= ~(1 << h_cell)
+
+    def best_fit(self, width, height):
+        """(score, rect) with the smallest short side leftover, or None"""
+        best = None
+        min_h_cell = height // GRID_MM
+        for w_cell, mask in self.masks.items():
+            if w_cell < width // GRID_MM:
+                continue
+            mask >>= min_h_cell
+            h_cell = min_h_cell
+            while mask:
+                low = mask & -mask
+                h_cell += low.bit_length() - 1
+                mask >>= low.bit_length() - 1
+                found_in_row = False
+                for rect in self.rows[w_cell][h_cell]:
+                    if rect[2] >= width and rect[3] >= height:
+                        found_in_row = True
+                        score = min(rect[2] - width, rect[3] - height)
+                        if best is None or score < best[0]:
+                            best = (score, rect)
+                if found_in_row:
+                    # qatordagi eng past mos katak bo'yi bo'yicha eng kam chiqindi beradi
+                    break
+                mask >>= 1
+                h_cell += 1
+        return best
+
+
+def nest_panes(panes, sheet_width_mm=None, sheet_height_mm=None):
+    """Pack ``panes`` onto sheets, returns a NestingResult"""
+    sheet_width_mm = sheet_width_mm or settings.GLASS_SHEET_WIDTH_MM
+    sheet_height_mm = sheet_height_mm or settings.GLASS_SHEET_HEIGHT_MM
+
+    too_big = [pane for pane in panes
+               if not (pane.width_mm <= sheet_width_mm and pane.height_mm <= sheet_height_mm)
+               and not (pane.height_mm <= sheet_width_mm and pane.width_mm <= sheet_height_mm)]
+    if too_big:
+        raise ValueError(f"{len(too_big)} panes do not fit on a {sheet_width_mm}x{sheet_height_mm} mm sheet")
+
+    index = FreeRectIndex()
+    sheets = []
+
+    for pane in sorted(panes, key=lambda p: (p.width_mm * p.height_mm, max(p.width_mm, p.height_mm)), reverse=True):
+        candidates = [(index.best_fit(pane.width_mm, pane.height_mm), False)]
+        if pane.width_mm != pane.height_mm:
+            candidates.append((index.best_fit(pane.height_mm, pane.width_mm), True))
+        candidates = [(found, rotated) for found, rotated in candidates if found is not None]
+
+        if candidates:
+            (_, rect), rotated = min(candidates, key=lambda candidate: candidate[0][0])
+            index.remove(rect)
+        else:
+            sheets.append([])
+            rect = (0, 0, sheet_width_mm, sheet_height_mm, len(sheets) - 1)
+            rotated = not (pane.width_mm <= sheet_width_mm and pane.height_mm <= sheet_height_mm)
+
+        width, height = (pane.height_mm, pane.width_mm) if rotated else (pane.width_mm, pane.height_mm)
+        x, y, free_w, free_h, sheet = rect
+        sheets[sheet].append(Placement(sheet, x, y, width, height, rotated, pane.ref))
+
+        # guillotine kesish: qolgan joy qisqa tomon bo'yicha ikkiga bo'linadi
+        if free_w - width < free_h - height:
+            right = (x + width, y, free_w - width, height, sheet)
+            top = (x, y + height, free_w, free_h - height, sheet)
+        else:
+            right = (x + width, y, free_w - width, free_h, sheet)
+            top = (x, y + height, width, free_h - height, sheet)
+        for leftover in (right, top):
+            if leftover[2] > 0 and leftover[3] > 0:
+                index.add(leftover)
+
+    used = sum(pane.width_mm * pane.height_mm for pane in panes)
+    total = len(sheets) * sheet_width_mm * sheet_height_mm
+    return NestingResult(sheet_width_mm=sheet_width_mm,
+                         sheet_height_mm=sheet_height_mm,
+                         sheets=sheets,
+                         utilization=round(used * 100 / total, 2) if total else 0.0)
+
+
+def gather_open_panes(company_id):
+    """
+    {glass_type_id: [Pane, ...]} of glazed window sections of a company's open
+    orders, one query. A section gives ``NewOrder.quantity`` panes.
+    """
+    rows = (WindowOrderSection.objects
+            .filter(order__window_detail__order__company_id=company_id,
+                    order__window_detail__order_related__status__in=OPEN_ORDER_STATUSES,
+                    width_mm__isnull=False,
+                    height_mm__isnull=False)
+            .exclude(template_section__has_glass=False)
+            .values_list("order__window_detail__glass_type_id", "id", "order_id", "width_mm", "height_mm",
+                         "order__window_detail__order__quantity")
+            .distinct())
+
+    panes = defaultdict(list)
+    for glass_type_id, section_id, window_order_id, width_mm, height_mm, quantity in rows:
+        panes[glass_type_id].extend(Pane(width_mm, height_mm, {"section": section_id,
+                                                               "window_order": window_order_id,
+                                                               "copy": copy})
+                                    for copy in range(1, quantity + 1))
+    return panes
+
+
+def nest_open_orders(company_id, sheet_width_mm=None, sheet_height_mm=None):
+    """{glass_type_id: NestingResult} for the open orders of a company"""
+    return {glass_type_id: nest_panes(panes, sheet_width_mm, sheet_height_mm)
+            for glass_type_id, panes in gather_open_panes(company_id).items()}
@@ -0,0 +1,204 @@
+"""
+Versioned per-company price books.
+
+The catalog prices (every template, glass, product and custom product price)
+are compiled once into a shared ``PriceCatalog`` row, versioned by its id. A
+price book is the ``PriceSnapshot`` of one company: the catalog version it was
+built on, the company's ``ProductConfig`` profit rules and the measured waste
+of the company's latest cutting plan of every profile type. Only this company
+part is stored in the book's payload, so a catalog change writes the catalog
+once instead of once per company. Each build is stored as a new immutable
+``PriceBook`` row numbered by the company's PRICE_BOOK sequence, and
+``NewOrder.price_book_version`` records the book an order was priced with, so
+an old price can be reproduced with ``get_price_book_version``.
+
+Workers keep the current book of each company in memory, and the books built
+on one catalog version share one dict of rates. The current version number
+lives in the Django cache for ``settings.PRICE_BOOK_VERSION_TTL`` seconds, so
+with a warm cache pricing does not query at all. A worker that sees a newer
+version loads that one row (and the catalog, when it does not hold that
+version yet) and swaps its dict entry in a single assignment; requests
+already holding the previous book finish with it.
+
+Publishing a new version is per worker and eventually consistent: the
+default ``LocMemCache`` is private to each process, so only the worker that
+built the book sees it at once. The others keep pricing with the previous
+book until their cached version expires, at most ``PRICE_BOOK_VERSION_TTL``
+seconds later. A cache shared by all workers (Redis, memcached) makes it
+immediate.
+
+Books are rebuilt when a company's profit rules change
+(``rebuild_price_book``), when new cutting plans of the company are stored
+(``apps.orders.cutting.plan_open_orders``) and when the catalog admin changes
+prices (``catalog_changed``, which stores a new catalog and rebuilds the books
+of all companies in the background task queue).
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from apps.company.models import Company, ProductConfig
+from apps.materials.models import CustomProduct, GlassType, Product
+from apps.orders.models import CuttingPlan, OrderSequence, PriceBook, PriceCatalog, Template
+from apps.orders.pricing import PriceSnapshot
+from apps.orders.sequences import allocate
+from apps.tasks.queue import enqueue
+
+_price_books = {}
+# PriceCatalog id -> rates, bir katalog versiyasidagi barcha kitoblar shu dictni ulashadi
+_catalog_rates = {}
+
+
+def _version_key(company_id):
+    return f"price_book_version_{company_id}"
+
+
+def _publish(books):
+    """Hold ``{company_id: book}`` in this worker and publish their versions to the cache"""
+    _price_books.update(books)
+    cache.set_many({_version_key(company_id): book.version for company_id, book in books.items()},
+                   timeout=settings.PRICE_BOOK_VERSION_TTL)
+    # hech bir joriy kitob ishlatmaydigan eski katalog narxlari xotiradan chiqariladi
+    in_use = {book.catalog_version for book in list(_price_books.values())}
+    for catalog_id in set(_catalog_rates) - in_use:
+        _catalog_rates.pop(catalog_id, None)
+
+
+def load_catalog():
+    """Catalog prices shared by every company's price book, four queries"""
+    return {
+        "templates": list(Template.objects.only("id", "base_price_per_m2")),
+        "glass_types": list(GlassType.objects.only("id", "price")),
+        "products": list(Product.objects.only("id", "price")),
+        "custom_products": list(CustomProduct.objects.only("id",
+                                                           "measurement_unit",
+                                                           "measurement_value",
+                                                           "ordinary_price",
+                                                           "colorful_price")),
+    }
+
+
+def store_catalog():
+    """Compile the catalog prices into a new PriceCatalog version"""
+    snapshot = PriceSnapshot(**load_catalog())
+    catalog = PriceCatalog.objects.create(payload=snapshot.rates_payload())
+    _catalog_rates[catalog.id] = snapshot.rates
+    return catalog
+
+
+def current_catalog():
+    """Latest PriceCatalog, only its id is loaded; the first one is stored here"""
+    catalog = PriceCatalog.objects.order_by("-id").only("id").first()
+    return catalog if catalog is not None else store_catalog()
+
+
+def catalog_rates(catalog_id):
+    """Rates of a catalog version, loaded once per worker"""
+    rates = _catalog_rates.get(catalog_id)
+    if rates is None:
+        payload = PriceCatalog.objects.values_list("payload", flat=True).get(pk=catalog_id)
+        rates = _catalog_rates[catalog_id] = PriceSnapshot.rates_from_payload(payload)
+    return rates
+
+
+def latest_cutting_plans(company_ids=None):
+    """Latest CuttingPlan with cut bars of every company and profile type, one query"""
+    # faqat brusdan uzun qismlari bo'lgan rejada o'lchangan chiqindi yo'q
+    latest_plan = (CuttingPlan.objects.filter(company=OuterRef("company"),
+                                              profil_type=OuterRef("profil_type"),
+                                              bars_count__gt=0)
+                   .order_by("-created_at", "-id")
+                   .values("id")[:1])
+    plans = CuttingPlan.objects.filter(id=Subquery(latest_plan))
+    if company_ids is not None:
+        plans = plans.filter(company_id__in=company_ids)
+    return plans.only("company_id", "profil_type_id", "waste_percentage")
+
+
+def _build(company_id, profit_configs, cutting_plans, catalog_id):
+    book = PriceSnapshot(profit_configs=profit_configs, cutting_plans=cutting_plans)
+    book.rates = catalog_rates(catalog_id)
+    book.catalog_version = catalog_id
+    book.version = allocate(company_id, OrderSequence.SequenceName.PRICE_BOOK)
+    return book
+
+
+def _price_book_row(company_id, book):
+    return PriceBook(company_id=company_id,
+                     version=book.version,
+                     catalog_id=book.catalog_version,
+                     payload=book.to_payload())
+
+
+@transaction.atomic
+def rebuild_price_book(company_id, catalog=None):
+    """
+    Build, store and publish a new version of a company's price book on
+    ``catalog`` (a PriceCatalog), the current catalog by default.
+    """
+    catalog = catalog or current_catalog()
+    profit_configs = ProductConfig.objects.filter(company_id=company_id)
+    book = _build(company_id, profit_configs, latest_cutting_plans([company_id]), catalog.id)
+    _price_book_row(company_id, book).save()
+    # Boshqa workerlar yangi versiyani faqat commit bo'lgandan keyin ko'rishi kerak
+    transaction.on_commit(lambda: _publish({company_id: book}))
+    return book
+
+
+@transaction.atomic
+def rebuild_all_price_books():
+    """Store a new catalog version and rebuild the price book of every company on it"""
+    catalog = store_catalog()
+    profit_configs = defaultdict(list)
+    for config in ProductConfig.objects.all():
+        profit_configs[config.company_id].append(config)
+    cutting_plans = defaultdict(list)
+    for plan in latest_cutting_plans():
+        cutting_plans[plan.company_id].append(plan)
+
+    books = {company_id: _build(company_id, profit_configs[company_id], cutting_plans[company_id], catalog.id)
+             for company_id in Company.objects.values_list("id", flat=True)}
+    PriceBook.objects.bulk_create(_price_book_row(company_id, book) for company_id, book in books.items())
+    transaction.on_commit(lambda: _publish(books))
+    return len(books)
+
+
+def catalog_changed():
+    """Queue a rebuild of all price books, called by the catalog admins"""
+    enqueue("orders.rebuild_price_books")
+
+
+def get_price_book(company_id):
+    """
+    Current price book of a company.
+
+    Costs no query while the cached version matches the book this worker
+    holds (a book rebuilt by another worker is seen once that cached version
+    expires), otherwise one query for the latest version and one more to load
+    it (two when its catalog version is new to this worker). A company
+    without any book gets its first one built here.
+    """
+    book = _price_books.get(company_id)
+    if book is not None and book.version == cache.get(_version_key(company_id)):
+        return book
+
+    latest = (PriceBook.objects.filter(company_id=company_id)
+              .order_by("-version")
+              .values_list("version", flat=True)
+              .first())
+    if latest is None:
+        return rebuild_price_book(company_id)
+
+    if book is None or book.version != latest:
+        book = get_price_book_version(company_id, latest)
+    _publish({company_id: book})
+    return book
+
+
+def get_price_book_version(company_id, version):
+    """A stored price book version, to reproduce the price of an old order"""
+    row = PriceBook.objects.get(company_id=company_id, version=version)
+    return PriceSnapshot.from_payload(row.payload, catalog_rates(row.catalog_id), row.version, row.catalog_id)
@@ -0,0 +1,254 @@
+"""
+Pricing engine shared by orders, quotes and order details.
+
+Every price an order depends on (template base price per m², glass price per
+m², product and custom product prices and the company's profit rules) is
+compiled once into a ``PriceSnapshot``.
+A rate is kept as a ``(numerator, denominator)`` pair of integers in minor
+units (1/100 of the price field), so pricing a line item is one dict lookup
+and integer arithmetic, and a whole ``OrderDetail`` is priced without a query
+per field.
+
+Line item quantities are integers: mm² for template and glass lines, pieces
+for products and ``PIECE`` custom products, mm for ``LENGTH`` custom
+products. Every line is rounded half up to a minor unit.
+
+``Currency`` carries no exchange rate, so all prices of a snapshot are taken
+to be in one currency. Profit is kept to the minor unit like every other
+line.
+"""
+from decimal import Decimal
+
+from apps.company.models import ProductConfig
+from apps.materials.models import CustomProduct, GlassType, Product
+
+MINOR_IN_MAJOR = 100
+MM2_IN_M2 = 1_000_000
+MM_IN_M = 1_000
+
+# Line item kinds
+TEMPLATE = "template"
+GLASS = "glass"
+PRODUCT = "product"
+CUSTOM = "custom"
+CUSTOM_COLORFUL = "custom_colorful"
+
+
+def to_minor(amount):
+    """Decimal amount with two decimal places -> integer minor units"""
+    return int(Decimal(amount).scaleb(2).to_integral_value())
+
+
+def from_minor(amount):
+    """Integer minor units -> Decimal with two decimal places"""
+    return Decimal(amount).scaleb(-2)
+
+
+def apply_rate(quantity, rate):
+    """``quantity`` units priced at ``rate``, rounded half up to a minor unit"""
+    numerator, denominator = rate
+    return (quantity * numerator + denominator // 2) // denominator
+
+
+def area_price(area_mm2, price_per_m2):
+    """Decimal price of ``area_mm2`` at ``price_per_m2``"""
+    return from_minor(apply_rate(area_mm2, (to_minor(price_per_m2), MM2_IN_M2)))
+
+
+class LineItem:
+    """One priced position of an order, ``key`` is the snapshot rate key"""
+    __slots__ = ("key", "quantity")
+
+    def __init__(self, kind, ref, quantity):
+        self.key = (kind, ref)
+        self.quantity = quantity
+
+    def __repr__(self):
+        return f"LineItem({self.key[0]!r}, {self.key[1]!r}, {self.quantity})"
+
+
+class ProfitRule:
+    """Company profit for one material type, by percentage of cost or per m²"""
+    __slots__ = ("per_m2", "amount")
+
+    def __init__(self, per_m2, amount):
+        # amount is in hundredths: of a percent, or minor units per m²
+        self.per_m2 = per_m2
+        self.amount = amount
+
+    def profit(self, cost, area_mm2):
+        if self.per_m2:
+            return apply_rate(area_mm2, (self.amount, MM2_IN_M2))
+        return apply_rate(cost, (self.amount, 100 * 100))
+
+    @classmethod
+    def from_config(cls, config):
+        """ProfitRule of a ProductConfig, None when it has no profit mode set"""
+        if not (config.is_in_percentage or config.is_in_meter):
+            return None
+        return cls(per_m2=not config.is_in_percentage,
+                   amount=to_minor(config.profit))
+
+
+class OrderPrice:
+    """Priced order in minor units, ``cost`` already includes ``waste``"""
+    __slots__ = ("cost", "waste", "profit", "total")
+
+    def __init__(self, cost, waste, profit):
+        self.cost = cost
+        self.waste = waste
+        self.profit = profit
+        self.total = cost + profit
+
+    def __repr__(self):
+        return f"OrderPrice(cost={self.cost}, waste={self.waste}, profit={self.profit}, total={self.total})"
+
+
+class PriceSnapshot:
+    """
+    Immutable-by-convention compiled prices.
+
+    ``templates`` are compiled template layouts or Template instances; the
+    other arguments are model instances. Only what is passed in can be
+    priced, an unknown line item raises KeyError. ``waste`` maps a profile
+    type id to the measured waste percentage of its latest cutting plan.
+    ``version`` and ``catalog_version`` are set when the snapshot is a stored
+    price book (see ``apps.orders.price_books``).
+    """
+    __slots__ = ("rates", "profit_rules", "waste", "version", "catalog_version")
+
+    def __init__(self, templates=(), glass_types=(), products=(), custom_products=(), profit_configs=(),
+                 cutting_plans=()):
+        self.version = None
+        self.catalog_version = None
+        self.waste = {plan.profil_type_id: plan.waste_percentage for plan in cutting_plans}
+        rates = {}
+        for template in templates:
+            rates[TEMPLATE, template.id] = (to_minor(template.base_price_per_m2), MM2_IN_M2)
+        for glass_type in glass_types:
+            rates[GLASS, glass_type.id] = (to_minor(glass_type.price), MM2_IN_M2)
+        for product in products:
+            rates[PRODUCT, product.id] = (to_minor(product.price), 1)
+        for custom in custom_products:
+            if custom.measurement_unit == CustomProduct.MeasurementUnitChoices.LENGTH:
+                # narx measurement_value metr uchun, miqdor esa mm da keladi
+                per_mm = to_minor(custom.measurement_value) * MM_IN_M
+                rates[CUSTOM, custom.id] = (to_minor(custom.ordinary_price) * MINOR_IN_MAJOR, per_mm)
+                rates[CUSTOM_COLORFUL, custom.id] = (to_minor(custom.colorful_price) * MINOR_IN_MAJOR, per_mm)
+            else:
+                rates[CUSTOM, custom.id] = (to_minor(custom.ordinary_price), 1)
+                rates[CUSTOM_COLORFUL, custom.id] = (to_minor(custom.colorful_price), 1)
+        self.rates = rates
+        self.profit_rules = {}
+        for config in profit_configs:
+            rule = ProfitRule.from_config(config)
+            if rule is not None:
+                self.profit_rules[config.product_type] = rule
+
+    def rates_payload(self):
+        """JSON-serializable catalog rates, stored once and shared by the price books of all companies"""
+        return [[kind, ref, numerator, denominator]
+                for (kind, ref), (numerator, denominator) in self.rates.items()]
+
+    @staticmethod
+    def rates_from_payload(payload):
+        """Rates saved with ``rates_payload``"""
+        return {(kind, ref): (numerator, denominator) for kind, ref, numerator, denominator in payload}
+
+    def to_payload(self):
+        """JSON-serializable company part of the snapshot: profit rules and measured waste"""
+        return {
+            "profit_rules": {product_type: [rule.per_m2, rule.amount]
+                             for product_type, rule in self.profit_rules.items()},
+            "waste": [[profil_type_id, percentage] for profil_type_id, percentage in self.waste.items()],
+        }
+
+    @classmethod
+    def from_payload(cls, payload, rates, version=None, catalog_version=None):
+        """Restore a snapshot saved with ``to_payload`` on top of the shared catalog ``rates``"""
+        snapshot = cls.__new__(cls)
+        snapshot.rates = rates
+        snapshot.profit_rules = {product_type: ProfitRule(*rule)
+                                 for product_type, rule in payload["profit_rules"].items()}
+        snapshot.waste = {profil_type_id: percentage for profil_type_id, percentage in payload.get("waste", ())}
+        snapshot.version = version
+        snapshot.catalog_version = catalog_version
+        return snapshot
+
+    def price_lines(self, lines):
+        """Total cost of ``lines`` in minor units"""
+        rates = self.rates
+        total = 0
+        for line in lines:
+            numerator, denominator = rates[line.key]
+            total += (line.quantity * numerator + denominator // 2) // denominator
+        return total
+
+    def price_order(self, material_type, lines, area_mm2, waste_percentage=None):
+        """
+        Price one order: its line items, waste on top of them and the
+        company's profit for ``material_type``.
+        """
+        cost = self.price_lines(lines)
+        waste = 0
+        if waste_percentage:
+            waste = apply_rate(cost, (round(waste_percentage * 100), 100 * 100))
+            cost += waste
+
+        rule = self.profit_rules.get(material_type)
+        profit = rule.profit(cost, area_mm2) if rule is not None else 0
+        return OrderPrice(cost, waste, profit)
+
+
+def load_snapshot(company_id, templates=(), glass_type_ids=(), product_ids=(), custom_product_ids=()):
+    """Build a snapshot with one query per price table that is actually needed"""
+    return PriceSnapshot(
+        templates=templates,
+        glass_types=GlassType.objects.filter(id__in=glass_type_ids) if glass_type_ids else (),
+        products=Product.objects.filter(id__in=product_ids) if product_ids else (),
+        custom_products=CustomProduct.objects.filter(id__in=custom_product_ids) if custom_product_ids else (),
+        profit_configs=ProductConfig.objects.filter(company_id=company_id),
+    )
+
+
+def order_lines(order, sections, glass_type_id=None):
+    """
+    Line items of a window/door order: the frame priced by its template and
+    the glazed sections priced by ``glass_type_id``.
+
+    ``sections`` must come with their ``template_section`` loaded. Area is
+    taken from the sections when there are any, from the full size otherwise.
+    """
+    if sections:
+        area_mm2 = sum(sec.width_mm * sec.height_mm for sec in sections)
+        glass_mm2 = sum(sec.width_mm * sec.height_mm for sec in sections
+                        if sec.template_section is None or sec.template_section.has_glass)
+    else:
+        area_mm2 = glass_mm2 = order.width_mm * order.height_mm
+
+    lines = [LineItem(TEMPLATE, order.template_id, area_mm2)]
+    if glass_type_id is not None and glass_mm2:
+        lines.append(LineItem(GLASS, glass_type_id, glass_mm2))
+    return lines
+
+
+def price_order_detail(snapshot, order_detail, extra_lines=()):
+    """
+    Price an ``OrderDetail`` together with its window order and its sections.
+
+    A detail that includes waste but has no waste percentage typed in gets
+    the measured waste of its profile type from the snapshot filled in.
+    """
+    window_order = order_detail.window_order
+    lines = order_lines(window_order, list(window_order.sections.all()), order_detail.glass_type_id)
+    lines.extend(extra_lines)
+
+    waste_percentage = None
+    if order_detail.include_waste_percentage:
+        if order_detail.waste_percentage is None:
+            order_detail.waste_percentage = snapshot.waste.get(order_detail.profil_type_id)
+        waste_percentage = order_detail.waste_percentage
+    return snapshot.price_order(order_detail.material_type,
+                                lines,
+                                window_order.width_mm * window_order.height_mm,
+                                waste_percentage)
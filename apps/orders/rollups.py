@@ -0,0 +1,164 @@
+"""
+Daily revenue and profit rollups.
+
+``OrderRollup`` holds one row per (day, company, dealer, region, order type,
+material type). Each row has the count and the summed ``total_price``,
+``cost_price`` and ``profit`` of the orders created that day, and the same
+sums for the orders that are CLOSED. Every ``Order`` record counts once,
+with the prices of its NewOrder. The day is the local date of
+``NewOrder.created_at``.
+
+The signals in ``apps.orders.signals`` keep the rows current. Creating an
+Order record adds it to its row. A status change into or out of CLOSED moves
+its amounts between the open and closed sums. Deleting a record subtracts
+it. Each change is a single ``UPDATE ... SET x = x + delta`` on one row, in
+the caller's transaction. Changes that skip the signals (``queryset.update``,
+raw SQL) are repaired with ``rebuild_rollups``, which recomputes a day range
+from the orders. The ``rebuild_rollups`` command runs it in parallel chunks.
+
+Reports read only this table (``summarize``): the month-to-date figures of a
+dealer come from about companies x days x types rows, through the
+``(dealer, day)`` index.
+"""
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.orders.models import Order, OrderDetail, OrderRollup
+
+CLOSED = Order.OrderStatusChoices.CLOSED
+AMOUNTS = ("total_price", "cost_price", "profit")
+CLOSED_AMOUNTS = ("closed_total_price", "closed_profit")
+MEASURES = ("orders_count", *AMOUNTS, "closed_count", *CLOSED_AMOUNTS)
+DIMENSIONS = ("day", "company", "dealer", "region", "order_type", "material_type")
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _order_facts(order_detail_id):
+    """Rollup key and prices of the NewOrder behind an OrderDetail, one query"""
+    row = (OrderDetail.objects.filter(pk=order_detail_id)
+           .values("material_type",
+                   "order__created_at",
+                   "order__company_id",
+                   "order__company__dealer_id",
+                   "order__company__region_id",
+                   "order__order_type",
+                   "order__total_price",
+                   "order__cost_price",
+                   "order__profit")
+           .first())
+    if row is None:
+        return None, None
+    key = {
+        "day": timezone.localdate(row["order__created_at"]),
+        "company_id": row["order__company_id"],
+        "dealer_id": row["order__company__dealer_id"],
+        "region_id": row["order__company__region_id"],
+        "order_type": row["order__order_type"],
+        "material_type": row["material_type"],
+    }
+    prices = {field: row[f"order__{field}"] or Decimal("0") for field in AMOUNTS}
+    return key, prices
+
+
+def _closed_deltas(prices, sign):
+    return {"closed_count": sign,
+            "closed_total_price": sign * prices["total_price"],
+            "closed_profit": sign * prices["profit"]}
+
+
+def _apply(key, deltas):
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    changes["updated_at"] = timezone.now()
+    if not OrderRollup.objects.filter(**key).update(**changes):
+        OrderRollup.objects.bulk_create([OrderRollup(**key)], ignore_conflicts=True)
+        OrderRollup.objects.filter(**key).update(**changes)
+
+
+def _record(order, sign):
+    key, prices = _order_facts(order.order_id)
+    if key is None:
+        return
+    deltas = {"orders_count": sign, **{field: sign * prices[field] for field in AMOUNTS}}
+    if order.status == CLOSED:
+        deltas.update(_closed_deltas(prices, sign))
+    _apply(key, deltas)
+
+
+def order_created(order):
+    _record(order, 1)
+
+
+def order_deleted(order):
+    _record(order, -1)
+
+
+def order_status_changed(order, old_status):
+    if (old_status == CLOSED) == (order.status == CLOSED):
+        return
+    key, prices = _order_facts(order.order_id)
+    if key is not None:
+        _apply(key, _closed_deltas(prices, 1 if order.status == CLOSED else -1))
+
+
+@transaction.atomic
+def rebuild_rollups(day_from, day_to):
+    """Recompute the rollups of ``day_from`` .. ``day_to`` (inclusive) from the orders, returns the row count"""
+    rows = (Order.objects
+            .filter(order__order__created_at__gte=day_start(day_from),
+                    order__order__created_at__lt=day_start(day_to + timedelta(days=1)))
+            .values(day=TruncDate("order__order__created_at"),
+                    rollup_company=F("order__order__company_id"),
+                    rollup_dealer=F("order__order__company__dealer_id"),
+                    rollup_region=F("order__order__company__region_id"),
+                    rollup_order_type=F("order__order__order_type"),
+                    rollup_material_type=F("order__material_type"))
+            .annotate(sum_orders_count=Count("id"),
+                      sum_total_price=Sum("order__order__total_price"),
+                      sum_cost_price=Sum("order__order__cost_price"),
+                      sum_profit=Sum("order__order__profit"),
+                      sum_closed_count=Count("id", filter=Q(status=CLOSED)),
+                      sum_closed_total_price=Sum("order__order__total_price", filter=Q(status=CLOSED)),
+                      sum_closed_profit=Sum("order__order__profit", filter=Q(status=CLOSED)))
+            .order_by())
+
+    OrderRollup.objects.filter(day__gte=day_from, day__lte=day_to).delete()
+    rollups = OrderRollup.objects.bulk_create(
+        OrderRollup(day=row["day"],
+                    company_id=row["rollup_company"],
+                    dealer_id=row["rollup_dealer"],
+                    region_id=row["rollup_region"],
+                    order_type=row["rollup_order_type"],
+                    material_type=row["rollup_material_type"],
+                    **{field: row[f"sum_{field}"] or 0 for field in MEASURES})
+        for row in rows
+    )
+    return len(rollups)
+
+
+def day_chunks(day_from, day_to, chunk_days):
+    """Split ``day_from`` .. ``day_to`` into (first, last) ranges of ``chunk_days`` days"""
+    chunks = []
+    while day_from <= day_to:
+        last = min(day_from + timedelta(days=chunk_days - 1), day_to)
+        chunks.append((day_from, last))
+        day_from = last + timedelta(days=1)
+    return chunks
+
+
+def summarize(queryset, group_by=None):
+    """Totals of a rollup queryset and, with ``group_by``, one row per value of that dimension"""
+    sums = {field: Sum(field) for field in MEASURES}
+    totals = queryset.aggregate(**sums)
+    totals = {field: totals[field] or 0 for field in MEASURES}
+    if group_by is None:
+        return totals, []
+    groups = list(queryset.values(group_by).annotate(**sums).order_by(group_by))
+    return totals, groups
@@ -0,0 +1,82 @@
+"""
+Order search.
+
+On PostgreSQL ``NewOrder.search_vector`` is kept up to date by a database
+trigger (migration ``0014_order_search``) over order number, owner, phone
+and location, with the ``simple`` configuration, so names are not stemmed.
+Partial matches use ``icontains``. Django renders that as
+``UPPER(col::text) LIKE UPPER(%s)``, and the migration creates trigram GIN
+indexes on exactly those expressions, so a lookup by part of a phone number
+or name is an index scan and not a sequential scan. Results are ranked by
+full-text rank plus the best trigram similarity.
+
+Other databases (SQLite in tests and local runs) use ``SimpleOrderSearch``:
+plain ``icontains`` with exact and prefix order number matches ranked first.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+
+SEARCH_FIELDS = ("order_number", "order_owner", "phone_number", "location")
+SEARCH_CONFIG = "simple"
+
+
+def normalize_query(query):
+    return " ".join(query.split())
+
+
+def compact_phone(query):
+    """A query that looks like a phone number without its spaces, dashes and brackets, else None"""
+    if re.fullmatch(r"[+\d\s()-]+", query):
+        return re.sub(r"[\s()-]", "", query)
+    return None
+
+
+def contains_any(query):
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f"{field}__icontains": query})
+    phone = compact_phone(query)
+    if phone and phone != query:
+        condition |= Q(phone_number__icontains=phone)
+    return condition
+
+
+class SimpleOrderSearch:
+    """icontains search for databases without full-text and trigram support"""
+
+    def search(self, queryset, query):
+        query = normalize_query(query)
+        return (queryset.filter(contains_any(query))
+                .annotate(rank=Case(When(order_number__iexact=query, then=Value(2)),
+                                    When(order_number__istartswith=query, then=Value(1)),
+                                    default=Value(0),
+                                    output_field=IntegerField()))
+                .order_by("-rank", "-created_at", "-id"))
+
+
+class PostgresOrderSearch:
+    """Full-text plus trigram search backed by the indexes of migration 0014"""
+
+    def search(self, queryset, query):
+        query = normalize_query(query)
+        search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+        similarity = Greatest(*(TrigramSimilarity(field, query) for field in SEARCH_FIELDS))
+
+        return (queryset.filter(Q(search_vector=search_query) | contains_any(query))
+                .annotate(rank=SearchRank(F("search_vector"), search_query) + similarity)
+                .order_by("-rank", "-created_at", "-id"))
+
+
+def get_order_search():
+    """Search backend for the default database"""
+    if connection.vendor == "postgresql":
+        return PostgresOrderSearch()
+    return SimpleOrderSearch()
+
+
+def search_orders(queryset, query):
+    return get_order_search().search(queryset, query)
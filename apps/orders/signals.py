@@ -1,28 +1,33 @@
-from decimal import Decimal
-
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_save
 
+from apps.orders import rollups
 from apps.orders.models import OrderDetail, Order
+from apps.orders.tasks import create_order_record
 
 
+# Order yozuvi so'rov ichida emas, background worker tomonidan yaratiladi
 @receiver(post_save, sender=OrderDetail)
-def create_order_record(sender, instance, created, **kwargs):
-    window_order = instance.window_order
-    # door_order = instance.door_order
-    
-    if window_order:
-        total_price = window_order.total_price
-    else:
-        total_price = Decimal("0.00")
-
-    last_order = Order.objects.last()
-    next_order = (last_order.total_orders_number + 1) if last_order else 1
+def enqueue_order_record(sender, instance, created, **kwargs):
+    if created:
+        create_order_record.enqueue(order_detail_id=instance.pk)
+
+
+# status o'zgarishini aniqlash uchun bazadan o'qilgan qiymat eslab qolinadi (qo'shimcha so'rovsiz)
+@receiver(post_init, sender=Order)
+def remember_order_status(sender, instance, **kwargs):
+    instance._rollup_status = instance.__dict__.get("status")
 
+
+@receiver(post_save, sender=Order)
+def update_order_rollups(sender, instance, created, **kwargs):
     if created:
-        Order.objects.create(
-            order=instance,
-            total_orders_number=next_order,
-            total_price=total_price,
-            status=Order.OrderStatusChoices.WAITING
-        )
+        rollups.order_created(instance)
+    elif instance._rollup_status is not None and instance.status != instance._rollup_status:
+        rollups.order_status_changed(instance, instance._rollup_status)
+    instance._rollup_status = instance.status
+
+
+@receiver(post_delete, sender=Order)
+def remove_order_from_rollups(sender, instance, **kwargs):
+    rollups.order_deleted(instance)
@@ -0,0 +1,37 @@
+from decimal import Decimal
+
+from apps.orders.models import OrderDetail, Order, OrderSequence
+from apps.orders.price_books import rebuild_all_price_books
+from apps.orders.sequences import allocate
+from apps.tasks.queue import task
+
+
+@task(name="orders.create_order_record")
+def create_order_record(order_detail_id):
+    order_detail = OrderDetail.objects.select_related("order", "window_order").get(pk=order_detail_id)
+
+    # Qayta urinishda (retry) ikkinchi yozuv yaratilmasligi uchun
+    if Order.objects.filter(order=order_detail).exists():
+        return
+
+    window_order = order_detail.window_order
+    # door_order = order_detail.door_order
+
+    if window_order:
+        total_price = window_order.total_price
+    else:
+        total_price = Decimal("0.00")
+
+    next_order = allocate(order_detail.order.company_id, OrderSequence.SequenceName.ORDER)
+
+    Order.objects.create(
+        order=order_detail,
+        total_orders_number=next_order,
+        total_price=total_price,
+        status=Order.OrderStatusChoices.WAITING
+    )
+
+
+@task(name="orders.rebuild_price_books")
+def rebuild_price_books():
+    rebuild_all_price_books()
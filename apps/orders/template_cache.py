@@ -0,0 +1,150 @@
+"""
+In-process cache of compiled template layouts.
+
+Every ``Template`` is compiled together with its ``TemplateSection`` rows into
+an immutable ``CompiledTemplate`` with orientation, ratios and section order
+resolved up front. Compiled layouts are kept per worker, keyed by template id
+and checked against ``Template.version``.
+
+The current version of a template lives in the Django cache for
+``settings.TEMPLATE_LAYOUT_VERSION_TTL`` seconds, so with a warm cache an
+order is laid out and priced without any template query. The template admins call
+``invalidate_template_layout`` after saving, which bumps the version in the
+database and drops the cached entries once the transaction commits.
+
+Invalidation is per worker and eventually consistent: the default
+``LocMemCache`` is private to each process, so the drop only reaches the
+worker that handled the save. Other workers keep the previous layout until
+their cached version expires, at most ``TEMPLATE_LAYOUT_VERSION_TTL`` seconds
+later. A cache shared by all workers (Redis, memcached) makes it immediate.
+"""
+from decimal import Decimal
+from types import MappingProxyType
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Prefetch
+
+from apps.orders.models import Template, TemplateSection
+
+_compiled_templates = {}
+
+
+class CompiledSection(NamedTuple):
+    id: int
+    section_order: int
+    section_type: str
+    has_glass: bool
+    is_vertical: bool
+    width_ratio: float
+    height_ratio: float
+    instance: TemplateSection
+
+
+class CompiledTemplate(NamedTuple):
+    id: int
+    version: int
+    name: str
+    template_type: str
+    base_price_per_m2: Decimal
+    sections: tuple
+    sections_by_order: MappingProxyType
+    instance: Template
+
+
+def compile_template(template, template_sections):
+    """Build the immutable layout of a template from its sections"""
+    sections = tuple(
+        CompiledSection(
+            id=sec.id,
+            section_order=sec.section_order,
+            section_type=sec.section_type,
+            has_glass=sec.has_glass,
+            is_vertical=sec.orientation == TemplateSection.OrientationType.VERTICAL,
+            # Missing ratios mean the section spans the whole side
+            width_ratio=sec.width_ratio if sec.width_ratio is not None else 1,
+            height_ratio=sec.height_ratio if sec.height_ratio is not None else 1,
+            instance=sec,
+        )
+        for sec in sorted(template_sections, key=lambda s: s.section_order)
+    )
+    return CompiledTemplate(
+        id=template.id,
+        version=template.version,
+        name=template.name,
+        template_type=template.template_type,
+        base_price_per_m2=template.base_price_per_m2,
+        sections=sections,
+        sections_by_order=MappingProxyType({sec.section_order: sec for sec in sections}),
+        instance=template,
+    )
+
+
+def _version_key(template_id):
+    return f"template_layout_version_{template_id}"
+
+
+def get_compiled_templates(template_ids):
+    """
+    Return {template_id: CompiledTemplate} for the given ids.
+
+    Unknown ids are left out of the result. Only templates whose version has
+    changed (or that this worker has not seen yet) are loaded, with their
+    sections, in two queries.
+    """
+    template_ids = set(template_ids)
+    cached_versions = cache.get_many([_version_key(pk) for pk in template_ids])
+    versions = {}
+    for pk in template_ids:
+        version = cached_versions.get(_version_key(pk))
+        if version is not None:
+            versions[pk] = version
+
+    unknown_versions = template_ids - versions.keys()
+    if unknown_versions:
+        fetched = dict(Template.objects.filter(id__in=unknown_versions).values_list("id", "version"))
+        cache.set_many({_version_key(pk): version for pk, version in fetched.items()},
+                       timeout=settings.TEMPLATE_LAYOUT_VERSION_TTL)
+        versions.update(fetched)
+
+    compiled = {}
+    stale = []
+    for pk, version in versions.items():
+        layout = _compiled_templates.get(pk)
+        if layout is not None and layout.version == version:
+            compiled[pk] = layout
+        else:
+            stale.append(pk)
+
+    if stale:
+        templates = Template.objects.filter(id__in=stale).prefetch_related(
+            Prefetch("sections", queryset=TemplateSection.objects.order_by("section_order"))
+        )
+        for template in templates:
+            layout = compile_template(template, template.sections.all())
+            _compiled_templates[template.id] = layout
+            compiled[template.id] = layout
+
+    return compiled
+
+
+def get_compiled_template(template_id):
+    """Return the compiled layout of one template or None if it does not exist"""
+    return get_compiled_templates([template_id]).get(template_id)
+
+
+def invalidate_template_layout(template_id):
+    """
+    Bump the template's version. This worker recompiles the layout at once,
+    the others when their cached version expires.
+    """
+    Template.objects.filter(pk=template_id).update(version=F("version") + 1)
+
+    # kommitdan oldin o'chirilsa, parallel so'rov eski versiyani qayta keshga yozishi mumkin
+    def drop():
+        cache.delete(_version_key(template_id))
+        _compiled_templates.pop(template_id, None)
+
+    transaction.on_commit(drop)
@@ -1,3 +1,560 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import User
+from apps.common.models import Country, Currency, District, Region
+from apps.company.models import Company, Dealer, ProductConfig, Provider
+from apps.materials.models import (
+    DesignOption, DesignVariant, FrameProfilType, GlassLayer, GlassType, MaterialType, ProfilType, SashProfilType,
+)
+from apps.orders import cutting, nesting, price_books, rollups, template_cache
+from apps.orders.models import (
+    CuttingPlan, NewOrder, Order, OrderRollup, OrderSequence, PriceBook, PriceCatalog, Template, TemplateSection, WindowOrder,
+)
+from apps.orders.sequences import allocate, next_order_number
+from apps.orders.pricing import GLASS, TEMPLATE, LineItem, PriceSnapshot
+from apps.orders.tasks import create_order_record
+from apps.orders.template_cache import get_compiled_template, invalidate_template_layout
+from apps.tasks.models import Task
+
+class OrderTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        country = Country.objects.create(name="Uzbekistan", code="UZ")
+        region = Region.objects.create(country=country, name="Tashkent")
+        district = District.objects.create(region=region, name="Yunusobod")
+        cls.currency = Currency.objects.create(code="UZS", name="Sum", symbol="s")
+        cls.user = User.all_objects.create(full_name="Master", phone_number="+998901234567", country=country)
+        cls.company = Company.objects.create(region=region,
+                                             district=district,
+                                             dealer=Dealer.objects.create(name="Dealer"),
+                                             master=cls.user)
+        ProductConfig.objects.create(company=cls.company, product_type="PLAST", profit=20, currency=cls.currency)
+
+        cls.template = cls.create_template(sections=2)
+        cls.big_template = cls.create_template(sections=8)
+        cls.material = MaterialType.objects.create(name="PVC")
+        cls.profil_type = ProfilType.objects.create(material=cls.material, name="P60")
+        cls.glass_layer = GlassLayer.objects.create(layer="2")
+        cls.glass_type = GlassType.objects.create(layer=cls.glass_layer, name="Clear", price=50, currency=cls.currency)
+        cls.provider = Provider.objects.create(name="Provider")
+        cls.sash = SashProfilType.objects.create(image="sash.png")
+        cls.frame = FrameProfilType.objects.create(name="Frame")
+        cls.design_option = DesignOption.objects.create(name="Color")
+        cls.design_variant = DesignVariant.objects.create(option=cls.design_option, name="White")
+
+    @staticmethod
+    def create_template(sections, template_type=Template.TemplateType.WINDOW):
+        template = Template.objects.create(name=f"{sections} sections",
+                                           template_type=template_type,
+                                           base_width_mm=1000,
+                                           base_height_mm=1000,
+                                           base_price_per_m2=100)
+        # toq qismlar gorizontal, juftlari vertikal
+        TemplateSection.objects.bulk_create(
+            TemplateSection(template=template,
+                            section_type=TemplateSection.SectionType.WHOLE,
+                            section_order=order,
+                            orientation=(TemplateSection.OrientationType.VERTICAL if order % 2 == 0
+                                         else TemplateSection.OrientationType.HORIZONTAL),
+                            width_ratio=0.5,
+                            height_ratio=0.5)
+            for order in range(1, sections + 1)
+        )
+        return template
+
+    def setUp(self):
+        # worker xotirasidagi keshlar testlar orasida qolmasligi kerak
+        cache.clear()
+        template_cache._compiled_templates.clear()
+        price_books._price_books.clear()
+        price_books._catalog_rates.clear()
+        self.client.force_authenticate(self.user)
+
+    def order_payload(self, template=None, quantity=1, **window_order):
+        return {
+            "order": {"order_type": "WINDOW",
+                      "quantity": quantity,
+                      "advance_payment": "10",
+                      "order_owner": "Owner",
+                      "phone_number": "+998901112233",
+                      "location": "Tashkent",
+                      "additional_info": "-"},
+            "window_order": {"template": (template or self.template).id,
+                             "width_mm": 2000,
+                             "height_mm": 1500,
+                             **window_order},
+            "material": self.material.id,
+            "material_type": "PLAST",
+            "glass_layer": self.glass_layer.id,
+            "glass_type": self.glass_type.id,
+            "provider": self.provider.id,
+            "profil_type": self.profil_type.id,
+            "sash_profil_type": self.sash.id,
+            "frame_profile_type": self.frame.id,
+            "design_option": self.design_option.id,
+            "design_variant": self.design_variant.id,
+            "shelf_width": 1.0,
+        }
+
+    def create_order(self, template=None, quantity=1, **window_order):
+        response = self.client.post("/api/orders/create/",
+                                    self.order_payload(template, quantity, **window_order),
+                                    format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return NewOrder.objects.order_by("-id").first()
+
+    def place_order(self, quantity=1):
+        order = self.create_order(quantity=quantity)
+        # Order yozuvi odatda worker tomonidan yaratiladi
+        create_order_record(order_detail_id=order.order_detail.get().id)
+        return order
+
+
+class OrderLayoutTests(OrderTestCase):
+    def test_create_query_count_does_not_grow_with_sections(self):
+        # shablonlar va narxlar kitobi keshga olinadi
+        self.create_order(self.template)
+        self.create_order(self.big_template)
+
+        with CaptureQueriesContext(connection) as small:
+            self.create_order(self.template)
+        with self.assertNumQueries(len(small)):
+            self.create_order(self.big_template)
+
+    def test_window_order_sections(self):
+        response = self.client.post("/api/orders/window/",
+                                    {"template": self.template.id, "width_mm": 2000, "height_mm": 1500},
+                                    format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        sizes = [(section["width_mm"], section["height_mm"]) for section in response.data["sections"]]
+        # gorizontal: butun eni; vertikal: eni va bo'yi ulush bo'yicha
+        self.assertEqual(sizes, [(2000, 750), (1000, 750)])
+
+    def test_client_section_defaults(self):
+        response = self.client.post("/api/orders/window/",
+                                    {"template": self.template.id, "width_mm": 2000, "height_mm": 1500,
+                                     "sections": [{"section_order": 1, "height_mm": 600},
+                                                  {"section_order": 2, "width_mm": 700}]},
+                                    format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        sizes = [(section["width_mm"], section["height_mm"]) for section in response.data["sections"]]
+        # yuborilmagan o'lcham: gorizontalda buyurtma eni, vertikalda buyurtma bo'yi
+        self.assertEqual(sizes, [(2000, 600), (700, 1500)])
+
+    def test_unknown_section_order(self):
+        response = self.client.post("/api/orders/window/",
+                                    {"template": self.template.id, "width_mm": 2000, "height_mm": 1500,
+                                     "sections": [{"section_order": 9, "width_mm": 700}]},
+                                    format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(WindowOrder.objects.exists())
+
+
+class StoredAreaTests(OrderTestCase):
+    def test_sections_area_and_price_are_stored(self):
+        response = self.client.post("/api/orders/window/",
+                                    {"template": self.template.id, "width_mm": 2000, "height_mm": 1500},
+                                    format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+
+        order = WindowOrder.objects.get(pk=response.data["id"])
+        self.assertEqual(order.area_m2, Decimal("3"))
+        # 2000x750 + 1000x750 mm, 100 dan m²
+        self.assertEqual(order.sections_area_m2, Decimal("2.25"))
+        self.assertEqual(order.total_price, Decimal("225"))
+        self.assertEqual(response.data["total_price"], 225.0)
+        self.assertEqual(sorted(order.sections.values_list("area_m2", flat=True)), [Decimal("0.75"), Decimal("1.5")])
+
+    def test_order_without_sections_is_priced_by_its_area(self):
+        order = WindowOrder.objects.create(template=self.template, width_mm=2000, height_mm=1500)
+
+        order.refresh_from_db()
+        self.assertIsNone(order.sections_area_m2)
+        self.assertEqual(order.total_price, Decimal("300"))
+
+
+class TemplateCacheTests(OrderTestCase):
+    def test_warm_layout_costs_no_query(self):
+        get_compiled_template(self.template.id)
+
+        with self.assertNumQueries(0):
+            layout = get_compiled_template(self.template.id)
+        self.assertEqual([sec.section_order for sec in layout.sections], [1, 2])
+
+    def test_invalidation_is_dropped_after_commit(self):
+        layout = get_compiled_template(self.template.id)
+        TemplateSection.objects.filter(template=self.template, section_order=2).update(width_ratio=0.25)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_template_layout(self.template.id)
+            # kommitgacha eski layout ishlatiladi
+            self.assertIs(get_compiled_template(self.template.id), layout)
+
+        recompiled = get_compiled_template(self.template.id)
+        self.assertEqual(recompiled.version, layout.version + 1)
+        self.assertEqual(recompiled.sections_by_order[2].width_ratio, 0.25)
+
+
+class PricingTests(SimpleTestCase):
+    def snapshot(self, **config):
+        config = {"product_type": "PLAST", "profit": Decimal("20"), **config}
+        return PriceSnapshot(templates=[Template(id=1, base_price_per_m2=Decimal("37.80"))],
+                             glass_types=[GlassType(id=2, price=Decimal("10"))],
+                             profit_configs=[ProductConfig(**config)],
+                             cutting_plans=[CuttingPlan(profil_type_id=3, waste_percentage=5)])
+
+    def test_percentage_profit_keeps_cents(self):
+        lines = [LineItem(TEMPLATE, 1, 3_000_000)]
+        price = self.snapshot().price_order("PLAST", lines, 3_000_000)
+
+        # 113.40 ning 20% i
+        self.assertEqual((price.cost, price.profit, price.total), (11340, 2268, 13608))
+
+    def test_profit_per_m2(self):
+        lines = [LineItem(TEMPLATE, 1, 1_500_000), LineItem(GLASS, 2, 1_000_000)]
+        price = self.snapshot(is_in_percentage=False, is_in_meter=True).price_order("PLAST", lines, 1_500_000)
+
+        self.assertEqual((price.cost, price.profit), (5670 + 1000, 3000))
+
+    def test_waste_is_added_to_cost(self):
+        snapshot = self.snapshot()
+        price = snapshot.price_order("PLAST", [LineItem(TEMPLATE, 1, 3_000_000)], 3_000_000, snapshot.waste[3])
+
+        self.assertEqual((price.waste, price.cost, price.profit), (567, 11907, 2381))
+
+    def test_unknown_line_item(self):
+        with self.assertRaises(KeyError):
+            self.snapshot().price_lines([LineItem(GLASS, 99, 1_000_000)])
+
+
+class PriceBookTests(OrderTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        master = User.all_objects.create(full_name="Second", phone_number="+998907654321")
+        cls.other_company = Company.objects.create(region=cls.company.region,
+                                                   district=cls.company.district,
+                                                   dealer=cls.company.dealer,
+                                                   master=master)
+
+    def test_companies_share_one_catalog(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            price_books.rebuild_all_price_books()
+
+        catalog = PriceCatalog.objects.get()
+        rows = PriceBook.objects.filter(company__in=[self.company, self.other_company])
+        self.assertEqual({row.catalog_id for row in rows}, {catalog.id})
+        self.assertTrue(all("rates" not in row.payload for row in rows))
+
+        with self.assertNumQueries(0):
+            book = price_books.get_price_book(self.company.id)
+            other = price_books.get_price_book(self.other_company.id)
+        self.assertIs(book.rates, other.rates)
+        self.assertIn("PLAST", book.profit_rules)
+        self.assertNotIn("PLAST", other.profit_rules)
+
+    def test_old_version_is_reproduced(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            old = price_books.rebuild_price_book(self.company.id)
+        ProductConfig.objects.filter(company=self.company).update(profit=30)
+        with self.captureOnCommitCallbacks(execute=True):
+            new = price_books.rebuild_price_book(self.company.id)
+
+        self.assertEqual(price_books.get_price_book(self.company.id).version, new.version)
+        restored = price_books.get_price_book_version(self.company.id, old.version)
+        self.assertEqual(restored.profit_rules["PLAST"].amount, 2000)
+        self.assertEqual(restored.rates, old.rates)
+
+
+class CuttingTests(OrderTestCase):
+    def test_every_piece_is_cut(self):
+        lengths = [37, 25, 36, 40, 25, 39, 22, 44, 23]
+        first_fit, _ = cutting.first_fit_decreasing(lengths, 100)
+
+        result = cutting.optimize_cuts(lengths, bar_length_mm=100, kerf_mm=0, time_budget=1)
+        self.assertEqual(len(first_fit), 4)
+        self.assertEqual(len(result.bars), 3)
+        self.assertEqual(sorted(piece for bar in result.bars for piece in bar), sorted(lengths))
+        self.assertTrue(all(sum(bar) <= 100 for bar in result.bars))
+
+    def test_kerf_takes_bar_length(self):
+        result = cutting.optimize_cuts([50, 50], bar_length_mm=100, kerf_mm=5, time_budget=0)
+
+        self.assertEqual(len(result.bars), 2)
+        self.assertEqual(result.waste_percentage, 50.0)
+
+    def test_piece_longer_than_bar(self):
+        with self.assertRaises(ValueError):
+            cutting.optimize_cuts([120], bar_length_mm=100, kerf_mm=0)
+
+    def test_open_cuts_per_company_and_quantity(self):
+        self.place_order(quantity=3)
+
+        cuts = cutting.gather_open_cuts()
+        # 2 qism, har biri 4 bo'lak, 3 dona buyurtma
+        self.assertEqual(list(cuts), [(self.company.id, self.profil_type.id)])
+        self.assertEqual(len(cuts[self.company.id, self.profil_type.id]), 2 * 4 * 3)
+        self.assertEqual(cutting.gather_open_cuts(company_id=self.company.id + 1), {})
+
+    def test_time_budget_covers_the_whole_run(self):
+        other_profil = ProfilType.objects.create(material=self.material, name="P70")
+        groups = {(self.company.id, self.profil_type.id): [1000] * 10,
+                  (self.company.id, other_profil.id): [2000] * 10}
+
+        with mock.patch.object(cutting, "gather_open_cuts", return_value=groups), \
+                mock.patch.object(cutting, "optimize_cuts", wraps=cutting.optimize_cuts) as optimize:
+            with self.captureOnCommitCallbacks(execute=True):
+                plans = cutting.plan_open_orders(time_budget=0.2)
+
+        budgets = [call.args[3] for call in optimize.call_args_list]
+        self.assertEqual(len(budgets), 2)
+        self.assertLessEqual(budgets[0], 0.1)
+        # birinchi tur tez tugaydi, ortgan vaqt keyingisiga o'tadi
+        self.assertGreater(budgets[1], budgets[0])
+        self.assertLessEqual(budgets[1], 0.2)
+        self.assertEqual({plan.company_id for plan in plans}, {self.company.id})
+        self.assertIn(other_profil.id, price_books.get_price_book(self.company.id).waste)
+
+    def test_oversized_piece_skips_only_its_piece(self):
+        long_profil, short_profil = (ProfilType.objects.create(material=self.material, name=name)
+                                     for name in ("P70", "P80"))
+        groups = {(self.company.id, self.profil_type.id): [1000, 9000, 1000],
+                  (self.company.id, long_profil.id): [7000],
+                  (self.company.id, short_profil.id): [2000] * 3}
+
+        with mock.patch.object(cutting, "gather_open_cuts", return_value=groups):
+            with self.captureOnCommitCallbacks(execute=True):
+                plans = cutting.plan_open_orders(bar_length_mm=6000, kerf_mm=0, time_budget=0)
+
+        result = {plan.profil_type_id: (plan.cuts_count, plan.bars_count, plan.oversized_cuts) for plan in plans}
+        self.assertEqual(result, {self.profil_type.id: (2, 1, [9000]),
+                                  long_profil.id: (0, 0, [7000]),
+                                  short_profil.id: (3, 1, [])})
+        # kesilgan brusi yo'q rejaning chiqindisi narxlar kitobiga o'tmaydi
+        waste = price_books.get_price_book(self.company.id).waste
+        self.assertEqual(set(waste), {self.profil_type.id, short_profil.id})
+
+
+class NestingTests(OrderTestCase):
+    def assertNoOverlap(self, result):
+        for sheet in result.sheets:
+            for placement in sheet:
+                self.assertLessEqual(placement.x_mm + placement.width_mm, result.sheet_width_mm)
+                self.assertLessEqual(placement.y_mm + placement.height_mm, result.sheet_height_mm)
+            for i, first in enumerate(sheet):
+                for second in sheet[i + 1:]:
+                    self.assertTrue(first.x_mm + first.width_mm <= second.x_mm
+                                    or second.x_mm + second.width_mm <= first.x_mm
+                                    or first.y_mm + first.height_mm <= second.y_mm
+                                    or second.y_mm + second.height_mm <= first.y_mm)
+
+    def test_panes_fill_sheets_without_overlap(self):
+        panes = [nesting.Pane(width, height, index)
+                 for index, (width, height) in enumerate([(1000, 600), (600, 1000), (500, 500), (1200, 300)] * 3)]
+        result = nesting.nest_panes(panes, sheet_width_mm=2000, sheet_height_mm=1500)
+
+        placed = [placement.ref for sheet in result.sheets for placement in sheet]
+        self.assertEqual(sorted(placed), list(range(len(panes))))
+        self.assertNoOverlap(result)
+        used = sum(pane.width_mm * pane.height_mm for pane in panes)
+        self.assertEqual(result.utilization, round(used * 100 / (len(result.sheets) * 2000 * 1500), 2))
+
+    def test_pane_is_turned_to_fit(self):
+        result = nesting.nest_panes([nesting.Pane(1000, 2000)], sheet_width_mm=2000, sheet_height_mm=1000)
+
+        self.assertTrue(result.sheets[0][0].rotated)
+        self.assertEqual(result.utilization, 100.0)
+
+    def test_pane_bigger_than_sheet(self):
+        with self.assertRaises(ValueError):
+            nesting.nest_panes([nesting.Pane(3000, 3000)], sheet_width_mm=2000, sheet_height_mm=1000)
+
+    def test_open_panes_per_piece(self):
+        self.place_order(quantity=2)
+
+        panes = nesting.gather_open_panes(self.company.id)[self.glass_type.id]
+        self.assertEqual(len(panes), 2 * 2)
+        self.assertEqual(sorted(pane.ref["copy"] for pane in panes), [1, 1, 2, 2])
+
+
+class OrderRecordTaskTests(OrderTestCase):
+    def test_order_record_is_queued(self):
+        order = self.create_order()
+
+        task_obj = Task.objects.get(name="orders.create_order_record")
+        self.assertEqual(task_obj.payload, {"order_detail_id": order.order_detail.get().id})
+        self.assertFalse(Order.objects.exists())
+
+    def test_retry_does_not_duplicate_the_record(self):
+        order = self.place_order()
+
+        # worker yozuvni yaratib, natijani qayd etishdan oldin to'xtagan holat
+        create_order_record(order_detail_id=order.order_detail.get().id)
+        self.assertEqual(Order.objects.filter(order__order=order).count(), 1)
+
+
+class OrderListTests(OrderTestCase):
+    def list_orders(self, **params):
+        response = self.client.get("/api/orders/", params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_query_count_does_not_grow_with_orders(self):
+        self.place_order()
+        with CaptureQueriesContext(connection) as one:
+            self.list_orders()
+        # so'rovlar logi keyingi requestlarda tozalanadi
+        queries = len(one)
+
+        for _ in range(4):
+            self.place_order()
+        with self.assertNumQueries(queries):
+            data = self.list_orders()
+        self.assertEqual(len(data["results"]), 5)
+
+    def test_keyset_pages(self):
+        orders = [self.place_order() for _ in range(3)]
+
+        first = self.list_orders(page_size=2)
+        second = self.client.get(first["next"]).data
+        ids = [row["id"] for row in first["results"] + second["results"]]
+        self.assertEqual(ids, [order.id for order in reversed(orders)])
+        self.assertIsNone(second["next"])
+
+    def test_status_filter_uses_latest_status(self):
+        closed, waiting = self.place_order(), self.place_order()
+        Order.objects.create(order=closed.order_detail.get(),
+                             total_orders_number=99,
+                             total_price=0,
+                             status=Order.OrderStatusChoices.CLOSED)
+
+        self.assertEqual([row["id"] for row in self.list_orders(status="WAITING")["results"]], [waiting.id])
+        rows = self.list_orders(status="CLOSED")["results"]
+        self.assertEqual([(row["id"], row["status"]) for row in rows], [(closed.id, "CLOSED")])
+
+
+class OrderQuoteTests(OrderTestCase):
+    def quote(self, *configurations):
+        return self.client.post("/api/orders/quote/", {"configurations": list(configurations)}, format="json")
+
+    def test_quote_matches_created_order(self):
+        config = {"template": self.template.id, "width_mm": 2000, "height_mm": 1500,
+                  "sections": [{"section_order": 1, "height_mm": 600}]}
+        created = self.client.post("/api/orders/window/", config, format="json").data
+        other = {"template": self.big_template.id, "width_mm": "1000", "height_mm": 1000}
+        self.quote(other)
+
+        # shablonlar keshda, faqat so'rov tranzaksiyasining savepointi qoladi
+        with CaptureQueriesContext(connection) as queries:
+            response = self.quote(config, other)
+        self.assertTrue(all(query["sql"].startswith(("SAVEPOINT", "RELEASE")) for query in queries))
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["count"], 2)
+        quote = response.data["quotes"][0]
+        self.assertEqual(float(quote["total_price"]), created["total_price"])
+        self.assertEqual([(sec["width_mm"], sec["height_mm"]) for sec in quote["sections"]],
+                         [(sec["width_mm"], sec["height_mm"]) for sec in created["sections"]])
+        self.assertEqual(WindowOrder.objects.count(), 1)
+
+    def test_errors_name_the_configuration(self):
+        response = self.quote({"template": self.template.id, "width_mm": 2000, "height_mm": 1500},
+                              {"template": self.template.id, "width_mm": 0, "height_mm": 1500})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data["configurations"]), [1])
+
+        response = self.quote({"template": self.template.id, "width_mm": 2000, "height_mm": 1500,
+                               "sections": [{"section_order": 9}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data["configurations"]), [0])
+
+    def test_unknown_template(self):
+        response = self.quote({"template": self.big_template.id + 100, "width_mm": 2000, "height_mm": 1500})
+        self.assertEqual(response.status_code, 400)
+
+
+class OrderSequenceTests(OrderTestCase):
+    def test_values_are_consecutive_per_company(self):
+        name = OrderSequence.SequenceName.ORDER
+
+        self.assertEqual([allocate(self.company.id, name) for _ in range(3)], [1, 2, 3])
+        # 4..13 bloki
+        self.assertEqual(allocate(self.company.id, name, count=10), 13)
+        other = Company.objects.create(region=self.company.region,
+                                       district=self.company.district,
+                                       dealer=self.company.dealer,
+                                       master=User.all_objects.create(full_name="Second", phone_number="+998907654321"))
+        self.assertEqual(allocate(other.id, name), 1)
+        self.assertEqual(allocate(self.company.id, OrderSequence.SequenceName.NEW_ORDER), 1)
+
+    def test_order_numbers(self):
+        self.assertEqual(next_order_number(self.company.id), f"{self.company.id}-000001")
+
+        first, second = self.place_order(), self.place_order()
+        self.assertEqual(second.order_number, f"{self.company.id}-000003")
+        records = Order.objects.filter(order__order__in=[first, second]).order_by("id")
+        self.assertEqual(list(records.values_list("total_orders_number", flat=True)), [1, 2])
+
+
+class OrderSearchTests(OrderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alice, self.bob = self.create_order(), self.create_order()
+        NewOrder.objects.filter(pk=self.alice.pk).update(order_owner="Alice Karimova", phone_number="+998901112233")
+        NewOrder.objects.filter(pk=self.bob.pk).update(order_owner="Bob", phone_number="+998935554433",
+                                                       location="Samarkand")
+
+    def search(self, query):
+        response = self.client.get("/api/orders/search/", {"q": query})
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row["id"] for row in response.data["results"]]
+
+    def test_part_of_name_or_location(self):
+        self.assertEqual(self.search("karim"), [self.alice.id])
+        self.assertEqual(self.search("  samar "), [self.bob.id])
+
+    def test_phone_with_separators(self):
+        self.assertEqual(self.search("93 555-44"), [self.bob.id])
+
+    def test_exact_order_number_ranks_first(self):
+        self.assertEqual(self.search(self.alice.order_number)[0], self.alice.id)
+
+
+class OrderRollupTests(OrderTestCase):
+    def rollup(self):
+        return OrderRollup.objects.values("orders_count", "total_price", "closed_count", "closed_total_price").get()
+
+    def test_rollup_follows_order_records(self):
+        order = self.place_order()
+        total = order.total_price or Decimal("0")
+        self.assertEqual(self.rollup(), {"orders_count": 1, "total_price": total,
+                                         "closed_count": 0, "closed_total_price": 0})
+
+        record = Order.objects.get()
+        record.status = Order.OrderStatusChoices.CLOSED
+        record.save()
+        self.assertEqual(self.rollup(), {"orders_count": 1, "total_price": total,
+                                         "closed_count": 1, "closed_total_price": total})
+
+        Order.objects.get().delete()
+        self.assertEqual(self.rollup()["orders_count"], 0)
+
+    def test_rebuild_matches_incremental_rows(self):
+        self.place_order()
+        self.place_order()
+        Order.objects.filter(pk=Order.objects.order_by("id").first().pk).update(
+            status=Order.OrderStatusChoices.CLOSED)
+        day = OrderRollup.objects.get().day
+
+        self.assertEqual(rollups.rebuild_rollups(day, day), 1)
+        row = self.rollup()
+        self.assertEqual((row["orders_count"], row["closed_count"]), (2, 1))
+        totals, groups = rollups.summarize(OrderRollup.objects.all(), group_by="order_type")
+        self.assertEqual(totals["orders_count"], 2)
+        self.assertEqual([(group["order_type"], group["orders_count"]) for group in groups], [("WINDOW", 2)])
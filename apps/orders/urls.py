@@ -4,12 +4,22 @@ from apps.orders.api_endpoint import (
     WindowOrderCreateAPIView,
     DoorOrderCreateAPIView,
     OrderDetailCreateAPIView,
+    OrderQuoteAPIView,
+    GlassCutPlanAPIView,
+    OrderListAPIView,
+    OrderSearchAPIView,
+    OrderDashboardAPIView,
 )
 
 app_name = "orders"
 
 urlpatterns = [
+    path("", OrderListAPIView.as_view(), name="order-list"),
+    path("search/", OrderSearchAPIView.as_view(), name="order-search"),
+    path("dashboard/", OrderDashboardAPIView.as_view(), name="order-dashboard"),
     path("window/", WindowOrderCreateAPIView.as_view(), name="window-order-create"),
     path("door/", DoorOrderCreateAPIView.as_view(), name="door-order-create"),
-    path("create/", OrderDetailCreateAPIView.as_view(), name="order-detail-create")
+    path("create/", OrderDetailCreateAPIView.as_view(), name="order-detail-create"),
+    path("quote/", OrderQuoteAPIView.as_view(), name="order-quote"),
+    path("glass-cut-plan/", GlassCutPlanAPIView.as_view(), name="glass-cut-plan"),
 ]
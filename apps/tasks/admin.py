@@ -0,0 +1,47 @@
+from django.contrib import admin
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.tasks.models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "name",
+        "status",
+        "attempts",
+        "max_attempts",
+        "run_after",
+        "wait_ms",
+        "duration_ms",
+        "created_at",
+    )
+    list_filter = ("status", "name")
+    search_fields = ("name", "locked_by")
+    readonly_fields = (
+        "attempts",
+        "locked_by",
+        "locked_at",
+        "last_error",
+        "started_at",
+        "finished_at",
+        "wait_ms",
+        "duration_ms",
+        "created_at",
+        "updated_at",
+    )
+    ordering = ("-created_at",)
+    list_per_page = 50
+
+    actions = ["retry_tasks"]
+
+    @admin.action(description=_("Retry selected tasks"))
+    def retry_tasks(self, request, queryset):
+        updated = queryset.exclude(status=Task.StatusChoices.RUNNING).update(
+            status=Task.StatusChoices.PENDING,
+            attempts=0,
+            run_after=timezone.now(),
+        )
+        self.message_user(request, f"{updated} task(s) queued again.")
@@ -0,0 +1,93 @@
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.tasks.queue import claim, release_stale, renew_leases, run_task, task_metrics
+
+
+def _execute(task_obj):
+    close_old_connections()
+    try:
+        return run_task(task_obj)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = "Run background task workers with a thread pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=4,
+                            help="Number of worker threads.")
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Tasks claimed per round trip (default: 2 x concurrency).")
+        parser.add_argument("--poll-interval", type=float, default=1.0,
+                            help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--lease", type=int, default=300,
+                            help="Seconds without a lease renewal after which a RUNNING task is considered "
+                                 "abandoned. Running tasks are renewed every third of it.")
+        parser.add_argument("--once", action="store_true",
+                            help="Exit when no due task is left.")
+        parser.add_argument("--stats", action="store_true",
+                            help="Print per-task timing metrics and exit.")
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            for row in task_metrics():
+                self.stdout.write(
+                    f"{row['name']} [{row['status']}]: {row['count']} tasks, "
+                    f"avg {row['avg_duration_ms'] or 0:.1f} ms, max {row['max_duration_ms'] or 0} ms, "
+                    f"avg wait {row['avg_wait_ms'] or 0:.1f} ms"
+                )
+            return
+
+        concurrency = options["concurrency"]
+        batch_size = options["batch_size"] or concurrency * 2
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"[:48]
+
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        self.stdout.write(f"Worker {worker_id} started with {concurrency} threads")
+        last_release = 0.0
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while not self.stopping:
+                if time.monotonic() - last_release > options["lease"] / 2:
+                    released = release_stale(options["lease"])
+                    if released:
+                        self.stdout.write(f"Released {released} abandoned task(s)")
+                    last_release = time.monotonic()
+
+                tasks = claim(worker_id, batch_size)
+                if not tasks:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                started = time.perf_counter()
+                running = {pool.submit(_execute, task_obj): task_obj for task_obj in tasks}
+                pending = set(running)
+                while pending:
+                    # uzoq ishlayotgan vazifalar boshqa worker tomonidan qayta olinmasligi uchun
+                    done, pending = wait(pending, timeout=options["lease"] / 3)
+                    if pending:
+                        renew_leases([running[future] for future in pending])
+                results = [future.result() for future in running]
+                succeeded = sum(results)
+                self.stdout.write(
+                    f"{succeeded} succeeded, {len(results) - succeeded} failed "
+                    f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+
+        self.stdout.write(f"Worker {worker_id} stopped")
+
+    def _stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,62 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.common.models import BaseModel
+
+
+class Task(BaseModel):
+    class StatusChoices(models.TextChoices):
+        PENDING = "PENDING", _("Pending")
+        RUNNING = "RUNNING", _("Running")
+        SUCCEEDED = "SUCCEEDED", _("Succeeded")
+        DEAD = "DEAD", _("Dead")
+
+    name = models.CharField(max_length=128,
+                            db_index=True,
+                            verbose_name=_("Task name"))
+    payload = models.JSONField(default=dict,
+                               blank=True,
+                               verbose_name=_("Payload"))
+    status = models.CharField(max_length=16,
+                              choices=StatusChoices.choices,
+                              default=StatusChoices.PENDING,
+                              verbose_name=_("Status"))
+    attempts = models.PositiveSmallIntegerField(default=0,
+                                                verbose_name=_("Attempts"))
+    max_attempts = models.PositiveSmallIntegerField(default=5,
+                                                    verbose_name=_("Max attempts"))
+    run_after = models.DateTimeField(default=timezone.now,
+                                     verbose_name=_("Run after"))
+    locked_by = models.CharField(max_length=64,
+                                 null=True,
+                                 blank=True,
+                                 verbose_name=_("Locked by"))
+    locked_at = models.DateTimeField(null=True,
+                                     blank=True,
+                                     verbose_name=_("Locked at"))
+    last_error = models.TextField(blank=True,
+                                  verbose_name=_("Last error"))
+    # timing metrics of the last attempt
+    started_at = models.DateTimeField(null=True,
+                                      blank=True,
+                                      verbose_name=_("Started at"))
+    finished_at = models.DateTimeField(null=True,
+                                       blank=True,
+                                       verbose_name=_("Finished at"))
+    wait_ms = models.PositiveIntegerField(null=True,
+                                          blank=True,
+                                          verbose_name=_("Queue wait (ms)"))
+    duration_ms = models.PositiveIntegerField(null=True,
+                                              blank=True,
+                                              verbose_name=_("Run duration (ms)"))
+
+    class Meta:
+        verbose_name = _("Task")
+        verbose_name_plural = _("Tasks")
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="task_status_run_after_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.id} ({self.status})"
@@ -0,0 +1,191 @@
+"""
+Database-backed task queue (transactional outbox).
+
+``enqueue`` writes a ``Task`` row inside the caller's transaction, so a task
+becomes visible to workers only when the request commits and disappears with
+it on rollback. Workers started with ``manage.py run_workers`` claim due
+tasks, run the registered function and record queue wait and run duration of
+every attempt. A failing task is retried with exponential backoff until it
+reaches ``max_attempts`` and is then left in the DEAD state for inspection.
+
+A claimed task holds a lease: its ``locked_at``. While tasks run, their
+worker renews the lease every third of ``--lease`` seconds
+(``renew_leases``), so a slow but healthy task, however long it takes, is
+never claimed a second time. Only a task whose lease was not renewed for
+``--lease`` seconds, because its worker crashed or was killed, is returned to
+the queue by ``release_stale``.
+
+Claiming uses ``SELECT ... FOR UPDATE SKIP LOCKED`` on PostgreSQL. SQLite has
+no row locks, there the conditional UPDATE on ``status`` alone keeps two
+workers from taking the same task; run it with the ``"transaction_mode":
+"IMMEDIATE"`` database option when more than one worker thread is used.
+"""
+import random
+import time
+import traceback
+import uuid
+from datetime import timedelta
+from typing import Callable, NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max
+from django.utils import timezone
+
+from apps.tasks.models import Task
+
+_registry = {}
+
+
+class RegisteredTask(NamedTuple):
+    name: str
+    func: Callable
+    max_attempts: int
+
+
+def task(name=None, max_attempts=5):
+    """Register a function as a queue task, adds ``func.enqueue(**payload)``"""
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__name__}"
+        _registry[task_name] = RegisteredTask(task_name, func, max_attempts)
+        func.enqueue = lambda **payload: enqueue(task_name, payload)
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, run_after=None):
+    """
+    Queue a registered task with a JSON-serializable payload.
+
+    With ``settings.TASKS_ALWAYS_EAGER`` the task runs in-process right after
+    the current transaction commits instead of being stored.
+    """
+    registered = _registry[name]
+    payload = payload or {}
+
+    if settings.TASKS_ALWAYS_EAGER:
+        transaction.on_commit(lambda: registered.func(**payload))
+        return None
+
+    return Task.objects.create(name=name,
+                               payload=payload,
+                               max_attempts=registered.max_attempts,
+                               run_after=run_after or timezone.now())
+
+
+def backoff_delay(attempts):
+    """Exponential backoff with jitter for the given number of failed attempts"""
+    delay = min(settings.TASKS_RETRY_BACKOFF_MAX,
+                settings.TASKS_RETRY_BACKOFF * 2 ** max(attempts - 1, 0))
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim(worker_id, limit):
+    """Mark up to ``limit`` due tasks as RUNNING for this worker and return them"""
+    token = f"{worker_id}:{uuid.uuid4().hex[:8]}"
+    now = timezone.now()
+
+    with transaction.atomic():
+        ids = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status=Task.StatusChoices.PENDING, run_after__lte=now)
+            .order_by("run_after", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        Task.objects.filter(id__in=ids, status=Task.StatusChoices.PENDING).update(
+            status=Task.StatusChoices.RUNNING,
+            locked_by=token,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+
+    return list(Task.objects.filter(id__in=ids, locked_by=token, status=Task.StatusChoices.RUNNING))
+
+
+def run_task(task_obj):
+    """Run one claimed task and record its outcome, returns True on success"""
+    started_at = timezone.now()
+    wait_ms = max(int((started_at - task_obj.run_after).total_seconds() * 1000), 0)
+    started = time.perf_counter()
+
+    try:
+        registered = _registry.get(task_obj.name)
+        if registered is None:
+            raise LookupError(f"Task {task_obj.name!r} is not registered in this worker")
+        with transaction.atomic():
+            registered.func(**task_obj.payload)
+    except Exception:
+        finished_at = timezone.now()
+        if task_obj.attempts >= task_obj.max_attempts:
+            status, run_after = Task.StatusChoices.DEAD, task_obj.run_after
+        else:
+            status, run_after = Task.StatusChoices.PENDING, finished_at + backoff_delay(task_obj.attempts)
+
+        Task.objects.filter(pk=task_obj.pk).update(
+            status=status,
+            run_after=run_after,
+            last_error=traceback.format_exc(),
+            locked_by=None,
+            locked_at=None,
+            started_at=started_at,
+            finished_at=finished_at,
+            wait_ms=wait_ms,
+            duration_ms=int((time.perf_counter() - started) * 1000),
+        )
+        return False
+
+    Task.objects.filter(pk=task_obj.pk).update(
+        status=Task.StatusChoices.SUCCEEDED,
+        last_error="",
+        locked_by=None,
+        locked_at=None,
+        started_at=started_at,
+        finished_at=timezone.now(),
+        wait_ms=wait_ms,
+        duration_ms=int((time.perf_counter() - started) * 1000),
+    )
+    return True
+
+
+def renew_leases(tasks):
+    """Extend the lease of claimed tasks that are still running, returns how many were renewed"""
+    # tugagan yoki boshqa workerga o'tgan vazifa locked_by bilan mos kelmaydi
+    return Task.objects.filter(pk__in=[task_obj.pk for task_obj in tasks],
+                               locked_by__in={task_obj.locked_by for task_obj in tasks},
+                               status=Task.StatusChoices.RUNNING).update(locked_at=timezone.now())
+
+
+def release_stale(lease_seconds):
+    """
+    Return tasks of crashed workers to the queue.
+
+    A RUNNING task whose lease was not renewed for ``lease_seconds`` is
+    retried, or marked DEAD when it has used up its attempts.
+    """
+    expired = Task.objects.filter(status=Task.StatusChoices.RUNNING,
+                                  locked_at__lt=timezone.now() - timedelta(seconds=lease_seconds))
+    dead = expired.filter(attempts__gte=F("max_attempts")).update(
+        status=Task.StatusChoices.DEAD,
+        locked_by=None,
+        locked_at=None,
+        last_error="Worker lease expired",
+    )
+    retried = expired.update(
+        status=Task.StatusChoices.PENDING,
+        locked_by=None,
+        locked_at=None,
+        last_error="Worker lease expired",
+    )
+    return retried + dead
+
+
+def task_metrics():
+    """Per task name and status: count, average/max run time and average queue wait"""
+    return (Task.objects.values("name", "status")
+            .annotate(count=Count("id"),
+                      avg_duration_ms=Avg("duration_ms"),
+                      max_duration_ms=Max("duration_ms"),
+                      avg_wait_ms=Avg("wait_ms"))
+            .order_by("name", "status"))
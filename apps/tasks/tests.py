@@ -0,0 +1,94 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.tasks.models import Task
+from apps.tasks.queue import claim, enqueue, release_stale, renew_leases, run_task, task
+
+calls = []
+
+
+@task(name="tests.record", max_attempts=2)
+def record(value):
+    calls.append(value)
+    if value == "fail":
+        raise RuntimeError("failed")
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_stores_pending_task(self):
+        task_obj = record.enqueue(value="a")
+
+        self.assertEqual(task_obj.status, Task.StatusChoices.PENDING)
+        self.assertEqual(task_obj.max_attempts, 2)
+        self.assertEqual(calls, [])
+
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_eager_task_runs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(enqueue("tests.record", {"value": "a"}))
+            self.assertEqual(calls, [])
+
+        self.assertEqual(calls, ["a"])
+        self.assertFalse(Task.objects.exists())
+
+    def test_claimed_task_is_not_claimed_again(self):
+        record.enqueue(value="a")
+
+        claimed = claim("first", 10)
+        self.assertEqual([(t.status, t.attempts) for t in claimed], [(Task.StatusChoices.RUNNING, 1)])
+        self.assertEqual(claim("second", 10), [])
+
+        self.assertTrue(run_task(claimed[0]))
+        claimed[0].refresh_from_db()
+        self.assertEqual(claimed[0].status, Task.StatusChoices.SUCCEEDED)
+        self.assertEqual(calls, ["a"])
+
+    def test_failed_task_is_retried_then_dead(self):
+        record.enqueue(value="fail")
+
+        self.assertFalse(run_task(claim("worker", 1)[0]))
+        task_obj = Task.objects.get()
+        self.assertEqual(task_obj.status, Task.StatusChoices.PENDING)
+        self.assertIn("RuntimeError", task_obj.last_error)
+
+        # backoff tugashini kutmasdan qayta navbatga qo'yiladi
+        Task.objects.update(run_after=task_obj.created_at)
+        self.assertFalse(run_task(claim("worker", 1)[0]))
+        task_obj.refresh_from_db()
+        self.assertEqual((task_obj.status, task_obj.attempts), (Task.StatusChoices.DEAD, 2))
+        self.assertEqual(claim("worker", 1), [])
+
+    def test_abandoned_task_is_released(self):
+        record.enqueue(value="a")
+        claim("crashed", 1)
+
+        self.assertEqual(release_stale(lease_seconds=-1), 1)
+        self.assertEqual(len(claim("worker", 1)), 1)
+
+    def test_renewed_task_is_not_released(self):
+        record.enqueue(value="a")
+        claimed = claim("slow", 1)
+        Task.objects.update(locked_at=claimed[0].created_at - timedelta(minutes=10))
+
+        # ishlayotgan vazifaning ijara muddati uzaytiriladi
+        self.assertEqual(renew_leases(claimed), 1)
+        self.assertEqual(release_stale(lease_seconds=60), 0)
+        self.assertEqual(claim("worker", 1), [])
+
+        run_task(claimed[0])
+        self.assertEqual(renew_leases(claimed), 0)
+
+    @skipUnless(connection.vendor == "postgresql", "row locks are PostgreSQL only")
+    def test_claim_skips_locked_rows(self):
+        record.enqueue(value="a")
+
+        with CaptureQueriesContext(connection) as queries:
+            claim("worker", 1)
+        self.assertTrue(any("SKIP LOCKED" in query["sql"] for query in queries))
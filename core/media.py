@@ -0,0 +1,195 @@
+"""
+Media and static file serving.
+
+``serve_file`` serves ``MEDIA_ROOT`` and ``STATIC_ROOT`` with:
+
+* a strong ``ETag`` (mtime and size) and ``Last-Modified``. ``If-None-Match``
+  and ``If-Modified-Since`` return ``304 Not Modified``.
+* ``Cache-Control: public, max-age=31536000, immutable`` for files whose
+  name carries their content hash. These are the image variants of
+  ``apps.common.images`` and the hashed names written by
+  ``ManifestStaticFilesStorage``. Other files are cached for
+  ``settings.MEDIA_CACHE_MAX_AGE`` seconds and then revalidated.
+* single ``Range`` requests (``206``/``416``) and ``If-Range``, so video and
+  large downloads can resume.
+* optional offload with ``settings.FILE_OFFLOAD``. With ``"x-accel-redirect"``
+  the worker only checks the file and answers with headers. nginx sends the
+  bytes from an internal location, e.g.
+  ``location /internal/media/ { internal; alias <MEDIA_ROOT>/; }`` for
+  ``FILE_OFFLOAD_PREFIX = "/internal"``. ``"x-sendfile"`` does the same for
+  Apache and lighttpd with the absolute file path. Without offload the file is
+  streamed by the worker, and ``FileResponse`` uses ``wsgi.file_wrapper``
+  (sendfile) when the server has it.
+
+Nothing here depends on nginx, so the same headers can be checked locally.
+"""
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote, urlsplit
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import transaction
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.urls import re_path
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from apps.common.conditional import etag_matches
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+IMMUTABLE_PATTERNS = (
+    re.compile(r"^variants/[0-9a-f]{2}/[0-9a-f]{64}-\d+\.\w+$"),  # apps.common.images
+    re.compile(r"\.[0-9a-f]{12}\.\w+$"),  # ManifestStaticFilesStorage
+)
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+def is_immutable(path):
+    return any(pattern.search(path) for pattern in IMMUTABLE_PATTERNS)
+
+
+def file_etag(stat_result):
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def _not_modified(request, etag, mtime):
+    # If-None-Match bo'lsa If-Modified-Since e'tiborga olinmaydi (RFC 9110)
+    if "If-None-Match" in request.headers:
+        return etag_matches(request, etag)
+    modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+    return modified_since is not None and int(mtime) <= modified_since
+
+
+def parse_range(header, size):
+    """``(start, end)`` of a single byte range, inclusive; None to send the whole file; ValueError if unsatisfiable"""
+    match = RANGE_RE.match(header.replace(" ", ""))
+    if not match or match.groups() == ("", ""):
+        # bir nechta oraliq yoki noto'g'ri sarlavha e'tiborsiz qoldiriladi, butun fayl yuboriladi
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def content_type_for(full_path):
+    content_type, encoding = mimetypes.guess_type(full_path)
+    # siqilgan fayllar (.gz, .br) Content-Encoding siz, oddiy fayl sifatida beriladi
+    if content_type is None or encoding is not None:
+        return "application/octet-stream"
+    return content_type
+
+
+def _offload_response(full_path, url_path):
+    # tanani va Content-Length ni nginx/apache faylning o'zidan yuboradi
+    response = HttpResponse(content_type=content_type_for(full_path))
+    if settings.FILE_OFFLOAD == "x-accel-redirect":
+        # nginx URI ni kutadi: ASCII bo'lmagan va maxsus belgilar foiz bilan kodlanadi
+        response["X-Accel-Redirect"] = quote(f"{settings.FILE_OFFLOAD_PREFIX}{url_path}")
+    else:
+        response["X-Sendfile"] = full_path
+    return response
+
+
+@transaction.non_atomic_requests
+@require_safe
+def serve_file(request, path, document_root, url_prefix):
+    try:
+        full_path = safe_join(document_root, path)
+    except SuspiciousFileOperation:
+        raise Http404("File not found")
+    try:
+        stat_result = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404("File not found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise Http404("File not found")
+
+    etag = file_etag(stat_result)
+    if is_immutable(path):
+        cache_control = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        cache_control = f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat_result.st_mtime),
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+
+    if _not_modified(request, etag, stat_result.st_mtime):
+        response = HttpResponseNotModified()
+    elif settings.FILE_OFFLOAD:
+        # Range va bayt yuborishni proksi o'zi bajaradi
+        response = _offload_response(full_path, f"{url_prefix}{path}")
+    else:
+        response = _file_response(request, full_path, stat_result.st_size, etag)
+
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+
+def _file_response(request, full_path, size, etag):
+    content_type = content_type_for(full_path)
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    # If-Range mos kelmasa (fayl o'zgargan) butun fayl yuboriladi
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if byte_range is None:
+        response = FileResponse(open(full_path, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(full_path, start, end - start + 1),
+                                         status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    return response
+
+
+def _serve_patterns(url, document_root):
+    # CDN kabi tashqi manzildan beriladigan fayllar bu yerda xizmat qilinmaydi
+    if not url or not document_root or urlsplit(url).netloc:
+        return []
+    prefix = "/" + url.lstrip("/")
+    return [re_path(rf"^{re.escape(url.lstrip('/'))}(?P<path>.+)$", serve_file,
+                    {"document_root": document_root, "url_prefix": prefix})]
+
+
+def media_urlpatterns():
+    return [
+        *_serve_patterns(settings.MEDIA_URL, settings.MEDIA_ROOT),
+        *_serve_patterns(settings.STATIC_URL, settings.STATIC_ROOT),
+    ]
@@ -39,6 +39,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 LOCAL_APPS = [
@@ -47,6 +48,7 @@ LOCAL_APPS = [
     "apps.company",
     "apps.materials",
     "apps.orders",
+    "apps.tasks",
 ]
 
 EXTERNAL_APPS = [
@@ -147,6 +149,13 @@ STATICFILES_DIRS = (BASE_DIR / "static",)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Media and static serving (core.media): seconds browsers cache files without a
+# content hash in their name, and optional offload of the file body to the proxy
+# ("x-accel-redirect" for nginx, "x-sendfile" for Apache/lighttpd)
+MEDIA_CACHE_MAX_AGE = 60 * 60
+FILE_OFFLOAD = os.getenv("FILE_OFFLOAD", "")
+FILE_OFFLOAD_PREFIX = os.getenv("FILE_OFFLOAD_PREFIX", "/internal")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -160,7 +169,7 @@ REST_FRAMEWORK = {
     # 'PAGE_SIZE': 10,
 
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_THROTTLE_CLASSES': [],
     'DEFAULT_THROTTLE_RATES': {},
@@ -174,7 +183,9 @@ REST_FRAMEWORK = {
 # REDIS_PORT = os.getenv("REDIS_PORT", 6379)
 # REDIS_DB = os.getenv("REDIS_DB", 0)
 
-# Using Local memory cache for development
+# Using Local memory cache for development. Every process has its own, so the
+# version caches below are invalidated per worker: the other workers see a
+# change when their cached version expires (the *_VERSION_TTL settings).
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
@@ -182,6 +193,64 @@ CACHES = {
     }
 }
 
+# Seconds an authenticated user, the user's country and companies are cached
+# (apps.accounts.authentication)
+AUTH_USER_CACHE_TTL = 60
+
+# Refresh token revocation (apps.accounts.tokens): seconds between incremental
+# Bloom filter syncs and full rebuilds, and the expired token pruning schedule
+TOKEN_BLACKLIST_SYNC_INTERVAL = 5
+TOKEN_BLACKLIST_FILTER_REBUILD = 3600
+TOKEN_PRUNE_INTERVAL = 24 * 60 * 60
+TOKEN_PRUNE_BATCH_SIZE = 5000
+
+# Login codes (apps.accounts.otp). The store must be shared by all workers:
+# SQLiteOTPStore for one host, CacheOTPStore with a shared (e.g. Redis) cache
+# alias for several hosts.
+OTP_STORE = os.getenv("OTP_STORE", "apps.accounts.otp.SQLiteOTPStore")
+OTP_SQLITE_PATH = os.getenv("OTP_SQLITE_PATH", BASE_DIR / "otp.sqlite3")
+OTP_CACHE_ALIAS = "default"
+OTP_TTL = 600  # seconds a code stays valid
+OTP_RESEND_COOLDOWN = 60  # seconds before a new code can be requested for the same phone
+OTP_MAX_ATTEMPTS = 5  # wrong guesses before the code is burned
+
+# Reference data (apps.common.reference): seconds between checks of the
+# country, region, district and currency tables by each worker
+REFERENCE_DATA_SYNC_INTERVAL = 30
+
+# Resized catalog images (apps.common.images): longest side in pixels of each
+# variant, WEBP quality and how long a worker caches the variant URLs of an image
+IMAGE_VARIANTS = {"thumb": 64, "small": 256, "medium": 640}
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_VARIANT_CACHE_TTL = 60 * 60
+
+# Background task queue (apps.tasks), workers are started with `manage.py run_workers`
+TASKS_ALWAYS_EAGER = False
+TASKS_RETRY_BACKOFF = 5  # seconds before the first retry, doubled on every attempt
+TASKS_RETRY_BACKOFF_MAX = 600
+
+# Seconds a worker trusts the cached version of a compiled template layout, and
+# so how long other workers may still use the previous layout after a change
+TEMPLATE_LAYOUT_VERSION_TTL = 60
+
+# Seconds a worker trusts the cached version of a company's price book, and so
+# how long other workers may still price with the previous book after a rebuild
+PRICE_BOOK_VERSION_TTL = 60
+
+# Seconds a worker trusts the cached version of the materials catalog (apps.materials.catalog),
+# and so how long other workers may still serve the previous catalog and ETag after a change
+MATERIALS_CATALOG_VERSION_TTL = 60
+
+# Profile cutting optimizer (apps.orders.cutting): stock bar length, saw kerf
+# and the local improvement time budget in seconds for a whole planning run
+PROFILE_BAR_LENGTH_MM = 6000
+PROFILE_SAW_KERF_MM = 4
+CUTTING_TIME_BUDGET = 0.5
+
+# Standard glass sheet for pane nesting (apps.orders.nesting)
+GLASS_SHEET_WIDTH_MM = 3210
+GLASS_SHEET_HEIGHT_MM = 2250
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=10),